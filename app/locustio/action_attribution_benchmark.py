@@ -0,0 +1,80 @@
+"""
+Micro-benchmark of MyBaseTaskSet.get/post overhead: requests per second one core can send through the task set
+with action attribution by inspect.stack() (legacy) and by the action context set by *_measure decorators.
+HTTP client is replaced by a stub, so only the load generator side is measured.
+
+Usage from app dir: PYTHONPATH=. python locustio/action_attribution_benchmark.py [--requests N] [--stack-depth N]
+"""
+import argparse
+import inspect
+import time
+
+from locustio.common_utils import MyBaseTaskSet, global_measure
+
+INTERACTION = 'locust_benchmark_action'
+
+
+class StubResponse:
+    content = b'ok'
+
+    def __bool__(self):
+        return True
+
+
+class StubClient:
+    response = StubResponse()
+
+    def get(self, *args, **kwargs):
+        return self.response
+
+    def post(self, *args, **kwargs):
+        return self.response
+
+
+class BenchmarkTaskSet(MyBaseTaskSet):
+    client = StubClient()
+
+
+class LegacyBenchmarkTaskSet(BenchmarkTaskSet):
+
+    def get(self, *args, **kwargs):
+        r = self.client.get(*args, **kwargs)
+        action_name = inspect.stack()[1][3]
+        self.failure_check(response=r, action_name=action_name)
+        return r
+
+
+def benchmark_action(locust, requests):
+    for i in range(requests):
+        locust.get(f'/rest/api/2/issue/{i}?_={i}', catch_response=True)
+
+
+def call_at_depth(depth, func, *args):
+    # Locust runs tasks under a deep stack of greenlet, task set and decorator frames
+    if depth == 0:
+        return func(*args)
+    return call_at_depth(depth - 1, func, *args)
+
+
+def measure(task_set_class, requests, stack_depth):
+    locust = task_set_class.__new__(task_set_class)
+    start = time.process_time()
+    call_at_depth(stack_depth, global_measure, benchmark_action, time.time(), INTERACTION, locust, requests)
+    return requests / (time.process_time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20_000, help='requests sent by every implementation')
+    parser.add_argument('--stack-depth', type=int, default=20, help='extra frames below the action')
+    args = parser.parse_args()
+
+    legacy = measure(LegacyBenchmarkTaskSet, args.requests, args.stack_depth)
+    print(f'inspect.stack() attribution: {legacy:,.0f} requests per core-second')
+    current = measure(BenchmarkTaskSet, args.requests, args.stack_depth)
+    print(f'Action context attribution: {current:,.0f} requests per core-second')
+    print(f'Speedup: {current / legacy:.1f}x')
+
+
+if __name__ == "__main__":
+    main()
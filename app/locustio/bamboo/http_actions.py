@@ -1,13 +1,16 @@
+import json
 import random
 import time
-import uuid
 
+import gevent
+from gevent.event import AsyncResult
 from locust import events
 
 from locustio.bamboo.requests_params import bamboo_datasets, Login
-from locustio.common_utils import init_logger, JSON_HEADERS, TEXT_HEADERS, bamboo_measure
+from locustio.common_utils import init_logger, JSON_HEADERS, TEXT_HEADERS, bamboo_measure, ActionPacer
 from util.api.bamboo_clients import BambooClient
 from util.conf import BAMBOO_SETTINGS
+from util.project_paths import BAMBOO_BUILD_RESULTS
 
 logger = init_logger(app_type='bamboo')
 bamboo_dataset = bamboo_datasets()
@@ -18,9 +21,87 @@ action_time = BAMBOO_SETTINGS.default_dataset_plan_duration
 PLAN_STARTED_TIMEOUT = BAMBOO_SETTINGS.start_plan_timeout  # seconds
 PLAN_STATUS_REQUEST_TIMEOUT = 10
 DEFAULT_DATASET_JOB_KEY = 'JB1'
+build_plan_pacer = ActionPacer(action_time, BAMBOO_SETTINGS.load_pacing)
+
+
+class BuildStatusWatcher:
+    """
+    Waits for start of builds run by all locust users of the process. Bamboo build queue is requested once per
+    interval for all builds and job result is requested only for builds that left the queue, so users do not
+    poll the server under test. Requests of the watcher are not measured.
+    Started and finished builds are saved to the build results file for the post run analytics.
+    """
+
+    def __init__(self, client, interval, build_duration, results_file):
+        self.client = client
+        self.interval = interval
+        self.build_duration = build_duration
+        self.results_file = results_file
+        self.__builds = dict()  # plan result key: (build job key, started build job result)
+        self.__running = dict()  # build job key: expected finish time
+        self.__watcher = None
+
+    def watch(self, plan_result_key, build_job_key) -> AsyncResult:
+        started = AsyncResult()
+        self.__builds[plan_result_key] = (build_job_key, started)
+        self.__save(build_job_key)
+        if self.__watcher is None or self.__watcher.dead:
+            self.__watcher = gevent.spawn(self.__watch)
+        return started
+
+    def forget(self, plan_result_key):
+        self.__builds.pop(plan_result_key, None)
+
+    def __save(self, build_job_key, result=None):
+        # Line is appended by a single write, local worker processes share the file
+        with open(self.results_file, 'a') as f:
+            f.write(json.dumps({'build_job_id': build_job_key, 'result': result}) + '\n')
+
+    def __get_result(self, build_job_key):
+        try:
+            return self.client.get_build_plan_results(build_job_key)
+        except Exception as e:
+            logger.error(f'Could not get build job {build_job_key} result: {e}')
+
+    def __watch(self):
+        while self.__builds or self.__running:
+            gevent.sleep(self.interval)
+            if self.__builds:
+                self.__check_started()
+            self.__check_finished()
+
+    def __check_started(self):
+        try:
+            queued = {build['buildResultKey'] for build in self.client.get_queued_builds()}
+        except Exception as e:
+            logger.error(f'Could not get Bamboo build queue: {e}')
+            return
+        for plan_result_key, (build_job_key, started) in list(self.__builds.items()):
+            if plan_result_key in queued:
+                continue
+            response = self.__get_result(build_job_key)
+            if response and 'buildStartedTime' in response:
+                self.forget(plan_result_key)
+                self.__running[build_job_key] = time.time() + self.build_duration
+                started.set(response)
+
+    def __check_finished(self):
+        # Result of a build is requested once it is expected to finish, until it is finished
+        now = time.time()
+        for build_job_key, expected_finish in list(self.__running.items()):
+            if expected_finish > now:
+                continue
+            response = self.__get_result(build_job_key)
+            if response and response.get('lifeCycleState') == 'Finished':
+                del self.__running[build_job_key]
+                self.__save(build_job_key, response)
+
+
+build_watcher = BuildStatusWatcher(api_client, PLAN_STATUS_REQUEST_TIMEOUT, action_time, BAMBOO_BUILD_RESULTS)
 
 
 def run_build_plans(locust):
+    build_plan_pacer.before_action('locust_run_build_plan')
     start = time.time()
     user_auth = tuple(random.choice(bamboo_dataset['users']))
     build_plan = random.choice(bamboo_dataset['build_plans'])
@@ -35,34 +116,23 @@ def run_build_plans(locust):
                         headers=auth_headers, auth=user_auth)
         build_num = r.json()['buildNumber']
         build_job_num = f'{build_plan_id}-{DEFAULT_DATASET_JOB_KEY}-{build_num}'
-        plan_is_running = False
-        total_sleep_time = 0
-        build_queue_duration_msec = None
-        warning_reported = False
-        while not plan_is_running:
-            time.sleep(PLAN_STATUS_REQUEST_TIMEOUT)
-            r = locust.get(f'/rest/api/latest/result/{build_job_num}',
-                           catch_response=True, headers=auth_headers)
-            response = r.json()
-            if 'buildStartedTime' in response:
-                plan_is_running = True
-                build_queue_duration_msec = int(response['queueDuration'])
-                logger.info(f'Plan |{build_job_num}| starts with queue duration {build_queue_duration_msec} ms. '
-                            f'Build start time: {response["buildStartedTime"]}')
-
-            if total_sleep_time >= PLAN_STARTED_TIMEOUT / 2:
-                if not warning_reported:
-                    logger.info(f'WARNING: Plan |{build_job_num}| could not start in {PLAN_STARTED_TIMEOUT / 2} '
-                                f'seconds.')
-                    warning_reported = True
-                    logger.info(f'{BAMBOO_SETTINGS.server_url}/browse/{build_plan_id}')
-                total_sleep_time = total_sleep_time + PLAN_STATUS_REQUEST_TIMEOUT
-
-            if total_sleep_time >= PLAN_STARTED_TIMEOUT:
-                raise Exception(f'ERROR: Build plan {build_plan_id} could not start in '
-                                f'{PLAN_STARTED_TIMEOUT} seconds.')
-            else:
-                total_sleep_time = total_sleep_time + PLAN_STATUS_REQUEST_TIMEOUT
+        plan_result_key = f'{build_plan_id}-{build_num}'
+        started = build_watcher.watch(plan_result_key, build_job_num)
+        try:
+            response = started.wait(PLAN_STARTED_TIMEOUT / 2)
+            if response is None:
+                logger.info(f'WARNING: Plan |{build_job_num}| could not start in {PLAN_STARTED_TIMEOUT / 2} '
+                            f'seconds.')
+                logger.info(f'{BAMBOO_SETTINGS.server_url}/browse/{build_plan_id}')
+                response = started.wait(PLAN_STARTED_TIMEOUT / 2)
+        finally:
+            build_watcher.forget(plan_result_key)
+        if response is None:
+            raise Exception(f'ERROR: Build plan {build_plan_id} could not start in '
+                            f'{PLAN_STARTED_TIMEOUT} seconds.')
+        build_queue_duration_msec = int(response['queueDuration'])
+        logger.info(f'Plan |{build_job_num}| starts with queue duration {build_queue_duration_msec} ms. '
+                    f'Build start time: {response["buildStartedTime"]}')
         return build_queue_duration_msec
 
     if not plan_is_active:
@@ -85,17 +155,14 @@ def run_build_plans(locust):
                                 exception=e)
 
     total = time.time() - start
-    sleep_time = action_time - total if action_time > total else 0
     logger.info(f'Total functions time: {total}. Expected full action time {action_time}. '
-                f'Plan {build_plan_id} is successfully started. Waiting {sleep_time}.\n')
-    time.sleep(sleep_time)
+                f'Plan {build_plan_id} is successfully started.\n')
+    build_plan_pacer.after_action('locust_run_build_plan', start)
 
 
 @bamboo_measure('locust_bamboo_login')
 def locust_bamboo_login(locust):
-    session_id = str(uuid.uuid4())
-    locust.cross_action_storage[session_id] = dict()
-    locust.session_data_storage = locust.cross_action_storage[session_id]
+    locust.start_session()
     locust.session_data_storage['app'] = 'bamboo'
 
     params = Login()
@@ -113,11 +180,11 @@ def locust_bamboo_login(locust):
                     TEXT_HEADERS,
                     catch_response=True)
 
-    content = r.content.decode('utf-8')
+    content = r.content
 
-    if 'Log Out' not in content:
-        logger.error(f'Login with {username}, {password} failed: {content}')
-    assert 'Log Out' in content, 'User authentication failed.'
+    if b'Log Out' not in content:
+        logger.error(f'Login with {username}, {password} failed: {content.decode("utf-8")}')
+    assert b'Log Out' in content, 'User authentication failed.'
     logger.locust_info(f'User {username} is successfully logged in')
 
     locust.session_data_storage['username'] = user[0]
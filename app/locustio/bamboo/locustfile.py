@@ -1,4 +1,4 @@
-from locust import HttpUser, task, between
+from locust import task, between
 from locustio.bamboo.http_actions import run_build_plans
 from locustio.common_utils import LocustConfig, MyBaseTaskSet
 from util.conf import BAMBOO_SETTINGS
@@ -13,7 +13,8 @@ class BambooBehavior(MyBaseTaskSet):
         run_build_plans(self)
 
 
-class BambooUser(HttpUser):
+class BambooUser(config.http_user):
     host = BAMBOO_SETTINGS.server_url
+    insecure = not config.secure  # FastHttpUser only, HttpUser client is configured with client.verify
     tasks = [BambooBehavior]
     wait_time = between(0, 0)
@@ -1,4 +1,4 @@
-from locust import HttpUser, task, between
+from locust import task, between
 from extension.bamboo.extension_locust import app_specific_action
 from locustio.bamboo.http_actions import locust_bamboo_login
 from locustio.common_utils import LocustConfig, MyBaseTaskSet
@@ -18,7 +18,8 @@ class BambooBehavior(MyBaseTaskSet):
         app_specific_action(self)
 
 
-class BambooUser(HttpUser):
+class BambooUser(config.http_user):
     host = BAMBOO_SETTINGS.server_url
+    insecure = not config.secure  # FastHttpUser only, HttpUser client is configured with client.verify
     tasks = [BambooBehavior]
     wait_time = between(0, 0)
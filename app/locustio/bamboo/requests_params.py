@@ -1,4 +1,5 @@
-from locustio.common_utils import read_input_file
+from locustio.common_utils import read_input_file, shard_dataset
+from util.conf import BAMBOO_SETTINGS
 from util.project_paths import BAMBOO_USERS, BAMBOO_BUILD_PLANS
 
 
@@ -16,6 +17,6 @@ class Login:
 
 def bamboo_datasets():
     data_sets = dict()
-    data_sets["users"] = read_input_file(BAMBOO_USERS)
+    data_sets["users"] = shard_dataset(read_input_file(BAMBOO_USERS), BAMBOO_SETTINGS.locust_workers)
     data_sets["build_plans"] = read_input_file(BAMBOO_BUILD_PLANS)
     return data_sets
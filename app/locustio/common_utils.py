@@ -1,21 +1,35 @@
+import atexit
 import functools
 
 from locust import events
 import time
-import csv
 import re
 import logging
 import random
 import string
 import json
 import socket
-from logging.handlers import RotatingFileHandler
+import sys
+import weakref
+from collections.abc import MutableMapping
+from contextvars import ContextVar, copy_context
+from logging.handlers import RotatingFileHandler, QueueHandler
 from datetime import datetime
+from urllib.parse import urlencode
+from requests.exceptions import HTTPError
+from requests.utils import requote_uri
+from urllib3 import encode_multipart_formdata
 from util.conf import JIRA_SETTINGS, CONFLUENCE_SETTINGS, JSM_SETTINGS, BAMBOO_SETTINGS, BaseAppSettings
 from util.project_paths import ENV_TAURUS_ARTIFACT_DIR
+from util.dataset_store import MappedDataset
+from locustio.local_workers import register_local_workers, worker_index, shard_dataset  # noqa F401
+from locustio.generator_monitor import register_generator_monitor
+import gevent
+from gevent import monkey
+from gevent.pool import Pool
 from locust import exception
-import inspect
-from locust import TaskSet
+from locust import TaskSet, HttpUser, FastHttpUser
+from locust.contrib.fasthttp import FastHttpSession, FastResponse
 
 
 TEXT_HEADERS = {
@@ -73,6 +87,10 @@ TYPE_AGENT = 'agent'
 TYPE_CUSTOMER = 'customer'
 CONFLUENCE = 'confluence'
 BAMBOO = 'bamboo'
+APP_SETTINGS = {JIRA: JIRA_SETTINGS, CONFLUENCE: CONFLUENCE_SETTINGS, JSM: JSM_SETTINGS, BAMBOO: BAMBOO_SETTINGS}
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+PAYLOAD_SEED = 'dcapt-locust-payload'  # Payload texts are the same in every run
+PAYLOAD_CORPUS_SIZE = 64 * 1024
 
 jira_action_time = 3600 / int((JIRA_SETTINGS.total_actions_per_hour) / int(JIRA_SETTINGS.concurrency))
 confluence_action_time = 3600 / int((CONFLUENCE_SETTINGS.total_actions_per_hour) / int(CONFLUENCE_SETTINGS.concurrency))
@@ -81,12 +99,37 @@ jsm_customer_action_time = 3600 / int((JSM_SETTINGS.customers_total_actions_per_
                                       / int(JSM_SETTINGS.customers_concurrency))
 bamboo_action_time = 3600 / int((BAMBOO_SETTINGS.total_actions_per_hour) / int(BAMBOO_SETTINGS.concurrency))
 
+CLOSED_PACING = 'closed'
+CONSTANT_PACING = 'constant'
+POISSON_PACING = 'poisson'
+PACING_MODES = [CLOSED_PACING, CONSTANT_PACING, POISSON_PACING]
+REQUESTS_HTTP_CLIENT = 'requests'
+FAST_HTTP_CLIENT = 'fast'
+HTTP_USER_CLASSES = {REQUESTS_HTTP_CLIENT: HttpUser, FAST_HTTP_CLIENT: FastHttpUser}
+BROWSER_CONNECTIONS = 6  # Concurrent connections per host opened by a browser
+SESSION_STORE_REPORT_INTERVAL = 60  # seconds
+
+# Name of the action measured by global_measure, every greenlet (locust user) has its own value
+CURRENT_ACTION: ContextVar = ContextVar('current_action', default=None)
+
 
 class LocustConfig:
 
     def __init__(self, config_yml: BaseAppSettings):
         self.env = config_yml.env_settings
         self.secure = config_yml.secure
+        self.http_client = config_yml.locust_http_client
+        self.workers = config_yml.locust_workers
+        self.concurrent_requests = config_yml.locust_concurrent_requests
+        register_local_workers(self.workers)
+        register_generator_monitor()
+
+    @property
+    def http_user(self):
+        if self.http_client not in HTTP_USER_CLASSES:
+            raise Exception(f'Locust http client {self.http_client} is not supported, '
+                            f'use one of {list(HTTP_USER_CLASSES)}')
+        return HTTP_USER_CLASSES[self.http_client]
 
     def percentage(self, action_name: str):
         if action_name in self.env:
@@ -100,52 +143,314 @@ class Logger(logging.Logger):
     def __init__(self, name, level, app_type):
         super().__init__(name=name, level=level)
         self.type = app_type
+        # Verbose setting is resolved once, locust_info is called from every action
+        app_settings = APP_SETTINGS.get(app_type.lower()) if app_type else None
+        self.is_verbose = not app_type or bool(app_settings and app_settings.verbose)
 
     def locust_info(self, msg, *args, **kwargs):
-        is_verbose = False
-        if self.type.lower() == 'confluence':
-            is_verbose = CONFLUENCE_SETTINGS.verbose
-        elif self.type.lower() == 'jira':
-            is_verbose = JIRA_SETTINGS.verbose
-        elif self.type.lower() == 'jsm':
-            is_verbose = JSM_SETTINGS.verbose
-        elif self.type.lower() == 'bamboo':
-            is_verbose = BAMBOO_SETTINGS.verbose
-        if is_verbose or not self.type:
-            if self.isEnabledFor(logging.INFO):
-                self._log(logging.INFO, msg, args, **kwargs)
+        if self.is_verbose and self.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, msg, args, **kwargs)
+
+
+class LogWriter:
+    """
+    Writes records of all locust loggers of the process to the log file from a native thread. Greenlets of locust
+    users only put records to the queue, so file writes and log rotation do not block measured requests.
+    """
+
+    def __init__(self, handler: logging.Handler):
+        self.handler = handler
+        # Original (not monkey patched) queue and thread, gevent would run the writer on the hub of locust users
+        self.queue = monkey.get_original('queue', 'SimpleQueue')()
+        self.__stopped = monkey.get_original('_thread', 'allocate_lock')()
+        self.__stopped.acquire()
+        monkey.get_original('_thread', 'start_new_thread')(self.__write, ())
+        atexit.register(self.stop)
+
+    def __write(self):
+        try:
+            while True:
+                record = self.queue.get()
+                if record is None:
+                    break
+                self.handler.handle(record)
+        finally:
+            self.handler.close()
+            self.__stopped.release()
+
+    def stop(self):
+        """
+        Writes queued records and closes the log file.
+        """
+        self.queue.put(None)
+        self.__stopped.acquire()
+
+
+class SessionStore(MutableMapping):
+    """
+    Cross actions storage of locust user sessions. Every user has a single session: login replaces the previous
+    session of the user and the session is removed when the user stops, so the store does not grow in long runs.
+    Other keys, e.g. set by extension code, are kept as in a plain dict.
+    """
+
+    def __init__(self):
+        # Sessions are also dropped with the task set object of a killed user
+        self.__sessions = weakref.WeakKeyDictionary()
+        self.__items = dict()
+
+    def __storage(self, key):
+        return self.__sessions if isinstance(key, TaskSet) else self.__items
+
+    def start_session(self, locust) -> dict:
+        session = dict()
+        self.__sessions[locust] = session
+        return session
+
+    def end_session(self, locust):
+        self.__sessions.pop(locust, None)
+
+    def __getitem__(self, key):
+        return self.__storage(key)[key]
+
+    def __setitem__(self, key, value):
+        self.__storage(key)[key] = value
+
+    def __delitem__(self, key):
+        del self.__storage(key)[key]
+
+    def __iter__(self):
+        yield from list(self.__sessions.keys())
+        yield from list(self.__items)
+
+    def __len__(self):
+        return len(self.__sessions) + len(self.__items)
+
+    def memory_size(self) -> int:
+        """
+        Approximate size of all sessions in bytes.
+        """
+        return sum(self.__size_of(session) for session in list(self.values()))
+
+    @staticmethod
+    def __size_of(obj) -> int:
+        size = sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            size += sum(SessionStore.__size_of(key) + SessionStore.__size_of(value) for key, value in obj.items())
+        elif isinstance(obj, (list, tuple, set)):
+            size += sum(SessionStore.__size_of(item) for item in obj)
+        return size
 
 
 class MyBaseTaskSet(TaskSet):
 
-    cross_action_storage = dict()  # Cross actions locust storage
+    cross_action_storage = SessionStore()  # Cross actions locust storage, shared by all users of the process
     session_data_storage = dict()
     login_failed = False
+    concurrent_requests = False  # Send sub-requests of run_requests concurrently
+    __request_pool = None
+
+    def start_session(self):
+        self.session_data_storage = self.cross_action_storage.start_session(self)
 
-    def failure_check(self, response, action_name):
-        if hasattr(response, 'error') or not response:
-            if 'login' in action_name:
+    def on_stop(self):
+        self.cross_action_storage.end_session(self)
+
+    def failure_check(self, response, action_name, function_name=None):
+        if self.__is_failed(response):
+            # Login is detected by the function sending the request, e.g. do_login of run_as_specific_user
+            if 'login' in (function_name or action_name):
                 self.login_failed = True
             events.request.fire(request_type="Action",
-                                name=f"locust_{action_name}",
+                                name=action_name,
                                 response_time=0,
                                 response_length=0,
                                 context=None,
                                 response=None,
-                                exception=str(response.raise_for_status()))
-
-    def get(self, *args, **kwargs):
-        r = self.client.get(*args, **kwargs)
-        action_name = inspect.stack()[1][3]
-        self.failure_check(response=r, action_name=action_name)
+                                exception=str(self.__raise_for_status(response)))
+
+    @staticmethod
+    def __is_failed(response):
+        if hasattr(response, 'error'):
+            return True
+        # Truth value of FastResponse is its content length, not the status like for requests.Response
+        if isinstance(response, FastResponse):
+            return not 0 < response.status_code < 400
+        return not response
+
+    @staticmethod
+    def __raise_for_status(response):
+        response.raise_for_status()
+        # FastResponse raises connection errors only
+        if isinstance(response, FastResponse) and response.status_code >= 400:
+            raise HTTPError(f'{response.status_code} Error for url: {response.url}')
+
+    @staticmethod
+    def __action_name(function_name):
+        # Failures are reported under the measured action, or the calling function outside of actions.
+        # Request names in locust stats are not changed.
+        return CURRENT_ACTION.get() or f'locust_{function_name}'
+
+    def __request_args(self, url, kwargs):
+        """
+        Adapts python-requests arguments to FastHttpSession: query params are added to the url and the url is quoted,
+        form and multipart bodies are encoded here the same way python-requests does it. Headers are copied because
+        FastHttpSession adds auth header to the passed dict, Content-Length is always set by the client from the body.
+        """
+        if not isinstance(self.client, FastHttpSession):
+            return url, kwargs
+        params = kwargs.pop('params', None)
+        if params:
+            query = params if isinstance(params, str) else urlencode(params, doseq=True)
+            url = f"{url}{'&' if '?' in url else '?'}{query}"
+        url = requote_uri(url)
+        headers = {name: value for name, value in (kwargs.get('headers') or {}).items()
+                   if name.lower() != 'content-length'}
+        data = kwargs.get('data')
+        files = kwargs.pop('files', None)
+        if files:
+            fields = list(data.items()) if isinstance(data, dict) else []
+            for name, file in files.items():
+                content = file[1].read() if hasattr(file[1], 'read') else file[1]
+                fields.append((name, (file[0], content, *file[2:3])))
+            kwargs['data'], content_type = encode_multipart_formdata(fields)
+            headers.setdefault('Content-Type', content_type)
+        elif isinstance(data, dict):
+            kwargs['data'] = urlencode(data, doseq=True)
+            headers.setdefault('Content-Type', 'application/x-www-form-urlencoded')
+        kwargs['headers'] = headers
+        return url, kwargs
+
+    def get(self, url, params=None, **kwargs):
+        function_name = sys._getframe(1).f_code.co_name
+        action_name = self.__action_name(function_name)
+        url, kwargs = self.__request_args(url, dict(kwargs, params=params))
+        r = self.client.get(url, **kwargs)
+        self.failure_check(response=r, action_name=action_name, function_name=function_name)
         return r
 
-    def post(self, *args, **kwargs):
-        r = self.client.post(*args, **kwargs)
-        action_name = inspect.stack()[1][3]
-        self.failure_check(response=r, action_name=action_name)
+    def post(self, url, data=None, json=None, **kwargs):
+        function_name = sys._getframe(1).f_code.co_name
+        action_name = self.__action_name(function_name)
+        url, kwargs = self.__request_args(url, dict(kwargs, data=data, json=json))
+        r = self.client.post(url, **kwargs)
+        self.failure_check(response=r, action_name=action_name, function_name=function_name)
         return r
 
+    def clear_cookies(self):
+        if isinstance(self.client, FastHttpSession):
+            self.client.cookiejar.clear()
+        else:
+            self.client.cookies.clear()
+
+    def run_requests(self, *requests):
+        """
+        Sends independent sub-requests of an action, requests are callables, e.g. functools.partial(locust.post,
+        url, ...), their responses are returned in the same order. Requests are sent one after another, unless
+        concurrent_requests is set: then they are sent concurrently over at most BROWSER_CONNECTIONS connections,
+        like a browser does. Every concurrent request runs in a copy of the action context, so it is attributed to
+        the measured action. The first failed request fails the action, the rest of the group is cancelled.
+        """
+        if not self.concurrent_requests:
+            return [request() for request in requests]
+        if self.__request_pool is None:
+            # Pool of the locust user, reused by all its actions
+            self.__request_pool = Pool(BROWSER_CONNECTIONS)
+        greenlets = [self.__request_pool.spawn(copy_context().run, self.__catch_error, request)
+                     for request in requests]
+        try:
+            for greenlet in gevent.iwait(greenlets):
+                if isinstance(greenlet.value, Exception):
+                    raise greenlet.value
+        finally:
+            gevent.killall(greenlets)
+        return [greenlet.value for greenlet in greenlets]
+
+    @staticmethod
+    def __catch_error(request):
+        # Error is raised by the action only, not reported by gevent hub for every failed request
+        try:
+            return request()
+        except Exception as e:
+            return e
+
+
+class ActionPacer:
+    """
+    Paces measured actions of every locust user to reach the target number of actions per hour.
+    closed: user sleeps for the rest of action time after every action, so the offered load drops when
+    the server slows down.
+    constant, poisson: actions are scheduled on a per-user timeline with constant or exponentially distributed
+    intervals independent of response times. Late start of action is queueing delay: it is logged to locust.log
+    for every late action and summarized by action at the end of the test. It is not a locust request, so it is not
+    added to the results.
+    """
+
+    def __init__(self, action_time: float, mode: str = CLOSED_PACING):
+        if mode not in PACING_MODES:
+            raise Exception(f'Load pacing {mode} is not supported, use one of {PACING_MODES}')
+        self.action_time = action_time
+        self.mode = mode
+        # Scheduled start of the next action, every greenlet (locust user) has its own timeline
+        self.next_start: ContextVar = ContextVar(f'next_action_start_{id(self)}', default=None)
+        # Action name: [actions, late actions, total queueing delay ms, max queueing delay ms]
+        self.queueing_delays = dict()
+        if self.mode != CLOSED_PACING:
+            events.test_stop.add_listener(self.report_queueing_delays)
+
+    def __next_interval(self):
+        if self.mode == POISSON_PACING:
+            return random.expovariate(1 / self.action_time)
+        return self.action_time
+
+    def before_action(self, interaction):
+        if self.mode == CLOSED_PACING:
+            return
+        now = time.time()
+        scheduled_start = self.next_start.get()
+        if scheduled_start is None:
+            scheduled_start = now + self.__next_interval() if self.mode == POISSON_PACING else now
+        self.next_start.set(scheduled_start + self.__next_interval())
+        if scheduled_start > now:
+            time.sleep(scheduled_start - now)
+            queueing_delay = 0
+        else:
+            queueing_delay = int((now - scheduled_start) * 1000)
+            if queueing_delay:
+                logger.info(f'action: {interaction}, queueing delay {queueing_delay} ms')
+        delays = self.queueing_delays.setdefault(interaction, [0, 0, 0, 0])
+        delays[0] += 1
+        if queueing_delay:
+            delays[1] += 1
+            delays[2] += queueing_delay
+            delays[3] = max(delays[3], queueing_delay)
+
+    def report_queueing_delays(self, **kwargs):
+        for interaction, (actions, late_actions, total_delay, max_delay) in self.queueing_delays.items():
+            logger.info(f'action: {interaction}, {self.mode} pacing: {late_actions} of {actions} actions started late, '
+                        f'mean queueing delay {total_delay // actions} ms, max {max_delay} ms')
+        self.queueing_delays.clear()
+
+    def after_action(self, interaction, start_time):
+        if self.mode != CLOSED_PACING:
+            return
+        total = time.time() - start_time
+        if total < self.action_time:
+            sleep = self.action_time - total
+            logger.info(f'action: {interaction}, action_execution_time: {total}, sleep {sleep}')
+            time.sleep(sleep)
+
+    def measure(self, interaction):
+        def deco_wrapper(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                self.before_action(interaction)
+                start = time.time()
+                result = global_measure(func, start, interaction, *args, **kwargs)
+                self.after_action(interaction, start)
+                return result
+            return wrapper
+        return deco_wrapper
+
 
 class BaseResource:
     action_name = ''
@@ -165,101 +470,58 @@ class BaseResource:
 
 def jira_measure(interaction=None):
     assert interaction is not None, "Interaction name is not passed to the jira_measure decorator"
-
-    def deco_wrapper(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            start = time.time()
-            result = global_measure(func, start, interaction, *args, **kwargs)
-            total = (time.time() - start)
-            if total < jira_action_time:
-                sleep = (jira_action_time - total)
-                print(f'action: {interaction}, action_execution_time: {total}, sleep {sleep}')
-                time.sleep(sleep)
-            return result
-        return wrapper
-    return deco_wrapper
+    return jira_pacer.measure(interaction)
 
 
 def jsm_agent_measure(interaction=None):
     assert interaction is not None, "Interaction name is not passed to the jsm_agent_measure decorator"
-
-    def deco_wrapper(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            start = time.time()
-            result = global_measure(func, start, interaction, *args, **kwargs)
-            total = (time.time() - start)
-            if total < jsm_agent_action_time:
-                sleep = (jsm_agent_action_time - total)
-                print(f'action: {interaction}, action_execution_time: {total}, sleep {sleep}')
-                time.sleep(sleep)
-            return result
-        return wrapper
-    return deco_wrapper
+    return jsm_agent_pacer.measure(interaction)
 
 
 def jsm_customer_measure(interaction=None):
     assert interaction is not None, "Interaction name is not passed to the jsm_customer_measure decorator"
-
-    def deco_wrapper(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            start = time.time()
-            result = global_measure(func, start, interaction, *args, **kwargs)
-            total = (time.time() - start)
-            if total < jsm_customer_action_time:
-                sleep = (jsm_customer_action_time - total)
-                print(f'action: {interaction}, action_execution_time: {total}, sleep {sleep}')
-                time.sleep(sleep)
-            return result
-        return wrapper
-    return deco_wrapper
+    return jsm_customer_pacer.measure(interaction)
 
 
 def confluence_measure(interaction=None):
     assert interaction is not None, "Interaction name is not passed to the confluence_measure decorator"
-
-    def deco_wrapper(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            start = time.time()
-            result = global_measure(func, start, interaction, *args, **kwargs)
-            total = (time.time() - start)
-            if total < confluence_action_time:
-                sleep = (confluence_action_time - total)
-                logger.info(f'action: {interaction}, action_execution_time: {total}, sleep {sleep}')
-                time.sleep(sleep)
-            return result
-        return wrapper
-    return deco_wrapper
+    return confluence_pacer.measure(interaction)
 
 
 def bamboo_measure(interaction=None):
     assert interaction is not None, "Interaction name is not passed to the bamboo_measure decorator"
+    return bamboo_pacer.measure(interaction)
 
-    def deco_wrapper(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            start = time.time()
-            result = global_measure(func, start, interaction, *args, **kwargs)
-            total = (time.time() - start)
-            if total < bamboo_action_time:
-                sleep = (bamboo_action_time - total)
-                logger.info(f'action: {interaction}, action_execution_time: {total}, sleep {sleep}')
-                time.sleep(sleep)
-            return result
-        return wrapper
-    return deco_wrapper
+
+jira_pacer = ActionPacer(jira_action_time, JIRA_SETTINGS.load_pacing)
+confluence_pacer = ActionPacer(confluence_action_time, CONFLUENCE_SETTINGS.load_pacing)
+jsm_agent_pacer = ActionPacer(jsm_agent_action_time, JSM_SETTINGS.load_pacing)
+jsm_customer_pacer = ActionPacer(jsm_customer_action_time, JSM_SETTINGS.load_pacing)
+bamboo_pacer = ActionPacer(bamboo_action_time, BAMBOO_SETTINGS.load_pacing)
+
+
+@events.test_start.add_listener
+def report_session_store(environment, **kwargs):
+    """
+    Logs the number of sessions in the session store and their approximate size to locust.log.
+    """
+    def report():
+        while True:
+            gevent.sleep(SESSION_STORE_REPORT_INTERVAL)
+            logger.info(f'session store: {len(MyBaseTaskSet.cross_action_storage)} sessions, '
+                        f'{MyBaseTaskSet.cross_action_storage.memory_size()} bytes')
+
+    reporter = gevent.spawn(report)
+    environment.events.test_stop.add_listener(lambda **kw: reporter.kill(block=False))
 
 
 def global_measure(func, start_time, interaction, *args, **kwargs):
     result = None
+    action_token = CURRENT_ACTION.set(interaction)
     try:
         result = func(*args, **kwargs)
     except Exception as e:
         total = int((time.time() - start_time) * 1000)
-        print(e)
         events.request.fire(request_type="Action",
                             name=interaction,
                             response_time=total,
@@ -279,37 +541,64 @@ def global_measure(func, start_time, interaction, *args, **kwargs):
                             exception=None
                             )
         logger.info(f'{interaction} is finished successfully')
+    finally:
+        CURRENT_ACTION.reset(action_token)
     return result
 
 
 def read_input_file(file_path):
-    with open(file_path, 'r') as fs:
-        reader = csv.reader(fs)
-        return list(reader)
+    return MappedDataset(file_path)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_pattern(pattern: str, as_bytes: bool = False):
+    return re.compile(pattern.encode('utf-8') if as_bytes else pattern)
 
 
 def fetch_by_re(pattern, text, group_no=1, default_value=None):
-    search = re.search(pattern, text)
+    # Patterns are compiled once, response content is searched as bytes without decoding the whole page
+    if isinstance(text, bytes):
+        search = compile_pattern(pattern, as_bytes=True).search(text)
+        return search.group(group_no).decode('utf-8') if search else default_value
+    search = compile_pattern(pattern).search(text)
     if search:
         return search.group(group_no)
     else:
         return default_value
 
 
+def fetch_all_by_re(pattern, content):
+    # Matches of patterns with several groups are tuples, as with re.findall
+    if isinstance(content, str):
+        return compile_pattern(pattern).findall(content)
+    return [tuple(group.decode('utf-8') for group in value) if isinstance(value, tuple) else value.decode('utf-8')
+            for value in compile_pattern(pattern, as_bytes=True).findall(content)]
+
+
 def read_json(file_json):
     with open(file_json) as f:
         return json.load(f)
 
 
-def init_logger(app_type=None):
+@functools.lru_cache(maxsize=None)
+def get_log_writer():
     logfile_path = ENV_TAURUS_ARTIFACT_DIR / 'locust.log'
-    root_logger = Logger(name='locust', level=logging.INFO, app_type=app_type)
     log_format = f"[%(asctime)s.%(msecs)03d] [%(levelname)s] {socket.gethostname()}/%(name)s : %(message)s"
     formatter = logging.Formatter(log_format, '%Y-%m-%d %H:%M:%S')
-    file_handler = RotatingFileHandler(logfile_path, maxBytes=5 * 1024 * 1024, backupCount=3)
+    # Only the main locust process rotates the log shared with local workers
+    max_bytes = 0 if worker_index() else LOG_FILE_MAX_BYTES
+    file_handler = RotatingFileHandler(logfile_path, maxBytes=max_bytes, backupCount=3)
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.INFO)
-    root_logger.addHandler(file_handler)
+    return LogWriter(file_handler)
+
+
+def init_logger(app_type=None):
+    root_logger = Logger(name='locust', level=logging.INFO, app_type=app_type)
+    # All loggers of the process share a single log file writer
+    queue_handler = QueueHandler(get_log_writer().queue)
+    queue_handler.setLevel(logging.INFO)
+    root_logger.addHandler(queue_handler)
     return root_logger
 
 
@@ -318,11 +607,32 @@ def timestamp_int():
     return int(datetime.timestamp(now))
 
 
+class PayloadCorpus:
+    """
+    Seeded random text generated once per process. Payload strings are its slices at random offsets, so
+    actions do not build them one random character at a time.
+    """
+
+    def __init__(self, alphabet: str, size: int = PAYLOAD_CORPUS_SIZE):
+        rng = random.Random(f'{PAYLOAD_SEED}-{alphabet}')
+        self.text = ''.join(rng.choices(alphabet, k=size))
+
+    def get(self, length: int) -> str:
+        if length > len(self.text):
+            return (self.text * (length // len(self.text) + 1))[:length]
+        offset = random.randrange(len(self.text) - length + 1)
+        return self.text[offset:offset + length]
+
+
+TEXT_CORPUS = PayloadCorpus(string.digits + string.ascii_letters + ' ')
+LETTERS_CORPUS = PayloadCorpus(string.ascii_lowercase + ' ')
+
+
 def generate_random_string(length, only_letters=False):
     if not only_letters:
-        return "".join([random.choice(string.digits + string.ascii_letters + ' ') for _ in range(length)])
+        return TEXT_CORPUS.get(length)
     else:
-        return "".join([random.choice(string.ascii_lowercase + ' ') for _ in range(length)])
+        return LETTERS_CORPUS.get(length)
 
 
 def get_first_index(from_list: list, err):
@@ -376,11 +686,10 @@ def run_as_specific_user(username=None, password=None):
                     raise Exception(f'The "{app}" application type is not known.')
 
                 def do_login(usr, pwd):
-                    locust.client.cookies.clear()
+                    locust.clear_cookies()
                     r = locust.get(url, auth=(usr, pwd), catch_response=True)
                     if token_pattern:
-                        content = r.content.decode('utf-8')
-                        token = fetch_by_re(token_pattern, content)
+                        token = fetch_by_re(token_pattern, r.content)
                         locust.session_data_storage["token"] = token
 
                 # send requests by the specific user
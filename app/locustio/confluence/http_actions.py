@@ -1,12 +1,12 @@
 import random
-import re
 
-from locustio.common_utils import confluence_measure, fetch_by_re, timestamp_int, \
+from locustio.common_utils import confluence_measure, fetch_by_re, fetch_all_by_re, timestamp_int, \
     TEXT_HEADERS, NO_TOKEN_HEADERS, JSON_HEADERS, RESOURCE_HEADERS, generate_random_string, init_logger, \
     raise_if_login_failed
 from locustio.confluence.requests_params import confluence_datasets, Login, ViewPage, ViewDashboard, ViewBlog, \
     CreateBlog, CreateEditPage, UploadAttachments, LikePage, CommentPage, ViewAttachment
 from util.conf import CONFLUENCE_SETTINGS
+from util.attachment_pool import attachment_pool
 import uuid
 
 logger = init_logger(app_type='confluence')
@@ -15,9 +15,7 @@ confluence_dataset = confluence_datasets()
 
 @confluence_measure('locust_login_and_view_dashboard')
 def login_and_view_dashboard(locust):
-    session_id = str(uuid.uuid4())
-    locust.cross_action_storage[session_id] = dict()
-    locust.session_data_storage = locust.cross_action_storage[session_id]
+    locust.start_session()
     locust.session_data_storage['app'] = 'confluence'
 
     params = Login()
@@ -36,11 +34,11 @@ def login_and_view_dashboard(locust):
                 catch_response=True)
 
     r = locust.get(url='/', catch_response=True)
-    content = r.content.decode('utf-8')
+    content = r.content
 
-    if 'Log Out' not in content:
-        logger.error(f'Login with {username}, {password} failed: {content}')
-    assert 'Log Out' in content, 'User authentication failed.'
+    if b'Log Out' not in content:
+        logger.error(f'Login with {username}, {password} failed: {content.decode("utf-8")}')
+    assert b'Log Out' in content, 'User authentication failed.'
     logger.locust_info(f'User {username} is successfully logged in')
     keyboard_hash = fetch_by_re(params.keyboard_hash_re, content)
     build_number = fetch_by_re(params.build_number_re, content)
@@ -100,10 +98,10 @@ def view_page(locust):
     # 100 pages/viewpage.action
     r = locust.get(f'/pages/viewpage.action?pageId={page_id}', catch_response=True)
 
-    content = r.content.decode('utf-8')
-    if 'Created by' not in content or 'Save for later' not in content:
-        logger.error(f'Fail to open page {page_id}: {content}')
-    assert 'Created by' in content and 'Save for later' in content, 'Could not open page.'
+    content = r.content
+    if b'Created by' not in content or b'Save for later' not in content:
+        logger.error(f'Fail to open page {page_id}: {content.decode("utf-8")}')
+    assert b'Created by' in content and b'Save for later' in content, 'Could not open page.'
     parent_page_id = fetch_by_re(params.parent_page_id_re, content)
     parsed_page_id = fetch_by_re(params.page_id_re, content)
     space_key = fetch_by_re(params.space_key_re, content)
@@ -112,7 +110,7 @@ def view_page(locust):
     root_page_id = fetch_by_re(params.root_page_id_re, content)
 
     editable = fetch_by_re(params.editable_re, content)
-    ancestor_ids = re.findall(params.ancestor_ids_re, content)
+    ancestor_ids = fetch_all_by_re(params.ancestor_ids_re, content)
 
     ancestor_str = 'ancestors='
     for ancestor in ancestor_ids:
@@ -140,10 +138,10 @@ def view_page(locust):
                    f'?containerId={parsed_page_id}'
                    f'&_={timestamp_int()}',
                    catch_response=True)
-    content = r.content.decode('utf-8')
-    if 'authorDisplayName' not in content and '[]' not in content:
-        logger.error(f'Could not open comments for page {parsed_page_id}: {content}')
-    assert 'authorDisplayName' in content or '[]' in content, 'Could not open comments for page.'
+    content = r.content
+    if b'authorDisplayName' not in content and b'[]' not in content:
+        logger.error(f'Could not open comments for page {parsed_page_id}: {content.decode("utf-8")}')
+    assert b'authorDisplayName' in content or b'[]' in content, 'Could not open comments for page.'
 
     # 140 rest/shortcuts/latest/shortcuts/{ajs-build-number}/{ajs-keyboardshortcut-hash}
     locust.get(f'/rest/shortcuts/latest/shortcuts/'
@@ -235,12 +233,12 @@ def view_dashboard(locust):
     # 270 index.action
     r = locust.get('/index.action', catch_response=True)
 
-    content = r.content.decode('utf-8')
+    content = r.content
     keyboard_hash = fetch_by_re(params.keyboard_hash_re, content)
     build_number = fetch_by_re(params.build_number_re, content)
-    if 'quick-search' not in content or 'Log Out' not in content:
-        logger.error(f'Could not view dashboard: {content}')
-    assert 'quick-search' in content and 'Log Out' in content, 'Could not view dashboard.'
+    if b'quick-search' not in content or b'Log Out' not in content:
+        logger.error(f'Could not view dashboard: {content.decode("utf-8")}')
+    assert b'quick-search' in content and b'Log Out' in content, 'Could not view dashboard.'
 
     # 280 rest/webResources/1.0/resources
     locust.post('/rest/webResources/1.0/resources',
@@ -267,10 +265,10 @@ def view_dashboard(locust):
                    '&spaceKey=',
                    catch_response=True)
 
-    content = r.content.decode('utf-8')
-    if 'changeSets' not in content:
-        logger.error(f'Could not view dashboard macros: {content}')
-    assert 'changeSets' in content, 'Could not view dashboard macros.'
+    content = r.content
+    if b'changeSets' not in content:
+        logger.error(f'Could not view dashboard macros: {content.decode("utf-8")}')
+    assert b'changeSets' in content, 'Could not view dashboard macros.'
 
     # 320 rest/experimental/search
     locust.get(f'/rest/experimental/search'
@@ -299,10 +297,10 @@ def view_blog(locust):
                    f'?pageId={blog_id}',
                    catch_response=True)
 
-    content = r.content.decode('utf-8')
-    if 'Created by' not in content or 'Save for later' not in content:
-        logger.error(f'Fail to open blog {blog_id}: {content}')
-    assert 'Created by' in content and 'Save for later' in content, 'Could not view blog.'
+    content = r.content
+    if b'Created by' not in content or b'Save for later' not in content:
+        logger.error(f'Fail to open blog {blog_id}: {content.decode("utf-8")}')
+    assert b'Created by' in content and b'Save for later' in content, 'Could not view blog.'
 
     keyboard_hash = fetch_by_re(params.keyboard_hash_re, content)
     build_number = fetch_by_re(params.build_number_re, content)
@@ -323,10 +321,10 @@ def view_blog(locust):
                    f'?containerId={blog_id}'
                    f'&_={timestamp_int()}',
                    catch_response=True)
-    content = r.content.decode('utf-8')
-    if 'authorDisplayName' not in content and '[]' not in content:
-        logger.error(f'Could not open comments for page {blog_id}: {content}')
-    assert 'authorDisplayName' in content or '[]' in content, 'Could not open comments for page.'
+    content = r.content
+    if b'authorDisplayName' not in content and b'[]' not in content:
+        logger.error(f'Could not open comments for page {blog_id}: {content.decode("utf-8")}')
+    assert b'authorDisplayName' in content or b'[]' in content, 'Could not open comments for page.'
 
     # 380 rest/shortcuts/latest/shortcuts/{build_number}/{keyboard_hash}
     locust.get(f'/rest/shortcuts/latest/shortcuts/{build_number}/{keyboard_hash}'
@@ -388,10 +386,10 @@ def view_blog(locust):
                    f'&timeout=12000&_={timestamp_int()}',
                    catch_response=True)
 
-    content = r.content.decode('utf-8')
-    if 'draftId' not in content:
-        logger.error(f'Could not open editor for blog {blog_id}: {content}')
-    assert 'draftId' in content, 'Could not open editor for blog.'
+    content = r.content
+    if b'draftId' not in content:
+        logger.error(f'Could not open editor for blog {blog_id}: {content.decode("utf-8")}')
+    assert b'draftId' in content, 'Could not open editor for blog.'
 
     # 480 rest/webResources/1.0/resources
     locust.post('/rest/webResources/1.0/resources',
@@ -425,12 +423,12 @@ def search_cql_and_view_results(locust):
                        f"&limit=20",
                        catch_response=True)
 
-        if '{"results":[' not in r.content.decode('utf-8'):
-            logger.locust_info(r.content.decode('utf-8'))
-        content = r.content.decode('utf-8')
-        if 'results' not in content:
-            logger.error(f"Search cql failed: {content}")
-        assert 'results' in content, "Search cql failed."
+        content = r.content
+        if b'{"results":[' not in content:
+            logger.locust_info(content.decode('utf-8'))
+        if b'results' not in content:
+            logger.error(f"Search cql failed: {content.decode('utf-8')}")
+        assert b'results' in content, "Search cql failed."
 
         # 540 rest/mywork/latest/status/notification/count
         locust.get('/rest/mywork/latest/status/notification/count', catch_response=True)
@@ -455,10 +453,10 @@ def open_editor_and_create_blog(locust):
                        f'?spaceKey={blog_space_key}',
                        catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if 'Blog post title' not in content:
-            logger.error(f'Could not open editor for {blog_space_key}: {content}')
-        assert 'Blog post title' in content, 'Could not open editor for blog.'
+        content = r.content
+        if b'Blog post title' not in content:
+            logger.error(f'Could not open editor for {blog_space_key}: {content.decode("utf-8")}')
+        assert b'Blog post title' in content, 'Could not open editor for blog.'
 
         content_id = fetch_by_re(params.content_id_re, content)
         parsed_space_key = fetch_by_re(params.space_key, content)
@@ -513,10 +511,11 @@ def open_editor_and_create_blog(locust):
                         TEXT_HEADERS,
                         catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if locust.session_data_storage['token'] not in content:
-            logger.error(f"Token {locust.session_data_storage['token']} not found in content: {content}")
-        assert locust.session_data_storage['token'] in content, 'Token not found in content.'
+        content = r.content
+        if locust.session_data_storage['token'].encode('utf-8') not in content:
+            logger.error(f"Token {locust.session_data_storage['token']} not found in content: "
+                         f"{content.decode('utf-8')}")
+        assert locust.session_data_storage['token'].encode('utf-8') in content, 'Token not found in content.'
 
         contributor_hash = fetch_by_re(params.contribution_hash, content)
         locust.session_data_storage['contributor_hash'] = contributor_hash
@@ -524,10 +523,10 @@ def open_editor_and_create_blog(locust):
         # 650 rest/ui/1.0/content/{content_id}/labels
         r = locust.get(f'/rest/ui/1.0/content/{content_id}/labels', catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if '"success":true' not in content:
-            logger.error(f'Could not get labels for content {content_id}: {content}')
-        assert '"success":true' in content, 'Could not get labels for content in blog editor.'
+        content = r.content
+        if b'"success":true' not in content:
+            logger.error(f'Could not get labels for content {content_id}: {content.decode("utf-8")}')
+        assert b'"success":true' in content, 'Could not get labels for content in blog editor.'
 
         draft_name = f"Performance Blog - {generate_random_string(10, only_letters=True)}"
         locust.session_data_storage['draft_name'] = draft_name
@@ -552,10 +551,10 @@ def open_editor_and_create_blog(locust):
                         headers=TEXT_HEADERS,
                         catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if 'draftId' not in content:
-            logger.error(f'Could not create blog post draft in space {parsed_space_key}: {content}')
-        assert 'draftId' in content, 'Could not create blog post draft.'
+        content = r.content
+        if b'draftId' not in content:
+            logger.error(f'Could not create blog post draft in space {parsed_space_key}: {content.decode("utf-8")}')
+        assert b'draftId' in content, 'Could not create blog post draft.'
 
     @confluence_measure('locust_create_blog:feel_and_publish')
     def create_blog():
@@ -578,20 +577,20 @@ def open_editor_and_create_blog(locust):
                               headers=TEXT_HEADERS,
                               catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if 'current' not in content or 'title' not in content:
-            logger.error(f'Could not open draft {draft_name}: {content}')
-        assert 'current' in content and 'title' in content, 'Could not open blog draft.'
+        content = r.content
+        if b'current' not in content or b'title' not in content:
+            logger.error(f'Could not open draft {draft_name}: {content.decode("utf-8")}')
+        assert b'current' in content and b'title' in content, 'Could not open blog draft.'
         created_blog_title = fetch_by_re(params.created_blog_title_re, content)
         logger.locust_info(f'Blog {created_blog_title} created')
 
         # 680 {created_blog_title}
         r = locust.get(f'/{created_blog_title}', catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if 'Created by' not in content:
-            logger.error(f'Could not open created blog {created_blog_title}: {content}')
-        assert 'Created by' in content, 'Could not open created blog.'
+        content = r.content
+        if b'Created by' not in content:
+            logger.error(f'Could not open created blog {created_blog_title}: {content.decode("utf-8")}')
+        assert b'Created by' in content, 'Could not open created blog.'
 
         heartbeat_activity_body = {"dataType": "json",
                                    "contentId": content_id,
@@ -725,10 +724,11 @@ def open_editor_and_create_blog(locust):
                         TEXT_HEADERS,
                         catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if locust.session_data_storage['token'] not in content:
-            logger.error(f"Token {locust.session_data_storage['token']} not found in content: {content}")
-        assert locust.session_data_storage['token'] in content, 'Token not found in content.'
+        content = r.content
+        if locust.session_data_storage['token'].encode('utf-8') not in content:
+            logger.error(f"Token {locust.session_data_storage['token']} not found in content: "
+                         f"{content.decode('utf-8')}")
+        assert locust.session_data_storage['token'].encode('utf-8') in content, 'Token not found in content.'
 
     create_blog_editor()
     create_blog()
@@ -753,10 +753,10 @@ def create_and_edit_page(locust):
                        f'&src=quick-create',
                        catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if 'Page Title' not in content:
-            logger.error(f'Could not open page editor: {content}')
-        assert 'Page Title' in content, 'Could not open page editor.'
+        content = r.content
+        if b'Page Title' not in content:
+            logger.error(f'Could not open page editor: {content.decode("utf-8")}')
+        assert b'Page Title' in content, 'Could not open page editor.'
 
         content_id_fetched_by_re = fetch_by_re(params.content_id_re, content)
         parent_page_id_fetched_by_re = fetch_by_re(params.parent_page_id, content)
@@ -1025,10 +1025,10 @@ def create_and_edit_page(locust):
                        f'&timeout=12000&_={timestamp_int()}',
                        catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if page_title not in content:
-            logger.error(f'{page_title}: {content}')
-        assert page_title in content, 'Page editor load failed for page.'
+        content = r.content
+        if page_title.encode('utf-8') not in content:
+            logger.error(f'{page_title}: {content.decode("utf-8")}')
+        assert page_title.encode('utf-8') in content, 'Page editor load failed for page.'
 
         # 1300 rest/analytics/1.0/publish/bulk
         locust.post('/rest/analytics/1.0/publish/bulk',
@@ -1357,10 +1357,10 @@ def comment_page(locust):
                     headers=NO_TOKEN_HEADERS,
                     catch_response=True)
 
-    content = r.content.decode('utf-8')
-    if comment_text not in content:
-        logger.error(f'Could not add comment: {content}')
-    assert comment_text in content, 'Could not add comment.'
+    content = r.content
+    if comment_text.encode('utf-8') not in content:
+        logger.error(f'Could not add comment: {content.decode("utf-8")}')
+    assert comment_text.encode('utf-8') in content, 'Could not add comment.'
 
     # 1740 rest/analytics/1.0/publish/bulk
     locust.post('/rest/analytics/1.0/publish/bulk',
@@ -1389,12 +1389,12 @@ def view_attachments(locust):
                    f'?pageId={page_id}',
                    catch_response=True)
 
-    content = r.content.decode('utf-8')
+    content = r.content
 
-    if not ('Upload file' in content and 'Attach more files' in content or 'currently no attachments' in content):
-        logger.error(f'View attachments failed: {content}')
-    assert 'Upload file' in content and 'Attach more files' in content \
-           or 'currently no attachments' in content, 'View attachments failed.'
+    if not (b'Upload file' in content and b'Attach more files' in content or b'currently no attachments' in content):
+        logger.error(f'View attachments failed: {content.decode("utf-8")}')
+    assert b'Upload file' in content and b'Attach more files' in content \
+           or b'currently no attachments' in content, 'View attachments failed.'
     build_number = fetch_by_re(params.build_number_re, content)
     keyboard_hash = fetch_by_re(params.keyboard_hash_re, content)
     parent_page_id = fetch_by_re(params.parent_page_id_re, content)
@@ -1482,16 +1482,16 @@ def upload_attachments(locust):
     space_key = page[1]
 
     r = locust.get(f'/pages/viewpage.action?pageId={page_id}', catch_response=True)
-    content = r.content.decode('utf-8')
-    if not('Created by' in content and 'Save for later' in content):
-        logger.error(f'Failed to open page {page_id}: {content}')
-    assert 'Created by' in content and 'Save for later' in content, 'Failed to open page to upload attachments.'
+    content = r.content
+    if not(b'Created by' in content and b'Save for later' in content):
+        logger.error(f'Failed to open page {page_id}: {content.decode("utf-8")}')
+    assert b'Created by' in content and b'Save for later' in content, 'Failed to open page to upload attachments.'
     build_number = fetch_by_re(params.build_number_re, content)
     keyboard_hash = fetch_by_re(params.keyboard_hash_re, content)
     parent_page_id = fetch_by_re(params.parent_page_id_re, content)
 
     multipart_form_data = {
-        "file": (file_name, open(file_path, 'rb'), file_extension)
+        "file": (file_name, attachment_pool.get(file_path), file_extension)
     }
 
     # 1900 pages/doattachfile.action?pageId={page_id}
@@ -1501,10 +1501,10 @@ def upload_attachments(locust):
                             "comment_2": "", "comment_3": "", "comment_4": "0", "confirm": "Attach"},
                     files=multipart_form_data,
                     catch_response=True)
-    content = r.content.decode('utf-8')
-    if not('Upload file' in content and 'Attach more files' in content):
-        logger.error(f'Could not upload attachments: {content}')
-    assert 'Upload file' in content and 'Attach more files' in content, 'Could not upload attachments.'
+    content = r.content
+    if not(b'Upload file' in content and b'Attach more files' in content):
+        logger.error(f'Could not upload attachments: {content.decode("utf-8")}')
+    assert b'Upload file' in content and b'Attach more files' in content, 'Could not upload attachments.'
 
     # 1910 rest/shortcuts/latest/shortcuts/{build_number}/{keyboard_hash}
     locust.get(f'/rest/shortcuts/latest/shortcuts/{build_number}/{keyboard_hash}'
@@ -1591,7 +1591,7 @@ def like_page(locust):
                    headers=JSON_HEADERS,
                    catch_response=True)
 
-    content = r.content.decode('utf-8')
+    content = r.content
     like = fetch_by_re(params.like_re, content)
 
     if like is None:
@@ -1604,7 +1604,7 @@ def like_page(locust):
         r = locust.client.delete(f'/rest/likes/1.0/content/{page_id}/likes',
                                  catch_response=True)
 
-    content = r.content.decode('utf-8')
-    if 'likes' not in content:
-        logger.error(f"Could not set like to the page {page_id}: {content}")
-    assert 'likes' in r.content.decode('utf-8'), 'Could not set like to the page.'
+    content = r.content
+    if b'likes' not in content:
+        logger.error(f"Could not set like to the page {page_id}: {content.decode('utf-8')}")
+    assert b'likes' in content, 'Could not set like to the page.'
@@ -1,4 +1,4 @@
-from locust import HttpUser, task, between
+from locust import task, between
 
 from extension.confluence.extension_locust import app_specific_action
 from locustio.common_utils import LocustConfig, MyBaseTaskSet
@@ -61,7 +61,8 @@ class ConfluenceBehavior(MyBaseTaskSet):
         app_specific_action(self)
 
 
-class ConfluenceUser(HttpUser):
+class ConfluenceUser(config.http_user):
     host = CONFLUENCE_SETTINGS.server_url
+    insecure = not config.secure  # FastHttpUser only, HttpUser client is configured with client.verify
     tasks = [ConfluenceBehavior]
     wait_time = between(0, 0)
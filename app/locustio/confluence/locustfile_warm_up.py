@@ -1,4 +1,4 @@
-from locust import HttpUser, task, between
+from locust import task, between
 
 from locustio.common_utils import LocustConfig, MyBaseTaskSet
 from locustio.confluence.http_actions import login_and_view_dashboard, view_page, view_dashboard, view_blog, \
@@ -33,7 +33,8 @@ class ConfluenceBehavior(MyBaseTaskSet):
     def view_attachments_action(self):
         view_attachments(self)
 
-class ConfluenceUser(HttpUser):
+class ConfluenceUser(config.http_user):
     host = CONFLUENCE_SETTINGS.server_url
+    insecure = not config.secure  # FastHttpUser only, HttpUser client is configured with client.verify
     tasks = [ConfluenceBehavior]
     wait_time = between(0, 0)
@@ -1,14 +1,15 @@
 # flake8: noqa
-from locustio.common_utils import read_input_file, BaseResource
+from locustio.common_utils import read_input_file, shard_dataset, BaseResource
+from util.conf import CONFLUENCE_SETTINGS
 from util.project_paths import CONFLUENCE_PAGES, CONFLUENCE_BLOGS, CONFLUENCE_USERS, CONFLUENCE_STATIC_CONTENT
 import json
 
 
 def confluence_datasets():
     data_sets = dict()
-    data_sets["pages"] = read_input_file(CONFLUENCE_PAGES)
-    data_sets["blogs"] = read_input_file(CONFLUENCE_BLOGS)
-    data_sets["users"] = read_input_file(CONFLUENCE_USERS)
+    data_sets["pages"] = shard_dataset(read_input_file(CONFLUENCE_PAGES), CONFLUENCE_SETTINGS.locust_workers)
+    data_sets["blogs"] = shard_dataset(read_input_file(CONFLUENCE_BLOGS), CONFLUENCE_SETTINGS.locust_workers)
+    data_sets["users"] = shard_dataset(read_input_file(CONFLUENCE_USERS), CONFLUENCE_SETTINGS.locust_workers)
     data_sets['static-content'] = read_input_file(CONFLUENCE_STATIC_CONTENT)
 
     return data_sets
@@ -0,0 +1,258 @@
+"""
+Capacity benchmark of the locust load generator. A mock server (locustio/mock_server.py) stands in for the
+application, a generated dataset points the actions to it, and the app locustfile is run headless with closed
+pacing and no think time at increasing numbers of users. Reported per level: measured actions per second, CPU
+time of the locust process per action and failed actions. The maximum actions per second sizes load injector
+machines, CPU per action is a regression gate for generator overhead.
+
+Usage from app dir: PYTHONPATH=. python locustio/generator_benchmark.py --app jira [--users 1,10,50] [--duration 30]
+                        [--http-client requests] [--max-cpu-ms-per-action 20]
+"""
+import argparse
+import csv
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from locustio.mock_server import JIRA, CONFLUENCE, JSM, BAMBOO, LOCALHOST, PROJECT_KEY, PROJECT_ID, \
+    ISSUE_ID_OFFSET, DEFAULT_PAGE_SIZE
+
+# Scenario: (mocked app, locustfile)
+SCENARIOS = {
+    'jira': (JIRA, 'locustio/jira/locustfile.py'),
+    'confluence': (CONFLUENCE, 'locustio/confluence/locustfile.py'),
+    'jsm_agents': (JSM, 'locustio/jsm/agents_locustfile.py'),
+    'jsm_customers': (JSM, 'locustio/jsm/customers_locustfile.py'),
+    'bamboo': (BAMBOO, 'locustio/bamboo/locustfile.py'),
+}
+DATASET_ROWS = 1000
+ACTIONS_PER_HOUR_PER_USER = 3600 * 1000  # Pacing interval of 1 ms, users run actions back to back
+ACTION_REQUEST_TYPE = 'Action'
+MAX_FAILED_ACTIONS = 5  # percent, above it the mock server does not serve the actions and results are not valid
+SERVER_START_TIMEOUT = 30  # seconds
+LOCUST_STOP_TIMEOUT = 60  # seconds
+GENERATOR_STATS_FILE = 'generator_stats.json'
+BOOTSTRAP_LOCUSTFILE = '''import locustio.generator_benchmark as generator_benchmark
+generator_benchmark.configure_generator({scenario!r}, {port}, {users}, {datasets_dir!r}, {http_client!r})
+{locustfile_import}
+'''
+
+
+def __write_csv(file_path: Path, rows):
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with file_path.open('w', newline='') as f:
+        csv.writer(f).writerows(rows)
+
+
+def write_datasets(datasets_dir: Path, rows: int = DATASET_ROWS):
+    """
+    Datasets of all apps matching the ids served by the mock server: issue BENCH-n has id ISSUE_ID_OFFSET + n.
+    """
+    users = [[f'bench_user_{i}', 'password'] for i in range(rows)]
+    issues = [[f'{PROJECT_KEY}-{i}', ISSUE_ID_OFFSET + i, PROJECT_KEY] for i in range(1, rows + 1)]
+    ids = [[i] for i in range(1, rows + 1)]
+
+    jira = datasets_dir / JIRA
+    __write_csv(jira / 'users.csv', users)
+    __write_csv(jira / 'issues.csv', issues)
+    __write_csv(jira / 'jqls.csv', [[f'project = {PROJECT_KEY} order by key'], ['text ~ "bench" order by key']])
+    __write_csv(jira / 'scrum-boards.csv', ids)
+    __write_csv(jira / 'kanban-boards.csv', ids)
+    __write_csv(jira / 'projects.csv', [[PROJECT_KEY, PROJECT_ID]])
+
+    confluence = datasets_dir / CONFLUENCE
+    attachment = confluence / 'static-content' / 'upload' / 'bench.txt'
+    attachment.parent.mkdir(parents=True, exist_ok=True)
+    attachment.write_text('benchmark attachment\n' * 1024)
+    __write_csv(confluence / 'users.csv', users)
+    __write_csv(confluence / 'pages.csv', [[65536 + i, PROJECT_KEY] for i in range(rows)])
+    __write_csv(confluence / 'blogs.csv', [[131072 + i, PROJECT_KEY] for i in range(rows)])
+    __write_csv(confluence / 'static-content' / 'files_upload.csv', [[attachment, 'text/plain', attachment.name]])
+
+    jsm = datasets_dir / JSM
+    service_desks = [[1, PROJECT_ID, PROJECT_KEY, rows, 1, 2, 3]]
+    __write_csv(jsm / 'agents.csv', users)
+    __write_csv(jsm / 'customers.csv', [user + [1, issue[1], issue[0]] for user, issue in zip(users, issues)])
+    __write_csv(jsm / 'requests.csv', [issue[:2] + [1, PROJECT_ID, PROJECT_KEY] for issue in issues])
+    for size in ('small', 'medium', 'large'):
+        __write_csv(jsm / f'service_desks_{size}.csv', service_desks)
+    __write_csv(jsm / 'request_types.csv', [[PROJECT_ID, 1, 1]])
+
+    bamboo = datasets_dir / BAMBOO
+    __write_csv(bamboo / 'users.csv', users)
+    __write_csv(bamboo / 'build_plans.csv', [[PROJECT_KEY, f'{PROJECT_KEY}-PLAN{i}'] for i in range(rows)])
+
+
+def configure_generator(scenario: str, port: int, users: int, datasets_dir: str, http_client: str):
+    """
+    Called by the bootstrap locustfile before the app locustfile is imported: points the app settings and datasets
+    to the mock server, removes pacing and records CPU time of the locust process during the test.
+    Settings and paths are imported here, in the locust process only, importing them creates a results dir.
+    """
+    from locust import events
+    import util.project_paths as project_paths
+    from util.conf import JIRA_SETTINGS, CONFLUENCE_SETTINGS, JSM_SETTINGS, BAMBOO_SETTINGS
+
+    app = SCENARIOS[scenario][0]
+    settings = {JIRA: JIRA_SETTINGS, CONFLUENCE: CONFLUENCE_SETTINGS, JSM: JSM_SETTINGS, BAMBOO: BAMBOO_SETTINGS}[app]
+    settings.protocol, settings.hostname, settings.port, settings.postfix = 'http', LOCALHOST, port, ''
+    settings.secure = False
+    settings.verbose = False
+    settings.load_pacing = 'closed'
+    settings.locust_http_client = http_client
+    settings.locust_workers = 1
+    if app == JSM:
+        settings.agents_concurrency = settings.customers_concurrency = users
+        settings.agents_total_actions_per_hr = settings.customers_total_actions_per_hr = \
+            users * ACTIONS_PER_HOUR_PER_USER
+    else:
+        settings.concurrency = users
+        settings.total_actions_per_hour = users * ACTIONS_PER_HOUR_PER_USER
+    if app == BAMBOO:
+        settings.default_dataset_plan_duration = 0
+
+    default_datasets_dir = project_paths.JIRA_DATASETS.parent
+    for name in dir(project_paths):
+        value = getattr(project_paths, name)
+        if isinstance(value, Path) and default_datasets_dir in value.parents:
+            setattr(project_paths, name, Path(datasets_dir) / value.relative_to(default_datasets_dir))
+
+    start = dict()
+
+    @events.test_start.add_listener
+    def on_test_start(**kwargs):
+        start.update(cpu=time.process_time(), wall=time.time())
+
+    @events.test_stop.add_listener
+    def on_test_stop(**kwargs):
+        stats = {'cpu': time.process_time() - start['cpu'], 'wall': time.time() - start['wall']}
+        (project_paths.ENV_TAURUS_ARTIFACT_DIR / GENERATOR_STATS_FILE).write_text(json.dumps(stats))
+
+
+def __free_port() -> int:
+    with socket.socket() as s:
+        s.bind((LOCALHOST, 0))
+        return s.getsockname()[1]
+
+
+def start_mock_server(app: str, port: int, page_size: int, processes: int) -> subprocess.Popen:
+    command = [sys.executable, str(Path(__file__).parent / 'mock_server.py'), '--app', app, '--port', str(port),
+               '--page-size', str(page_size), '--processes', str(processes)]
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    deadline = time.time() + SERVER_START_TIMEOUT
+    while time.time() < deadline:
+        try:
+            socket.create_connection((LOCALHOST, port), timeout=1).close()
+            return server
+        except OSError:
+            if server.poll() is not None:
+                break
+            time.sleep(0.1)
+    server.kill()
+    raise SystemExit(f'ERROR: Mock {app} server did not start on port {port}')
+
+
+def read_actions(stats_file: Path):
+    """
+    Number of measured actions and of failed ones from locust stats csv.
+    """
+    actions, failures = 0, 0
+    with stats_file.open() as f:
+        for row in csv.DictReader(f):
+            if row['Type'] == ACTION_REQUEST_TYPE:
+                actions += int(row['Request Count'])
+                failures += int(row['Failure Count'])
+    return actions, failures
+
+
+def run_level(scenario: str, port: int, users: int, duration: int, http_client: str, datasets_dir: Path,
+              output_dir: Path) -> dict:
+    level_dir = output_dir / f'{scenario}_{users}_users'
+    level_dir.mkdir(parents=True, exist_ok=True)
+    locustfile_module = SCENARIOS[scenario][1][:-len('.py')].replace('/', '.')
+    bootstrap = level_dir / 'locustfile.py'
+    bootstrap.write_text(BOOTSTRAP_LOCUSTFILE.format(scenario=scenario, port=port, users=users,
+                                                     datasets_dir=str(datasets_dir), http_client=http_client,
+                                                     locustfile_import=f'from {locustfile_module} import *'))
+    command = [sys.executable, '-m', 'locust', '-f', str(bootstrap), '--headless', '--only-summary',
+               '-u', str(users), '-r', str(users), '-t', f'{duration}s', '--stop-timeout', '5',
+               '--csv', str(level_dir / 'locust')]
+    env = dict(os.environ, TAURUS_ARTIFACTS_DIR=str(level_dir),
+               PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')])))
+    with (level_dir / 'locust.log').open('w') as output:
+        locust = subprocess.run(command, env=env, stdout=output, stderr=subprocess.STDOUT,
+                                timeout=duration + LOCUST_STOP_TIMEOUT)
+    stats_file = level_dir / GENERATOR_STATS_FILE
+    if not stats_file.exists():
+        raise SystemExit(f'ERROR: Locust run with {users} users exited with code {locust.returncode}, '
+                         f'see {level_dir / "locust.log"}')
+    stats = json.loads(stats_file.read_text())
+    actions, failures = read_actions(level_dir / 'locust_stats.csv')
+    return {'users': users, 'actions': actions, 'failures': failures,
+            'actions_per_sec': actions / stats['wall'],
+            'cpu_ms_per_action': stats['cpu'] * 1000 / actions if actions else 0,
+            'cpu_utilization': stats['cpu'] / stats['wall'] * 100,
+            'failed_percent': failures / actions * 100 if actions else 100}
+
+
+def print_results(scenario: str, http_client: str, results: list):
+    print(f'\nLoad generator capacity, {scenario} scenario, {http_client} http client')
+    print(f'{"Users":>8}{"Actions/s":>12}{"CPU ms/action":>16}{"Generator CPU %":>18}{"Failed %":>11}')
+    for result in results:
+        print(f'{result["users"]:>8}{result["actions_per_sec"]:>12.1f}{result["cpu_ms_per_action"]:>16.2f}'
+              f'{result["cpu_utilization"]:>18.0f}{result["failed_percent"]:>11.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--app', choices=SCENARIOS, required=True, help='locustfile scenario to run')
+    parser.add_argument('--users', default='1,5,10,25,50', help='comma separated numbers of users')
+    parser.add_argument('--duration', type=int, default=30, help='seconds of every level')
+    parser.add_argument('--http-client', choices=['requests', 'fast'], default='requests')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='bytes of mocked html pages')
+    parser.add_argument('--server-processes', type=int, default=max((os.cpu_count() or 1) // 2, 1),
+                        help='mock server processes, the server should not be the bottleneck')
+    parser.add_argument('--output-dir', type=Path, default=None, help='locust logs and results, temp dir by default')
+    parser.add_argument('--max-cpu-ms-per-action', type=float, default=None,
+                        help='fail if CPU per action at the maximum throughput is higher')
+    args = parser.parse_args()
+
+    app = SCENARIOS[args.app][0]
+    output_dir = args.output_dir or Path(tempfile.mkdtemp(prefix='generator_benchmark_'))
+    datasets_dir = output_dir / 'datasets'
+    write_datasets(datasets_dir)
+    port = __free_port()
+    server = start_mock_server(app, port, args.page_size, args.server_processes)
+
+    results = []
+    try:
+        for users in [int(users) for users in args.users.split(',')]:
+            print(f'Running {args.app} locustfile with {users} users for {args.duration} seconds')
+            results.append(run_level(args.app, port, users, args.duration, args.http_client, datasets_dir,
+                                     output_dir))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print_results(args.app, args.http_client, results)
+    (output_dir / 'generator_benchmark.json').write_text(json.dumps(results, indent=2))
+    best = max(results, key=lambda result: result['actions_per_sec'])
+    print(f'\nMaximum: {best["actions_per_sec"]:.1f} actions/s with {best["users"]} users, '
+          f'{best["cpu_ms_per_action"]:.2f} CPU ms per action. Results: {output_dir}')
+
+    failed = [result['users'] for result in results if result['failed_percent'] > MAX_FAILED_ACTIONS]
+    if failed:
+        raise SystemExit(f'ERROR: More than {MAX_FAILED_ACTIONS}% of actions failed with {failed} users, mock server '
+                         f'does not serve the locustfile. See locust logs in {output_dir}')
+    if args.max_cpu_ms_per_action is not None and best['cpu_ms_per_action'] > args.max_cpu_ms_per_action:
+        raise SystemExit(f'ERROR: Load generator uses {best["cpu_ms_per_action"]:.2f} CPU ms per action, '
+                         f'the limit is {args.max_cpu_ms_per_action}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Load generator self-monitoring. Every locust process samples its CPU usage, gevent event loop lag and greenlet
+scheduling delay all through the test and appends them to its own csv time series in the artifacts dir. A saturated
+generator sends requests and reads responses late, so measured response times describe the generator, not the
+application: post run analytics flags such runs.
+"""
+import csv
+import os
+import time
+
+import gevent
+from locust import events
+
+from locustio.local_workers import worker_index, scenario_name
+from util.project_paths import ENV_TAURUS_ARTIFACT_DIR
+
+GENERATOR_STATS_FILE = 'locust_generator_{}_{}.csv'  # formatted with the scenario name and locust process index
+GENERATOR_STATS_HEADER = ['timestamp', 'users', 'cpu_percent', 'loop_lag_ms', 'scheduling_delay_ms']
+SAMPLE_INTERVAL = 5  # seconds
+
+__registered = False
+
+
+def __scheduling_delay() -> float:
+    # Spawned greenlet runs after all greenlets that are ready to run, like a user woken by a response
+    scheduled = time.perf_counter()
+    return gevent.spawn(time.perf_counter).get() - scheduled
+
+
+def __sample(environment, writer, stats_file):
+    cpu_time, wall_time = time.process_time(), time.perf_counter()
+    while True:
+        wake_up = time.perf_counter() + SAMPLE_INTERVAL
+        gevent.sleep(SAMPLE_INTERVAL)
+        loop_lag = time.perf_counter() - wake_up
+        scheduling_delay = __scheduling_delay()
+
+        now_cpu_time, now_wall_time = time.process_time(), time.perf_counter()
+        cpu_percent = (now_cpu_time - cpu_time) / (now_wall_time - wall_time) * 100
+        cpu_time, wall_time = now_cpu_time, now_wall_time
+        writer.writerow([int(time.time()), environment.runner.user_count if environment.runner else 0,
+                         round(cpu_percent, 1), round(loop_lag * 1000, 1), round(scheduling_delay * 1000, 1)])
+        stats_file.flush()
+
+
+def register_generator_monitor() -> None:
+    """
+    Samples the current locust process from test start to test stop.
+    """
+    global __registered
+    if __registered:
+        return
+    __registered = True
+
+    sampler = {}
+
+    @events.test_start.add_listener
+    def start_sampling(environment, **kwargs):
+        options = environment.parsed_options
+        # Locust used as a library has no locustfile, process id keeps the file name unique
+        scenario = scenario_name(options.locustfile) if options and options.locustfile else os.getpid()
+        stats_file = open(ENV_TAURUS_ARTIFACT_DIR / GENERATOR_STATS_FILE.format(scenario, worker_index()), 'w',
+                          newline='')
+        writer = csv.writer(stats_file)
+        writer.writerow(GENERATOR_STATS_HEADER)
+        sampler['file'] = stats_file
+        sampler['greenlet'] = gevent.spawn(__sample, environment, writer, stats_file)
+
+    @events.test_stop.add_listener
+    def stop_sampling(**kwargs):
+        if sampler:
+            sampler.pop('greenlet').kill()
+            sampler.pop('file').close()
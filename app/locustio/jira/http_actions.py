@@ -1,12 +1,11 @@
 import random
-import re
+from functools import partial
 from locustio.jira.requests_params import Login, BrowseIssue, CreateIssue, SearchJql, ViewBoard, BrowseBoards, \
     BrowseProjects, AddComment, ViewDashboard, EditIssue, ViewProjectSummary, jira_datasets
-from locustio.common_utils import jira_measure, fetch_by_re, timestamp_int, generate_random_string, TEXT_HEADERS, \
-    ADMIN_HEADERS, NO_TOKEN_HEADERS, RESOURCE_HEADERS, init_logger, raise_if_login_failed
+from locustio.common_utils import jira_measure, fetch_by_re, fetch_all_by_re, timestamp_int, generate_random_string, \
+    TEXT_HEADERS, ADMIN_HEADERS, NO_TOKEN_HEADERS, RESOURCE_HEADERS, init_logger, raise_if_login_failed
 
 from util.conf import JIRA_SETTINGS
-import uuid
 
 logger = init_logger(app_type='jira')
 jira_dataset = jira_datasets()
@@ -14,9 +13,7 @@ jira_dataset = jira_datasets()
 
 @jira_measure('locust_login_and_view_dashboard')
 def login_and_view_dashboard(locust):
-    session_id = str(uuid.uuid4())
-    locust.cross_action_storage[session_id] = dict()
-    locust.session_data_storage = locust.cross_action_storage[session_id]
+    locust.start_session()
     locust.session_data_storage['app'] = 'jira'
 
     params = Login()
@@ -34,56 +31,52 @@ def login_and_view_dashboard(locust):
     r = locust.get('/', catch_response=True)
     if not r.content:
         raise Exception('Please check server hostname in jira.yml file')
-    content = r.content.decode('utf-8')
+    content = r.content
 
-    # 110 /rest/webResources/1.0/resources
-    locust.post('/rest/webResources/1.0/resources',
+    # Dashboard resources and gadgets, loaded by browser concurrently
+    locust.run_requests(
+        # 110 /rest/webResources/1.0/resources
+        partial(locust.post, '/rest/webResources/1.0/resources',
                 json=params.resources_body.get("110"),
                 headers=RESOURCE_HEADERS,
-                catch_response=True)
-
-    # 115 /rest/webResources/1.0/resources
-    locust.post('/rest/webResources/1.0/resources',
+                catch_response=True),
+        # 115 /rest/webResources/1.0/resources
+        partial(locust.post, '/rest/webResources/1.0/resources',
                 json=params.resources_body.get("115"),
                 headers=RESOURCE_HEADERS,
-                catch_response=True)
-
-    # 120 /rest/analytics/1.0/publish/bulk
-    locust.post('/rest/analytics/1.0/publish/bulk',
+                catch_response=True),
+        # 120 /rest/analytics/1.0/publish/bulk
+        partial(locust.post, '/rest/analytics/1.0/publish/bulk',
                 json=params.resources_body.get("120"),
                 headers=RESOURCE_HEADERS,
-                catch_response=True)
-
-    # 125 /rest/analytics/1.0/publish/bulk
-    locust.post('/rest/analytics/1.0/publish/bulk',
+                catch_response=True),
+        # 125 /rest/analytics/1.0/publish/bulk
+        partial(locust.post, '/rest/analytics/1.0/publish/bulk',
                 json=params.resources_body.get("125"),
                 headers=RESOURCE_HEADERS,
-                catch_response=True)
-
-    # 130 /plugins/servlet/gadgets/dashboard-diagnostics
-    locust.post("/plugins/servlet/gadgets/dashboard-diagnostics",
+                catch_response=True),
+        # 130 /plugins/servlet/gadgets/dashboard-diagnostics
+        partial(locust.post, "/plugins/servlet/gadgets/dashboard-diagnostics",
                 {"uri": f"{locust.client.base_url.lower()}/secure/Dashboard.jspa"},
                 TEXT_HEADERS,
-                catch_response=True)
-
-    # 135 /rest/activity-stream/1.0/preferences
-    locust.get(f'/rest/activity-stream/1.0/preferences?_={timestamp_int()}', catch_response=True)
-
-    # 140 /rest/gadget/1.0/issueTable/jql
-    locust.get(f'/rest/gadget/1.0/issueTable/jql?num=10&tableContext=jira.table.cols.dashboard'
-               f'&addDefault=true&enableSorting=true&paging=true&showActions=true'
-               f'&jql=assignee+%3D+currentUser()+AND'
-               f'+resolution+%3D+unresolved+ORDER+BY+priority+DESC%2C+created+ASC'
-               f'&sortBy=&startIndex=0&_={timestamp_int()}', catch_response=True)
-
-    # 145 /plugins/servlet/streams
-    locust.get(f'/plugins/servlet/streams?maxResults=5&relativeLinks=true&_={timestamp_int()}', catch_response=True)
+                catch_response=True),
+        # 135 /rest/activity-stream/1.0/preferences
+        partial(locust.get, f'/rest/activity-stream/1.0/preferences?_={timestamp_int()}', catch_response=True),
+        # 140 /rest/gadget/1.0/issueTable/jql
+        partial(locust.get, f'/rest/gadget/1.0/issueTable/jql?num=10&tableContext=jira.table.cols.dashboard'
+                            f'&addDefault=true&enableSorting=true&paging=true&showActions=true'
+                            f'&jql=assignee+%3D+currentUser()+AND'
+                            f'+resolution+%3D+unresolved+ORDER+BY+priority+DESC%2C+created+ASC'
+                            f'&sortBy=&startIndex=0&_={timestamp_int()}', catch_response=True),
+        # 145 /plugins/servlet/streams
+        partial(locust.get, f'/plugins/servlet/streams?maxResults=5&relativeLinks=true&_={timestamp_int()}',
+                catch_response=True))
 
     # Assertions
     token = fetch_by_re(params.atl_token_pattern, content)
-    if not (f'title="loggedInUser" value="{user[0]}">' in content):
-        logger.error(f'User {user[0]} authentication failed: {content}')
-    assert f'title="loggedInUser" value="{user[0]}">' in content, 'User authentication failed'
+    if not (f'title="loggedInUser" value="{user[0]}">'.encode('utf-8') in content):
+        logger.error(f'User {user[0]} authentication failed: {content.decode("utf-8")}')
+    assert f'title="loggedInUser" value="{user[0]}">'.encode('utf-8') in content, 'User authentication failed'
 
     locust.session_data_storage['username'] = user[0]
     locust.session_data_storage['password'] = user[1]
@@ -101,48 +94,45 @@ def view_issue(locust):
     # 400 /browse
     r = locust.get(f'/browse/{issue_key}', catch_response=True)
 
-    content = r.content.decode('utf-8')
+    content = r.content
     issue_id = fetch_by_re(params.issue_id_pattern, content)
     project_avatar_id = fetch_by_re(params.project_avatar_id_pattern, content)
     edit_allowed = fetch_by_re(params.edit_allow_pattern, content, group_no=0)
 
-    # 405 /rest/webResources/1.0/resources
-    locust.post('/rest/webResources/1.0/resources',
+    # Issue resources, loaded by browser concurrently
+    locust.run_requests(
+        # 405 /rest/webResources/1.0/resources
+        partial(locust.post, '/rest/webResources/1.0/resources',
                 json=params.resources_body.get("405"),
                 headers=RESOURCE_HEADERS,
-                catch_response=True)
-
-    # 410 /rest/webResources/1.0/resources
-    locust.post('/rest/webResources/1.0/resources',
+                catch_response=True),
+        # 410 /rest/webResources/1.0/resources
+        partial(locust.post, '/rest/webResources/1.0/resources',
                 json=params.resources_body.get("410"),
                 headers=RESOURCE_HEADERS,
-                catch_response=True)
-
-    # 415 /rest/analytics/1.0/publish/bulk
-    locust.post('/rest/analytics/1.0/publish/bulk',
+                catch_response=True),
+        # 415 /rest/analytics/1.0/publish/bulk
+        partial(locust.post, '/rest/analytics/1.0/publish/bulk',
                 json=params.resources_body.get("415"),
                 headers=RESOURCE_HEADERS,
-                catch_response=True)
-
-    # 420 /rest/webResources/1.0/resources
-    locust.post('/rest/webResources/1.0/resources',
+                catch_response=True),
+        # 420 /rest/webResources/1.0/resources
+        partial(locust.post, '/rest/webResources/1.0/resources',
                 json=params.resources_body.get("420"),
                 headers=RESOURCE_HEADERS,
-                catch_response=True)
-
-    # 425 /rest/analytics/1.0/publish/bulk
-    locust.post('/rest/analytics/1.0/publish/bulk',
+                catch_response=True),
+        # 425 /rest/analytics/1.0/publish/bulk
+        partial(locust.post, '/rest/analytics/1.0/publish/bulk',
                 json=params.resources_body.get("425"),
                 headers=RESOURCE_HEADERS,
-                catch_response=True)
-
-    # 430 /secure/projectavatar
-    locust.get(f'/secure/projectavatar?avatarId={project_avatar_id}', catch_response=True)
+                catch_response=True),
+        # 430 /secure/projectavatar
+        partial(locust.get, f'/secure/projectavatar?avatarId={project_avatar_id}', catch_response=True))
 
     # Assertions
-    if not (f'<meta name="ajs-issue-key" content="{issue_key}">' in content):
-        logger.error(f'Issue {issue_key} not found: {content}')
-    assert f'<meta name="ajs-issue-key" content="{issue_key}">' in content, 'Issue not found'
+    if not (f'<meta name="ajs-issue-key" content="{issue_key}">'.encode('utf-8') in content):
+        logger.error(f'Issue {issue_key} not found: {content.decode("utf-8")}')
+    assert f'<meta name="ajs-issue-key" content="{issue_key}">'.encode('utf-8') in content, 'Issue not found'
     logger.locust_info(f"{params.action_name}: Issue {issue_key} is opened successfully")
     logger.locust_info(f'{params.action_name}: Issue key - {issue_key}, issue_id - {issue_id}')
 
@@ -171,13 +161,13 @@ def create_issue(locust):
                         json={'atl_token': locust.session_data_storage["token"]},
                         headers=ADMIN_HEADERS, catch_response=True)
 
-        content = r.content.decode('utf-8')
+        content = r.content
         atl_token = fetch_by_re(params.atl_token_pattern, content)
         form_token = fetch_by_re(params.form_token_pattern, content)
         issue_type = fetch_by_re(params.issue_type_pattern, content)
         resolution_done = fetch_by_re(params.resolution_done_pattern, content)
-        fields_to_retain = re.findall(params.fields_to_retain_pattern, content)
-        custom_fields_to_retain = re.findall(params.custom_fields_to_retain_pattern, content)
+        fields_to_retain = fetch_all_by_re(params.fields_to_retain_pattern, content)
+        custom_fields_to_retain = fetch_all_by_re(params.custom_fields_to_retain_pattern, content)
 
         issue_body_params_dict = {'atl_token': atl_token,
                                   'form_token': form_token,
@@ -188,9 +178,9 @@ def create_issue(locust):
                                   'custom_fields_to_retain': custom_fields_to_retain
                                   }
 
-        if not ('"id":"project","label":"Project"' in content):
-            logger.error(f'{params.err_message_create_issue}: {content}')
-        assert '"id":"project","label":"Project"' in content, params.err_message_create_issue
+        if not (b'"id":"project","label":"Project"' in content):
+            logger.error(f'{params.err_message_create_issue}: {content.decode("utf-8")}')
+        assert b'"id":"project","label":"Project"' in content, params.err_message_create_issue
 
         # 205 /rest/quickedit/1.0/userpreferences/create
         locust.post('/rest/quickedit/1.0/userpreferences/create',
@@ -226,10 +216,10 @@ def create_issue(locust):
                     headers=RESOURCE_HEADERS,
                     catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if '"id":"project","label":"Project"' not in content:
-            logger.error(f'{params.err_message_create_issue}: {content}')
-        assert '"id":"project","label":"Project"' in content, params.err_message_create_issue
+        content = r.content
+        if b'"id":"project","label":"Project"' not in content:
+            logger.error(f'{params.err_message_create_issue}: {content.decode("utf-8")}')
+        assert b'"id":"project","label":"Project"' in content, params.err_message_create_issue
         issue_key = fetch_by_re(params.create_issue_key_pattern, content)
         logger.locust_info(f"{params.action_name}: Issue {issue_key} was successfully created")
 
@@ -291,8 +281,8 @@ def search_jql(locust):
                     headers=NO_TOKEN_HEADERS,
                     catch_response=True)
 
-    content = r.content.decode('utf-8')
-    issue_ids = re.findall(params.ids_pattern, content)
+    content = r.content
+    issue_ids = fetch_all_by_re(params.ids_pattern, content)
 
     if issue_ids:
         body = params.prepare_jql_body(issue_ids)
@@ -303,7 +293,7 @@ def search_jql(locust):
                         headers=NO_TOKEN_HEADERS,
                         catch_response=True)
 
-        content = r.content.decode('utf-8')
+        content = r.content
         issue_key = fetch_by_re(params.issue_key_pattern, content)
         issue_id = fetch_by_re(params.issue_id_pattern, content)
 
@@ -332,7 +322,7 @@ def search_jql(locust):
                         catch_response=True)
 
         # 365 /secure/AjaxIssueEditAction!default.jspa
-        if params.edit_allow_string in r.content.decode('utf-8'):
+        if params.edit_allow_string.encode('utf-8') in r.content:
             locust.get(f'/secure/AjaxIssueEditAction!default.jspa?'
                        f'decorator=none&issueId={issue_id}&_={timestamp_int()}', catch_response=True)
 
@@ -347,10 +337,10 @@ def view_project_summary(locust):
     # 500 /projects/<project_key>/summary
     r = locust.get(f'/projects/{project_key}/summary', catch_response=True)
 
-    content = r.content.decode('utf-8')
-    logger.locust_info(f"{params.action_name}. View project {project_key}: {content}")
+    content = r.content
+    logger.locust_info(f"{params.action_name}. View project {project_key}: {content.decode('utf-8')}")
 
-    assert_string = f'["project-key"]="\\"{project_key}\\"'
+    assert_string = f'["project-key"]="\\"{project_key}\\"'.encode('utf-8')
     if not (assert_string in content):
         logger.error(f'{params.err_message} {project_key}')
     assert assert_string in content, params.err_message
@@ -408,16 +398,16 @@ def edit_issue(locust):
         # 700 /secure/EditIssue!default.jspa
         r = locust.get(f'/secure/EditIssue!default.jspa?id={issue_id}', catch_response=True)
 
-        content = r.content.decode('utf-8')
+        content = r.content
         issue_type = fetch_by_re(params.issue_type_pattern, content)
         atl_token = fetch_by_re(params.atl_token_pattern, content)
         priority = fetch_by_re(params.issue_priority_pattern, content, group_no=2)
         assignee = fetch_by_re(params.issue_assigneee_reporter_pattern, content, group_no=2)
         reporter = fetch_by_re(params.issue_reporter_pattern, content)
 
-        if not (f' Edit Issue:  [{issue_key}]' in content):
-            logger.error(f'{params.err_message_issue_not_found} - {issue_id}, {issue_key}: {content}')
-        assert f' Edit Issue:  [{issue_key}]' in content, \
+        if not (f' Edit Issue:  [{issue_key}]'.encode('utf-8') in content):
+            logger.error(f'{params.err_message_issue_not_found} - {issue_id}, {issue_key}: {content.decode("utf-8")}')
+        assert f' Edit Issue:  [{issue_key}]'.encode('utf-8') in content, \
             params.err_message_issue_not_found
         logger.locust_info(f"{params.action_name}: Editing issue {issue_key}")
 
@@ -469,10 +459,10 @@ def edit_issue(locust):
                         headers=TEXT_HEADERS,
                         catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if not (f'[{issue_key}]' in content):
-            logger.error(f'Could not save edited page: {content}')
-        assert f'[{issue_key}]' in content, 'Could not save edited page'
+        content = r.content
+        if not (f'[{issue_key}]'.encode('utf-8') in content):
+            logger.error(f'Could not save edited page: {content.decode("utf-8")}')
+        assert f'[{issue_key}]'.encode('utf-8') in content, 'Could not save edited page'
 
         # 735 /rest/webResources/1.0/resources
         locust.post('/rest/webResources/1.0/resources',
@@ -527,10 +517,10 @@ def view_dashboard(locust):
     # 600 /secure/Dashboard.jspa
     r = locust.get('/secure/Dashboard.jspa', catch_response=True)
 
-    content = r.content.decode('utf-8')
-    if not (f'title="loggedInUser" value="{locust.session_data_storage["username"]}">' in content):
-        logger.error(f'User {locust.session_data_storage["username"]} authentication failed: {content}')
-    assert f'title="loggedInUser" value="{locust.session_data_storage["username"]}">' in content, \
+    content = r.content
+    if not (f'title="loggedInUser" value="{locust.session_data_storage["username"]}">'.encode('utf-8') in content):
+        logger.error(f'User {locust.session_data_storage["username"]} authentication failed: {content.decode("utf-8")}')
+    assert f'title="loggedInUser" value="{locust.session_data_storage["username"]}">'.encode('utf-8') in content, \
         'User authentication failed'
 
     # 605 /rest/webResources/1.0/resources
@@ -558,10 +548,10 @@ def view_dashboard(locust):
                     headers=TEXT_HEADERS,
                     catch_response=True)
 
-    content = r.content.decode('utf-8')
-    if not ('Dashboard Diagnostics: OK' in content):
-        logger.error(f'view_dashboard dashboard-diagnostics failed: {content}')
-    assert 'Dashboard Diagnostics: OK' in content, 'view_dashboard dashboard-diagnostics failed'
+    content = r.content
+    if not (b'Dashboard Diagnostics: OK' in content):
+        logger.error(f'view_dashboard dashboard-diagnostics failed: {content.decode("utf-8")}')
+    assert b'Dashboard Diagnostics: OK' in content, 'view_dashboard dashboard-diagnostics failed'
 
     # 625 /rest/webResources/1.0/resources
     locust.post('/rest/webResources/1.0/resources',
@@ -596,12 +586,12 @@ def add_comment(locust):
         # 800 /secure/AddComment!default.jspa
         r = locust.get(f'/secure/AddComment!default.jspa?id={issue_id}', catch_response=True)
 
-        content = r.content.decode('utf-8')
+        content = r.content
         token = fetch_by_re(params.atl_token_pattern, content)
         form_token = fetch_by_re(params.form_token_pattern, content)
-        if not (f'Add Comment: {issue_key}' in content):
-            logger.error(f'Could not open comment in the {issue_key} issue: {content}')
-        assert f'Add Comment: {issue_key}' in content, 'Could not open comment in the issue'
+        if not (f'Add Comment: {issue_key}'.encode('utf-8') in content):
+            logger.error(f'Could not open comment in the {issue_key} issue: {content.decode("utf-8")}')
+        assert f'Add Comment: {issue_key}'.encode('utf-8') in content, 'Could not open comment in the issue'
 
         # 805 /rest/webResources/1.0/resources
         locust.post('/rest/webResources/1.0/resources',
@@ -654,10 +644,10 @@ def add_comment(locust):
                         headers=TEXT_HEADERS,
                         catch_response=True)
 
-        content = r.content.decode('utf-8')
-        if not (f'<meta name="ajs-issue-key" content="{issue_key}">' in content):
-            logger.error(f'Could not save comment: {content}')
-        assert f'<meta name="ajs-issue-key" content="{issue_key}">' in content, 'Could not save comment'
+        content = r.content
+        if not (f'<meta name="ajs-issue-key" content="{issue_key}">'.encode('utf-8') in content):
+            logger.error(f'Could not save comment: {content.decode("utf-8")}')
+        assert f'<meta name="ajs-issue-key" content="{issue_key}">'.encode('utf-8') in content, 'Could not save comment'
 
         # 860 /rest/webResources/1.0/resources
         locust.post('/rest/webResources/1.0/resources',
@@ -705,10 +695,10 @@ def browse_projects(locust):
     r = locust.get(f'/secure/BrowseProjects.jspa?selectedCategory=all&selectedProjectType=all&page={page}',
                    catch_response=True)
 
-    content = r.content.decode('utf-8')
-    if not ('WRM._unparsedData["com.atlassian.jira.project.browse:projects"]="' in content):
-        logger.error(f'Could not browse projects: {content}')
-    assert 'WRM._unparsedData["com.atlassian.jira.project.browse:projects"]="' in content, 'Could not browse projects'
+    content = r.content
+    if not (b'WRM._unparsedData["com.atlassian.jira.project.browse:projects"]="' in content):
+        logger.error(f'Could not browse projects: {content.decode("utf-8")}')
+    assert b'WRM._unparsedData["com.atlassian.jira.project.browse:projects"]="' in content, 'Could not browse projects'
 
     # 905 /rest/webResources/1.0/resources
     locust.post('/rest/webResources/1.0/resources',
@@ -787,7 +777,7 @@ def kanban_board(locust, board_id):
     # 1000 /secure/RapidBoard.jspa
     r = locust.get(url, catch_response=True)
 
-    content = r.content.decode('utf-8')
+    content = r.content
     project_key = fetch_by_re(params.project_key_pattern, content)
     project_id = fetch_by_re(params.project_id_pattern, content)
     project_plan = fetch_by_re(params.project_plan_pattern, content, group_no=2)
@@ -867,7 +857,7 @@ def scrum_board(locust, board_id):
     # 1100 /secure/RapidBoard.jspa
     r = locust.get(f'/secure/RapidBoard.jspa?rapidView={board_id}', catch_response=True)
 
-    content = r.content.decode('utf-8')
+    content = r.content
     project_key = fetch_by_re(params.project_key_pattern, content)
     project_id = fetch_by_re(params.project_id_pattern, content)
     project_plan = fetch_by_re(params.project_plan_pattern, content, group_no=2)
@@ -960,7 +950,7 @@ def backlog_board(locust, board_id):
                    f'&view=planning',
                    catch_response=True)
 
-    content = r.content.decode('utf-8')
+    content = r.content
     project_key = fetch_by_re(params.project_key_pattern, content)
     project_id = fetch_by_re(params.project_id_pattern, content)
     project_plan = fetch_by_re(params.project_plan_pattern, content, group_no=2)
@@ -1,4 +1,4 @@
-from locust import HttpUser, task, between
+from locust import task, between
 from locustio.jira.http_actions import login_and_view_dashboard, create_issue, search_jql, view_issue, \
     view_project_summary, view_dashboard, edit_issue, add_comment, browse_boards, view_kanban_board, view_scrum_board, \
     view_backlog, browse_projects
@@ -10,6 +10,7 @@ config = LocustConfig(config_yml=JIRA_SETTINGS)
 
 
 class JiraBehavior(MyBaseTaskSet):
+    concurrent_requests = config.concurrent_requests
 
     def on_start(self):
         self.client.verify = config.secure
@@ -68,7 +69,8 @@ class JiraBehavior(MyBaseTaskSet):
         app_specific_action(self)
 
 
-class JiraUser(HttpUser):
+class JiraUser(config.http_user):
     host = JIRA_SETTINGS.server_url
+    insecure = not config.secure  # FastHttpUser only, HttpUser client is configured with client.verify
     tasks = [JiraBehavior]
     wait_time = between(0, 0)
@@ -1,4 +1,5 @@
-from locustio.common_utils import generate_random_string, read_input_file, BaseResource
+from locustio.common_utils import generate_random_string, read_input_file, shard_dataset, BaseResource
+from util.conf import JIRA_SETTINGS
 from util.project_paths import JIRA_DATASET_ISSUES, JIRA_DATASET_JQLS, JIRA_DATASET_KANBAN_BOARDS, \
     JIRA_DATASET_PROJECTS, JIRA_DATASET_SCRUM_BOARDS, JIRA_DATASET_USERS
 import json
@@ -6,8 +7,8 @@ import json
 
 def jira_datasets():
     data_sets = dict()
-    data_sets["issues"] = read_input_file(JIRA_DATASET_ISSUES)
-    data_sets["users"] = read_input_file(JIRA_DATASET_USERS)
+    data_sets["issues"] = shard_dataset(read_input_file(JIRA_DATASET_ISSUES), JIRA_SETTINGS.locust_workers)
+    data_sets["users"] = shard_dataset(read_input_file(JIRA_DATASET_USERS), JIRA_SETTINGS.locust_workers)
     data_sets["jqls"] = read_input_file(JIRA_DATASET_JQLS)
     data_sets["scrum_boards"] = read_input_file(JIRA_DATASET_SCRUM_BOARDS)
     data_sets["kanban_boards"] = read_input_file(JIRA_DATASET_KANBAN_BOARDS)
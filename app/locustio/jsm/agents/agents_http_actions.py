@@ -1,4 +1,3 @@
-import uuid
 import random
 import json
 from locustio.common_utils import init_logger, jsm_agent_measure, TEXT_HEADERS, RESOURCE_HEADERS, timestamp_int, \
@@ -11,9 +10,7 @@ logger = init_logger(app_type='jsm')
 
 @jsm_agent_measure('locust_agent_login_and_view_dashboard')
 def agent_login_and_view_dashboard(locust, jsm_agent_dataset):
-    session_id = str(uuid.uuid4())
-    locust.cross_action_storage[session_id] = dict()
-    locust.session_data_storage = locust.cross_action_storage[session_id]
+    locust.start_session()
     locust.session_data_storage['app'] = 'jsm'
     locust.session_data_storage['app_type'] = 'agent'
 
@@ -55,7 +52,7 @@ def agent_login_and_view_dashboard(locust, jsm_agent_dataset):
     r = locust.get('/', catch_response=True)
     if not r.content:
         raise Exception('Please check server hostname in jsm.yml file')
-    content = r.content.decode('utf-8')
+    content = r.content
     locust.post('/rest/webResources/1.0/resources', json=params.resources_body.get("110"),
                 headers=RESOURCE_HEADERS, catch_response=True)
     locust.post("/plugins/servlet/gadgets/dashboard-diagnostics",
@@ -78,9 +75,9 @@ def agent_login_and_view_dashboard(locust, jsm_agent_dataset):
                catch_response=True)
     # Assertions
     token = fetch_by_re(params.atl_token_pattern, content)
-    if not (f'title="loggedInUser" value="{user[0]}">' in content):
-        logger.error(f'User {user[0]} authentication failed: {content}')
-    assert f'title="loggedInUser" value="{user[0]}">' in content, 'User authentication failed'
+    if not (f'title="loggedInUser" value="{user[0]}">'.encode('utf-8') in content):
+        logger.error(f'User {user[0]} authentication failed: {content.decode("utf-8")}')
+    assert f'title="loggedInUser" value="{user[0]}">'.encode('utf-8') in content, 'User authentication failed'
 
     locust.session_data_storage['username'] = user[0]
     locust.session_data_storage['password'] = user[1]
@@ -1,14 +1,15 @@
 import json
 
-from locustio.common_utils import read_input_file, BaseResource
+from locustio.common_utils import read_input_file, shard_dataset, BaseResource
+from util.conf import JSM_SETTINGS
 from util.project_paths import JSM_DATASET_AGENTS, JSM_DATASET_REQUESTS, JSM_DATASET_SERVICE_DESKS_L, \
     JSM_DATASET_SERVICE_DESKS_M, JSM_DATASET_SERVICE_DESKS_S
 
 
 def jsm_agent_datasets():
     data_sets = dict()
-    data_sets['agents'] = read_input_file(JSM_DATASET_AGENTS)
-    data_sets['requests'] = read_input_file(JSM_DATASET_REQUESTS)
+    data_sets['agents'] = shard_dataset(read_input_file(JSM_DATASET_AGENTS), JSM_SETTINGS.locust_workers)
+    data_sets['requests'] = shard_dataset(read_input_file(JSM_DATASET_REQUESTS), JSM_SETTINGS.locust_workers)
     data_sets['s_project'] = read_input_file(JSM_DATASET_SERVICE_DESKS_S)
     data_sets['m_project'] = read_input_file(JSM_DATASET_SERVICE_DESKS_M)
     data_sets['l_project'] = read_input_file(JSM_DATASET_SERVICE_DESKS_L)
@@ -1,4 +1,4 @@
-from locust import HttpUser, task, between
+from locust import task, between
 from locustio.jsm.agents import agents_http_actions
 from locustio.common_utils import LocustConfig, MyBaseTaskSet
 from locustio.jsm.agents.agents_requests_params import jsm_agent_datasets
@@ -65,7 +65,8 @@ class JsmAgentBehavior(MyBaseTaskSet):
         app_specific_action(self)
 
 
-class JsmAgent(HttpUser):
+class JsmAgent(config.http_user):
     host = JSM_SETTINGS.server_url
+    insecure = not config.secure  # FastHttpUser only, HttpUser client is configured with client.verify
     tasks = [JsmAgentBehavior]
     wait_time = between(0, 0)
@@ -1,5 +1,4 @@
 import json
-import uuid
 
 import random
 
@@ -14,9 +13,7 @@ jsm_customer_dataset = jsm_customer_datasets()
 
 @jsm_customer_measure('locust_customer_login_and_view_portals')
 def customer_login_and_view_portals(locust):
-    session_id = str(uuid.uuid4())
-    locust.cross_action_storage[session_id] = dict()
-    locust.session_data_storage = locust.cross_action_storage[session_id]
+    locust.start_session()
     locust.session_data_storage['app'] = 'jsm'
     locust.session_data_storage['app_type'] = 'customer'
 
@@ -55,7 +52,7 @@ def customer_login_and_view_portals(locust):
                 headers=RESOURCE_HEADERS, catch_response=True)
     locust.post('/rest/analytics/1.0/publish/bulk', json=params.resources_body.get("120"),
                 headers=RESOURCE_HEADERS, catch_response=True)
-    assert '"loginSucceeded":true' in r.content.decode('utf-8'), 'Customer login is failed'
+    assert b'"loginSucceeded":true' in r.content, 'Customer login is failed'
 
 
 @jsm_customer_measure('locust_customer_view_portal')
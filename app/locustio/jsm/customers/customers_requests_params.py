@@ -1,11 +1,12 @@
-from locustio.common_utils import read_input_file, BaseResource
+from locustio.common_utils import read_input_file, shard_dataset, BaseResource
+from util.conf import JSM_SETTINGS
 import json
 from util.project_paths import JSM_DATASET_CUSTOMERS, JSM_DATASET_REQUEST_TYPES, JSM_DATASET_SERVICE_DESKS_S
 
 
 def jsm_customer_datasets():
     data_sets = dict()
-    data_sets['customers'] = read_input_file(JSM_DATASET_CUSTOMERS)
+    data_sets['customers'] = shard_dataset(read_input_file(JSM_DATASET_CUSTOMERS), JSM_SETTINGS.locust_workers)
     data_sets['s_portal'] = read_input_file(JSM_DATASET_SERVICE_DESKS_S)
     data_sets['request_types'] = read_input_file(JSM_DATASET_REQUEST_TYPES)
 
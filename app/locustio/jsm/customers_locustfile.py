@@ -1,4 +1,4 @@
-from locust import HttpUser, task, between
+from locust import task, between
 from locustio.jsm.customers import customers_http_actions
 from locustio.common_utils import LocustConfig, MyBaseTaskSet
 from extension.jsm.extension_locust_customers import app_specific_action
@@ -46,7 +46,8 @@ class JsmCustomerBehavior(MyBaseTaskSet):
         app_specific_action(self)
 
 
-class JsmCustomer(HttpUser):
+class JsmCustomer(config.http_user):
     host = JSM_SETTINGS.server_url
+    insecure = not config.secure  # FastHttpUser only, HttpUser client is configured with client.verify
     tasks = [JsmCustomerBehavior]
     wait_time = between(0, 0)
@@ -0,0 +1,197 @@
+"""
+Local multi-process locust execution. The locust process started by Taurus keeps its share of users and starts
+worker processes for the rest of them. Workers run the same locustfile headless and forward every sample to the
+main process, where it is fired as a regular request event: locust stats and kpi.jtl written by Taurus contain
+samples of all processes. Workers stop with the main process, also when it is killed.
+"""
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+from pathlib import Path
+
+import gevent
+from gevent.server import StreamServer
+from locust import events
+from locust.exception import StopUser
+from locust.runners import LocalRunner
+
+from util.project_paths import ENV_TAURUS_ARTIFACT_DIR
+
+WORKER_INDEX_ENV = 'LOCUST_LOCAL_WORKER_INDEX'
+WORKERS_COUNT_ENV = 'LOCUST_LOCAL_WORKERS'
+SAMPLES_PORT_ENV = 'LOCUST_LOCAL_SAMPLES_PORT'
+AUTO_WORKERS = 'auto'
+LOCALHOST = '127.0.0.1'
+FORWARD_INTERVAL = 1  # seconds
+WORKER_STOP_TIMEOUT = 30  # seconds
+
+__registered = False
+
+
+def workers_count(workers_setting) -> int:
+    """
+    Number of locust processes: one per core for 'auto' setting.
+    """
+    if str(workers_setting).lower() == AUTO_WORKERS:
+        return os.cpu_count() or 1
+    return max(int(workers_setting), 1)
+
+
+def worker_index() -> int:
+    return int(os.environ.get(WORKER_INDEX_ENV, 0))
+
+
+def scenario_name(locustfile) -> str:
+    """
+    Name of the locust scenario, different for locust executions running at the same time, e.g. JSM agents and
+    customers.
+    """
+    return Path(locustfile).stem
+
+
+def shard_dataset(rows: list, workers_setting) -> list:
+    """
+    Rows owned by the current locust process, every process gets a disjoint part of dataset.
+    Dataset smaller than number of processes is shared as is.
+    """
+    workers = workers_count(workers_setting)
+    if workers == 1 or len(rows) < workers:
+        return rows
+    return rows[worker_index()::workers]
+
+
+def __split(total, parts):
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def __receive_samples(sock, address):
+    for line in sock.makefile('rb'):
+        for sample in json.loads(line):
+            exception = sample.pop('exception')
+            try:
+                events.request.fire(response=None, context={},
+                                    exception=Exception(exception) if exception else None, **sample)
+            except StopUser:
+                # Taurus wrapper writes the sample to kpi.jtl and then stops the user once its duration is over,
+                # there is no user to stop for a forwarded sample
+                pass
+
+
+def __worker_command(options, users, spawn_rate) -> list:
+    command = [sys.executable, '-m', 'locust', '-f', options.locustfile, '--headless', '--only-summary',
+               '-u', str(users), '-r', str(spawn_rate)]
+    # Run time and stop timeout are parsed to seconds by locust before init
+    if options.run_time:
+        command += ['--run-time', f'{int(options.run_time)}s']
+    if options.stop_timeout:
+        command += ['--stop-timeout', f'{int(options.stop_timeout)}s']
+    if options.host:
+        command += ['--host', options.host]
+    return command
+
+
+def __start_workers(environment, workers):
+    options = environment.parsed_options
+    users = __split(int(options.num_users or 1), workers)
+    server = StreamServer((LOCALHOST, 0), __receive_samples)
+    server.start()
+
+    worker_processes = []
+    for index in range(1, workers):
+        if not users[index]:
+            continue
+        env = dict(os.environ, **{WORKER_INDEX_ENV: str(index), WORKERS_COUNT_ENV: str(workers),
+                                  SAMPLES_PORT_ENV: str(server.server_port)})
+        command = __worker_command(options, users[index], float(options.spawn_rate or 1) * users[index] / sum(users))
+        output = open(ENV_TAURUS_ARTIFACT_DIR / f'locust-worker-{scenario_name(options.locustfile)}-{index}.log', 'a')
+        worker_processes.append(subprocess.Popen(command, env=env, stdout=output, stderr=subprocess.STDOUT))
+    print(f'Started {len(worker_processes)} local locust workers, users per process: {users}')
+
+    # Main process keeps its own share of users and spawn rate
+    options.spawn_rate = float(options.spawn_rate or 1) * users[0] / sum(users)
+    options.num_users = users[0]
+
+    @events.quitting.add_listener
+    def stop_workers(**kwargs):
+        for process in worker_processes:
+            process.send_signal(signal.SIGTERM)
+        for process in worker_processes:
+            try:
+                process.wait(WORKER_STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        # Samples sent by workers on their shutdown are received before the main process quits
+        gevent.sleep(FORWARD_INTERVAL)
+        server.stop()
+
+
+def __forward_samples(port):
+    sock = socket.create_connection((LOCALHOST, port))
+    samples = []
+
+    @events.request.add_listener
+    def on_request(request_type, name, response_time, response_length, exception=None, start_time=None,
+                   **kwargs):
+        sample = {'request_type': request_type, 'name': name, 'response_time': response_time,
+                  'response_length': response_length, 'exception': str(exception) if exception else None}
+        if start_time is not None:
+            sample['start_time'] = start_time
+        samples.append(sample)
+
+    def flush():
+        if samples:
+            batch = json.dumps(samples).encode() + b'\n'
+            samples.clear()
+            sock.sendall(batch)
+
+    def forward():
+        while True:
+            gevent.sleep(FORWARD_INTERVAL)
+            flush()
+
+    def watch_main_process():
+        # Main process never writes to the socket, connection is closed when it quits or dies
+        try:
+            sock.recv(1)
+        except OSError:
+            pass
+        forwarder.kill()
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    forwarder = gevent.spawn(forward)
+    watcher = gevent.spawn(watch_main_process)
+
+    @events.quitting.add_listener
+    def stop_forwarding(**kwargs):
+        forwarder.kill()
+        if not watcher.dead:
+            watcher.kill()
+            flush()
+        sock.close()
+
+
+def register_local_workers(workers_setting) -> None:
+    """
+    Starts local worker processes from the main locust process, or forwards samples to the main process from
+    the worker one.
+    """
+    global __registered
+    if __registered:
+        return
+    __registered = True
+
+    if SAMPLES_PORT_ENV in os.environ:
+        __forward_samples(int(os.environ[SAMPLES_PORT_ENV]))
+        return
+
+    workers = workers_count(workers_setting)
+    if workers == 1:
+        return
+
+    @events.init.add_listener
+    def on_init(environment, **kwargs):
+        if isinstance(environment.runner, LocalRunner) and environment.parsed_options:
+            __start_workers(environment, workers)
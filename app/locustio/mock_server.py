@@ -0,0 +1,235 @@
+"""
+Stand-in Jira, Confluence, JSM and Bamboo server for load generator benchmarks. Every response carries the tokens,
+ids and markers the locustio actions look for, filled in from the request: html pages of a realistic size for page
+views and short json documents for REST calls. The server does no work per request, so a load generator driven
+against it is bound by its own CPU.
+
+Usage from app dir: PYTHONPATH=. python locustio/mock_server.py --app jira --port 8080
+"""
+import argparse
+import itertools
+import json
+import os
+import re
+import time
+from http.cookies import SimpleCookie
+from string import Template
+from urllib.parse import parse_qs, unquote_plus
+
+from gevent import socket
+from gevent.pywsgi import WSGIServer
+
+JIRA = 'jira'
+CONFLUENCE = 'confluence'
+JSM = 'jsm'
+BAMBOO = 'bamboo'
+APPS = [JIRA, CONFLUENCE, JSM, BAMBOO]
+LOCALHOST = '127.0.0.1'
+USER_COOKIE = 'mock_user'
+DEFAULT_PAGE_SIZE = 100 * 1024  # bytes of html page, close to Jira and Confluence page views
+PROJECT_KEY = 'BENCH'
+PROJECT_ID = 10000
+ISSUE_ID_OFFSET = 10000  # issue BENCH-1 has id 10001
+BUILD_DURATION = 1  # seconds
+
+ISSUE_KEY_RE = re.compile(r'\b([A-Z][A-Z0-9]*-(\d+))\b')
+ISSUE_ID_RE = re.compile(r'(?:^|[?&])(?:id|issueId)=[^0-9&]*(\d+)')
+PROJECT_KEY_RE = re.compile(r'/projects/([A-Z][A-Z0-9]*)')
+CONTENT_ID_RE = re.compile(r'(?:pageId=|/content/|/pages/)(\d+)')
+FILLER_LINE = '<div class="content-filler"><span>lorem ipsum dolor sit amet consectetur adipiscing</span></div>\n'
+
+JIRA_MARKERS = Template(r'''
+<meta name="atlassian-token" content="$token">
+<meta name="ajs-issue-key" content="$issue_key">
+<title>[$issue_key] Edit Issue:  [$issue_key] Add Comment: $issue_key</title>
+<input type="hidden" title="loggedInUser" value="$user">
+<a href="/secure/AddComment!default.jspa?id=$issue_id&amp;atl_token=$token">Comment</a>
+<a id="key-val" rel="$issue_id">$issue_key</a>
+<img src="/secure/projectavatar?avatarId=10324" alt="">
+<a href="/secure/EditLabels!default.jspa?id=$issue_id">Labels</a>
+<input name="issuetype" type="hidden" value="10001">
+<input name="formToken" type="hidden" value="form-$token">
+<option selected="selected" data-icon="/images/icons/priorities/medium.svg" value="3">Medium</option>
+<select id="assignee" name="assignee"><option value="-1">Automatic</option><option value="$user" class="user">$user</option><option selected="selected" value="$user">$user</option></select>
+<script>
+WRM._unparsedData["com.atlassian.jira.project.browse:projects"]="[]";
+WRM._unparsedData["project-key"]="\"$project_key\"";
+WRM._unparsedData["project-id"]="$project_id";
+</script>
+<a href="/secure/RapidBoard.jspa" class="com.pyxis.greenhopper.jira:project-sidebar-work-scrum">Board</a>
+<span>Dashboard Diagnostics: OK</span>
+{"atl_token":"$token","formToken":"form-$token","issueKey":"$issue_key","fields":[{"id":"project","label":"Project","required":true,"editHtml":"<input class=\"project-field\" value=\"$project_id\">"},{"id":"issuetype","label":"Issue Type","required":true,"editHtml":"{&quot;label&quot;:&quot;Story&quot;,&quot;value&quot;:&quot;10001&quot;}"},{"id":"summary","label":"Summary","required":true,"editHtml":""},{"id":"resolution","label":"Resolution","required":false,"editHtml":"<option value=\"1\">\n            Done\n</option>"},{"id":"customfield_10100","label":"Story Points","required":false,"editHtml":""}]}
+{"issueTable":{"issueIds":[$issue_id],"table":[{"id":$issue_id,"key":"$issue_key","summary":"Benchmark issue"}]}}
+''')
+
+CONFLUENCE_MARKERS = Template(r'''
+<meta name="ajs-atl-token" content="$token">
+<meta name="ajs-keyboardshortcut-hash" content="bench">
+<meta name="ajs-static-resource-url-prefix" content="/s/bench/_">
+<meta name="ajs-version-number" content="8.5.0">
+<meta name="ajs-build-number" content="9012">
+<meta name="ajs-remote-user-key" content="key-$user">
+<meta name="ajs-page-id" content="$content_id">
+<meta name="ajs-parent-page-id" content="$content_id">
+<meta name="ajs-content-id" content="$content_id">
+<meta name="ajs-page-title" content="Page Title">
+<meta name="ajs-page-version" content="1">
+<meta id="confluence-space-key" name="confluence-space-key" content="BENCH">
+<a href="/logout.action">Log Out</a> <span>Created by $user</span> <a>Save for later</a> <input id="quick-search">
+<a id="editPageLink" href="/pages/editpage.action?pageId=$content_id">Edit</a>
+<a href="/pages/createpage.action?spaceKey=BENCH&amp;fromPageId=$content_id">Create</a>
+<input name="ancestorId" value="$content_id">
+<input name="treeRequestId" value="/plugins/pagetree/naturalchildren.action">
+<input name="noRoot" value="false"> <input name="rootPageId" value="$content_id">
+<textarea id="wysiwygTextarea" name="wysiwygContent" class="hidden tinymce-editor">Page content</textarea>
+<a data-linked-resource-id="$content_id">attachment</a> <span>Upload file</span> <span>Attach more files</span>
+<span>Blog post title</span> <span>Page Title</span> <span>draftId</span> <span>changeSets</span>
+<script>{"id":$content_id,"authorDisplayName":"$user"}</script>
+''')
+
+JSM_MARKERS = Template(r'''
+<meta name="atlassian-token" content="$token">
+<input type="hidden" title="loggedInUser" value="$user">
+<meta name="ajs-issue-key" content="$issue_key">
+''')
+
+BAMBOO_MARKERS = Template(r'''
+<meta name="atlassian-token" content="$token">
+<a href="/userLogout.action">Log Out</a>
+''')
+
+MARKERS = {JIRA: JIRA_MARKERS, CONFLUENCE: CONFLUENCE_MARKERS, JSM: JSM_MARKERS, BAMBOO: BAMBOO_MARKERS}
+
+
+def __confluence_json(context):
+    return {'results': [{'id': context['content_id'], 'title': 'Page Title', 'authorDisplayName': context['user']}],
+            'success': True, 'draftId': context['content_id'], 'contributorsHash': 'bench',
+            'atlToken': context['token'], 'title': 'Page Title', 'status': 'current',
+            'content': {'likes': [{'user': {'name': context['user'], 'displayName': context['user']}}]},
+            'changeSets': [],
+            '_links': {'anonymous_export_view': f'display/BENCH/{context["content_id"]}',
+                       'webui': f'pages/viewpage.action?pageId={context["content_id"]}'},
+            'request': context['request']}
+
+
+def __jsm_queues(context):
+    return [{'items': [{'label': 'All open', 'key': '1', 'params': {'count': '10'}},
+                       {'label': 'Benchmark queue', 'key': '2', 'params': {'count': '10'}}]}]
+
+
+def __jsm_participants(context):
+    return [{'id': '1', 'userKey': 'JIRAUSER10001', 'name': context['user']}]
+
+
+__build_numbers = itertools.count(1)
+
+
+def __bamboo_queue(context):
+    plan_key = context['path'].rsplit('/', 1)[-1]
+    build_number = next(__build_numbers)
+    return {'planKey': plan_key, 'buildNumber': build_number, 'buildResultKey': f'{plan_key}-{build_number}'}
+
+
+def __bamboo_result(context):
+    started = time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(time.time() - BUILD_DURATION))
+    return {'key': context['path'].rsplit('/', 1)[-1], 'buildStartedTime': started, 'queueDuration': 25,
+            'buildDuration': BUILD_DURATION * 1000, 'lifeCycleState': 'Finished', 'buildState': 'Successful'}
+
+
+# Responses parsed as json by the actions, the first matching (method, path pattern) is used
+JSON_ROUTES = {
+    CONFLUENCE: [(None, re.compile(r'/rest/|/json/'), __confluence_json)],
+    JSM: [(None, re.compile(r'/rest/servicedesk/1/[^/]+/webfragments/sections/sd-queues-nav'), __jsm_queues),
+          (None, re.compile(r'/rest/servicedesk/1/customer/participants/'), __jsm_participants),
+          ('POST', re.compile(r'/servicedesk/customer/user/login'), lambda context: {'loginSucceeded': True}),
+          ('POST', re.compile(r'/servicedesk/customer/portal/\d+/create/\d+'),
+           lambda context: {'issue': {'key': context['issue_key']}})],
+    BAMBOO: [(None, re.compile(r'/rest/api/latest/plan/'), lambda context: {'isActive': False}),
+             ('POST', re.compile(r'/rest/api/latest/queue/'), __bamboo_queue),
+             (None, re.compile(r'/rest/api/latest/queue$'), lambda context: {'queuedBuilds': {'queuedBuild': []}}),
+             (None, re.compile(r'/rest/api/latest/result/'), __bamboo_result)],
+}
+
+
+def filler(size: int) -> bytes:
+    lines = size // len(FILLER_LINE) + 1
+    return (FILLER_LINE * lines)[:size].encode('utf-8')
+
+
+def __request_context(environ, body: bytes) -> dict:
+    path = environ.get('PATH_INFO', '/')
+    request = unquote_plus(f'{path}?{environ.get("QUERY_STRING", "")}')
+    cookie = SimpleCookie(environ.get('HTTP_COOKIE', ''))
+    user = cookie[USER_COOKIE].value if USER_COOKIE in cookie else 'anonymous'
+    if body and b'os_username=' in body:
+        user = parse_qs(body.decode('utf-8')).get('os_username', [user])[0]
+
+    issue_key, issue_id = f'{PROJECT_KEY}-1', ISSUE_ID_OFFSET + 1
+    key_search = ISSUE_KEY_RE.search(request)
+    id_search = ISSUE_ID_RE.search(request)
+    if id_search:
+        issue_id = int(id_search.group(1))
+        issue_key = f'{PROJECT_KEY}-{issue_id - ISSUE_ID_OFFSET}'
+    elif key_search:
+        issue_key, issue_id = key_search.group(1), ISSUE_ID_OFFSET + int(key_search.group(2))
+    project_key = PROJECT_KEY_RE.search(path)
+    content_id = CONTENT_ID_RE.search(request)
+    return {'path': path, 'request': request, 'user': user, 'token': f'mock-{user}',
+            'issue_key': issue_key, 'issue_id': issue_id,
+            'project_key': project_key.group(1) if project_key else PROJECT_KEY, 'project_id': PROJECT_ID,
+            'content_id': content_id.group(1) if content_id else '65537'}
+
+
+def create_app(app: str, page_size: int = DEFAULT_PAGE_SIZE):
+    page_filler = filler(page_size)
+
+    def application(environ, start_response):
+        method = environ['REQUEST_METHOD']
+        body = environ['wsgi.input'].read() if method in ('POST', 'PUT') else b''
+        context = __request_context(environ, body)
+        headers = []
+        if body and b'os_username=' in body:
+            headers.append(('Set-Cookie', f'{USER_COOKIE}={context["user"]}; Path=/'))
+
+        for route_method, pattern, handler in JSON_ROUTES.get(app, []):
+            if route_method in (None, method) and pattern.search(context['path']):
+                content = json.dumps(handler(context), separators=(',', ':')).encode('utf-8')
+                start_response('200 OK', headers + [('Content-Type', 'application/json;charset=UTF-8')])
+                return [content]
+
+        markers = MARKERS[app].substitute(context).encode('utf-8')
+        # Page views get a body of a real page size, REST calls the markers only
+        content = [markers] if '/rest/' in context['path'] else [page_filler, markers]
+        start_response('200 OK', headers + [('Content-Type', 'text/html;charset=UTF-8')])
+        return content
+
+    return application
+
+
+def serve(app: str, port: int, page_size: int = DEFAULT_PAGE_SIZE, processes: int = 1):
+    """
+    Serves the app on localhost from the given number of forked processes sharing one listening socket.
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((LOCALHOST, port))
+    listener.listen(1024)
+    for _ in range(processes - 1):
+        if os.fork() == 0:
+            break
+    print(f'Mock {app} server process {os.getpid()} is listening on http://{LOCALHOST}:{port}', flush=True)
+    WSGIServer(listener, create_app(app, page_size), log=None).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--app', choices=APPS, required=True)
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='bytes of html page responses')
+    parser.add_argument('--processes', type=int, default=1, help='server processes')
+    args = parser.parse_args()
+    serve(args.app, args.port, args.page_size, args.processes)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import typing
+from collections import defaultdict
 from decimal import Decimal, getcontext
 import glob
 import json
@@ -6,9 +7,13 @@ import os
 
 import pandas
 import pandas as pd
+import pyarrow.parquet
 
 JSON_FILE_FORMATS = ('json', 'jpt',)
 CSV_FILE_FORMATS = ('csv',)
+CHUNK_SIZE = 500_000
+# Explicit dtypes of jtl fields for iterative reading, other fields are inferred by pandas
+JTL_FIELD_DTYPES = {'timeStamp': 'int64', 'elapsed': 'int32', 'label': 'category'}
 
 
 def cast_to_decimal(value):
@@ -31,10 +36,34 @@ def jpt_to_python(input_file) -> list:
     return data
 
 
-def file_to_dataframe(input_file):
+def get_columnar_file(input_file):
+    """
+      Columnar copy of jtl file written by jtls-to-csv.py next to the original file
+      :param input_file: path to jtl file
+      :return: path to parquet file if it exists and is not older than the jtl file, otherwise None
+    """
+    columnar_file = os.path.splitext(input_file)[0] + '.parquet'
+    if not os.path.exists(columnar_file):
+        return None
+    # Jtl file changed after conversion (e.g. replaced by another run) makes the copy stale
+    return columnar_file if os.path.getmtime(columnar_file) >= os.path.getmtime(input_file) else None
+
+
+def file_to_dataframe(input_file, fields: typing.Optional[list] = None):
     # TODO: think about iterative reading when have huge data
     fileformat = os.path.splitext(input_file)[-1].strip('.')
 
+    columnar_file = get_columnar_file(input_file) if fileformat == 'jtl' else None
+    if columnar_file:
+        input_file = columnar_file
+        fileformat = 'parquet'
+
+    if fileformat == 'parquet':
+        # Only requested columns are read from columnar file
+        dataframe = pandas.read_parquet(input_file, columns=list(fields) if fields is not None else None)
+        # Dictionary-encoded columns are read as categories, convert them back to strings as they are in jtl
+        return dataframe.astype({column: str for column in dataframe.select_dtypes('category').columns})
+
     if fileformat in ('csv', 'jtl'):
         dataframe = pandas.read_csv(input_file)
     elif fileformat == 'json':
@@ -46,6 +75,9 @@ def file_to_dataframe(input_file):
         raise NotImplementedError(
             f"File format {fileformat} is not supported yet")
 
+    if fields is not None:
+        dataframe = dataframe[list(fields)]
+
     return dataframe
 
 
@@ -56,15 +88,65 @@ def files_to_dataframe(path, fields: typing.Optional[list] = None):
         raise FileNotFoundError(f"Files at path {path} are not found")
     dataframes = []
     for filename in files:
-        dataframe = file_to_dataframe(filename)
-        if fields is not None:
-            dataframe = dataframe[list(fields)]
-
-        dataframes.append(dataframe)
+        dataframes.append(file_to_dataframe(filename, fields))
 
     return pd.concat(dataframes)
 
 
+def file_to_dataframe_chunks(input_file, fields: typing.Optional[list] = None,
+                             chunk_size: int = CHUNK_SIZE) -> typing.Iterator[pandas.DataFrame]:
+    """
+      Read file iteratively by chunks of at most chunk_size rows. Only csv, jtl and parquet files are read
+      iteratively, other formats are returned as a single chunk.
+      :param input_file: path to file
+      :param fields: fields to read, all fields are read if None
+      :param chunk_size: number of rows in chunk
+      :return: iterator over dataframes
+    """
+    fileformat = os.path.splitext(input_file)[-1].strip('.')
+
+    columnar_file = get_columnar_file(input_file) if fileformat == 'jtl' else None
+    if columnar_file:
+        input_file = columnar_file
+        fileformat = 'parquet'
+
+    if fileformat == 'parquet':
+        columns = list(fields) if fields is not None else None
+        for batch in pyarrow.parquet.ParquetFile(input_file).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    elif fileformat in ('csv', 'jtl'):
+        dtype = {field: field_dtype for field, field_dtype in JTL_FIELD_DTYPES.items()
+                 if fields is None or field in fields}
+        with pandas.read_csv(input_file, usecols=fields, dtype=dtype, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                yield chunk
+    else:
+        yield file_to_dataframe(input_file, fields)
+
+
+def group_samples_from_multiple_paths(paths: list, fields: typing.Optional[list] = None, column: str = 'label',
+                                      chunk_size: int = CHUNK_SIZE) -> typing.Dict[str, pandas.DataFrame]:
+    """
+      Read files iteratively and group their rows by given column without concatenating whole files
+      :param paths: glob patterns of files
+      :param fields: fields to read, must contain column
+      :param column: field to group by
+      :param chunk_size: number of rows read at once
+      :return: dict of group name to dataframe with the rest of fields
+    """
+    chunks_by_group = defaultdict(list)
+    for path in paths:
+        files = glob.glob(path)
+        if not files:
+            raise FileNotFoundError(f"Files at path {path} are not found")
+        for filename in files:
+            for chunk in file_to_dataframe_chunks(filename, fields, chunk_size):
+                for group, group_chunk in chunk.groupby(column, sort=False, observed=True):
+                    chunks_by_group[group].append(group_chunk.drop(columns=column))
+
+    return {group: pd.concat(chunks, ignore_index=True) for group, chunks in chunks_by_group.items()}
+
+
 def concatenate_dataframes_from_multiple_paths(paths: list, fields: typing.Optional[list] = None):
     dataframes = []
     for path in paths:
@@ -2,23 +2,31 @@ import decimal
 import os
 from dataclasses import dataclass
 from decimal import Decimal, getcontext
-from statistics import median
+from multiprocessing import Pool, cpu_count
 import typing
 import warnings
 
+import numpy
 import pandas
 from prettytable import PrettyTable
-from scipy.stats import mannwhitneyu
+from scipy.stats import mannwhitneyu, norm
 
 import constants
-from scripts.dataframe_converter import (concatenate_dataframes_from_multiple_paths,
-                                         group_data_by_column)
+from scripts.dataframe_converter import group_samples_from_multiple_paths
 from scripts.utils import save_results
 from tolerances import get_tolerances, ActionTolerance
 
 
 getcontext().prec = 20
 
+MW_ALPHA = Decimal(0.05)  # critical value for mann whitney test (significance level)
+MW_ASYMPTOTIC_MIN_SIZE = 9  # scipy uses exact test if any of samples is smaller and there are no ties
+JUDGEMENT_FIELDS = ('label', 'elapsed', )
+MEMINFO_FILE = '/proc/meminfo'
+
+# Baseline of the judge worker process, set once by the pool initializer instead of being sent with every task
+__worker_baseline: typing.Dict[str, pandas.DataFrame] = {}
+
 
 @dataclass
 class JudgementResult:
@@ -41,60 +49,100 @@ class JudgementResult:
                 self.tested_size]
 
 
-class SampleObject:
-    def __init__(self, values, cast_type='float64'):
-        pandas.set_option("display.precision", 20)
-        self.values = values.astype(cast_type)
-
-    def shift(self, shift_value):
-        self.values = self.values.add(
-            pandas.to_numeric(shift_value, downcast='float'))
-
-    def median(self):
-        return median(self.values)
-
-
-def mannwhitney_test(base_sample, tested_sample, tolerance=Decimal(0.03)):
-    baseline_sample = SampleObject(base_sample)
+def shift_tested_sample(base_sample: numpy.ndarray, tested_sample: numpy.ndarray,
+                        tolerance: Decimal) -> numpy.ndarray:
     # First we shift tested sample a little bit back likely closer to baseline.
     # This will be acceptance ratio: if tested one is slower at less or equal than 3% - we do accept this
-    mu = - tolerance * Decimal(base_sample.median())
+    mu = - tolerance * Decimal(numpy.median(base_sample))
+    return tested_sample.astype(numpy.float64) + float(mu)
+
+
+def mannwhitney_less_p_values(base_samples: typing.List[numpy.ndarray],
+                              tested_samples: typing.List[numpy.ndarray]) -> numpy.ndarray:
+    """
+      One-sided ('less') Mann-Whitney U test without continuity correction for many pairs of samples at once.
+      All pairs are ranked by a single sort, U statistics and tie-corrected normal approximation p-values are
+      computed as in scipy.stats.mannwhitneyu. Small pairs without ties are evaluated by scipy exact test.
+      :param base_samples: baseline samples
+      :param tested_samples: tested samples, paired with baseline samples by index
+      :return: array of p-values
+    """
+    n1 = numpy.array([len(sample) for sample in base_samples], dtype=numpy.int64)
+    n2 = numpy.array([len(sample) for sample in tested_samples], dtype=numpy.int64)
+    pairs_count = len(n1)
+    if not pairs_count:
+        return numpy.empty(0)
+    sizes = n1 + n2
+
+    values = numpy.concatenate([numpy.concatenate([base_sample, tested_sample]).astype(numpy.float64)
+                                for base_sample, tested_sample in zip(base_samples, tested_samples)])
+    pair_ids = numpy.repeat(numpy.arange(pairs_count), sizes)
+    pair_offsets = numpy.concatenate([[0], numpy.cumsum(sizes)[:-1]])
+    is_base = numpy.arange(len(values)) - pair_offsets[pair_ids] < n1[pair_ids]
+
+    order = numpy.lexsort((values, pair_ids))
+    sorted_values = values[order]
+    sorted_pair_ids = pair_ids[order]
+
+    # Runs of equal values within a pair are ties and get an average rank
+    run_starts = numpy.flatnonzero(numpy.concatenate([[True], (sorted_values[1:] != sorted_values[:-1]) |
+                                                      (sorted_pair_ids[1:] != sorted_pair_ids[:-1])]))
+    run_lengths = numpy.diff(numpy.append(run_starts, len(values)))
+    run_pair_ids = sorted_pair_ids[run_starts]
+    run_ranks = run_starts - pair_offsets[run_pair_ids] + (run_lengths + 1) / 2
+    ranks = numpy.repeat(run_ranks, run_lengths)
+
+    r1 = numpy.bincount(sorted_pair_ids, weights=ranks * is_base[order], minlength=pairs_count)
+    u1 = r1 - n1 * (n1 + 1) / 2
+    u2 = n1 * n2 - u1
+    tie_term = numpy.bincount(run_pair_ids, weights=run_lengths ** 3 - run_lengths, minlength=pairs_count)
+    s = numpy.sqrt(n1 * n2 / 12 * ((sizes + 1) - tie_term / (sizes * (sizes - 1))))
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        z = (u2 - n1 * n2 / 2) / s
+    p_values = numpy.clip(norm.sf(z), 0, 1)
+
+    has_ties = numpy.bincount(run_pair_ids, weights=run_lengths > 1, minlength=pairs_count) > 0
+    is_small = (n1 < MW_ASYMPTOTIC_MIN_SIZE) | (n2 < MW_ASYMPTOTIC_MIN_SIZE)
+    for pair_id in numpy.flatnonzero(is_small & ~has_ties):
+        _, p_values[pair_id] = mannwhitneyu(base_samples[pair_id], tested_samples[pair_id],
+                                            alternative='less', use_continuity=False)
+    return p_values
 
-    tested_shifted_sample = SampleObject(tested_sample)
-    tested_shifted_sample.shift(mu)
+
+def mannwhitney_test(base_sample, tested_sample, tolerance=Decimal(0.03)):
+    tested_shifted_sample = shift_tested_sample(numpy.asarray(base_sample), numpy.asarray(tested_sample), tolerance)
 
     # TODO: 2/ check the hypothesis in comments of question
     # TODO: https://stats.stackexchange.com/questions/439611/am-i-doing-it-right-conducting-mann-whitney-test-in-scipy
     # TODO: play with mannwhitney, or wilcoxon signed rank test
 
-    u_statistic_less, pvalue_sided_less = mannwhitneyu(
-        baseline_sample.values,
-        tested_shifted_sample.values,
-        alternative='less', use_continuity=False)
+    pvalue_sided_less = mannwhitney_less_p_values([numpy.asarray(base_sample)], [tested_shifted_sample])[0]
+    return is_test_passed(pvalue_sided_less), pvalue_sided_less
 
-    mw_alpha = Decimal(0.05)  # critical value for mann whitney test (significance level)
 
+def is_test_passed(pvalue_sided_less) -> bool:
     # NOTE: if p_value less than critical value,
     # then algorithm can reject hypothesis 'tested result is slower than baseline'
     # in opposite, if p_value is more or equal, there is not enough evidence to reject tested sample
-    hypothesis_rejected = pvalue_sided_less < mw_alpha
-    test_passed = not hypothesis_rejected
-    return test_passed, pvalue_sided_less
+    hypothesis_rejected = pvalue_sided_less < MW_ALPHA
+    return not hypothesis_rejected
 
 
-def judgement_test_measuring(dataframe_baseline: pandas.DataFrame, dataframe_tested: pandas.DataFrame,
+def judgement_test_measuring(dataframe_baseline: typing.Dict[str, pandas.DataFrame],
+                             dataframe_tested: typing.Dict[str, pandas.DataFrame],
                              measurement_by_column: str, tolerances: ActionTolerance):
     judgement_results = []
+    pending_results = []
 
-    for group in sorted(dataframe_baseline.groups):
+    for group in sorted(dataframe_baseline):
         tolerance = tolerances.get_tolerance_range(action=group)
         if tolerance is None:
             continue
         tolerance = Decimal(tolerance)
 
-        sample_base = dataframe_baseline.get_group(group)[measurement_by_column]
+        sample_base = dataframe_baseline[group][measurement_by_column]
         try:
-            sample_tested = dataframe_tested.get_group(group)[measurement_by_column]
+            sample_tested = dataframe_tested[group][measurement_by_column]
         except KeyError as e:
             judgement_results.append(
                 JudgementResult(action=group, passed=False,
@@ -106,14 +154,7 @@ def judgement_test_measuring(dataframe_baseline: pandas.DataFrame, dataframe_tes
             continue
 
         try:
-            test_passed, p_value = mannwhitney_test(sample_base, sample_tested, tolerance)
-            # TODO: later we may define many failure reasons
-            failure_reason = 'Results deviation is not accepted' if not test_passed else None
-            judgement_results.append(
-                JudgementResult(action=group, passed=test_passed, failure_reason=failure_reason, p_value=p_value,
-                                baseline_size=len(sample_base), tested_size=len(sample_tested),
-                                tolerance=float(round(tolerance, 2)))
-            )
+            tested_shifted = shift_tested_sample(sample_base.to_numpy(), sample_tested.to_numpy(), tolerance)
         except decimal.InvalidOperation as e:
             judgement_results.append(JudgementResult(
                 action=group, passed=False, baseline_size=len(sample_base), tested_size=len(sample_tested),
@@ -122,8 +163,23 @@ def judgement_test_measuring(dataframe_baseline: pandas.DataFrame, dataframe_tes
                 p_value=None, tolerance=float(tolerances.get_tolerance_range(action=group)))
             )
             print(f"No tolerance found for action {group}. Action timelines is {sample_base.values}")
+            continue
 
-    absent_actions_in_baseline = set(dataframe_tested.groups) - set(dataframe_baseline.groups)
+        # Result is filled in after all actions are evaluated in one batch
+        pending_results.append((len(judgement_results), group, tolerance, sample_base.to_numpy(), tested_shifted))
+        judgement_results.append(None)
+
+    p_values = mannwhitney_less_p_values([base for _, _, _, base, _ in pending_results],
+                                         [tested for _, _, _, _, tested in pending_results])
+    for (index, group, tolerance, base, tested), p_value in zip(pending_results, p_values):
+        test_passed = is_test_passed(p_value)
+        # TODO: later we may define many failure reasons
+        failure_reason = 'Results deviation is not accepted' if not test_passed else None
+        judgement_results[index] = JudgementResult(action=group, passed=test_passed, failure_reason=failure_reason,
+                                                   p_value=p_value, baseline_size=len(base),
+                                                   tested_size=len(tested), tolerance=float(round(tolerance, 2)))
+
+    absent_actions_in_baseline = set(dataframe_tested) - set(dataframe_baseline)
     if absent_actions_in_baseline:
         warnings.warn(f"There are also actions absent in baseline run, but present in experiment: "
                       f"{absent_actions_in_baseline}.")
@@ -131,9 +187,8 @@ def judgement_test_measuring(dataframe_baseline: pandas.DataFrame, dataframe_tes
 
 
 def group_dataframe_by_action(filepaths: list, fields=None):
-    raw_dataframe = concatenate_dataframes_from_multiple_paths(filepaths, fields=fields)
-    # Map timelines to each of action appropriately
-    return group_data_by_column(raw_dataframe, columns=('label',))
+    # Map timelines to each of action appropriately, files are read by chunks to keep memory usage low
+    return group_samples_from_multiple_paths(filepaths, fields=fields, column='label')
 
 
 def save_judgement_results(results, output_dir, baseline_dirname, tested_dirname):
@@ -150,17 +205,23 @@ def save_judgement_results(results, output_dir, baseline_dirname, tested_dirname
                  filepath=os.path.join(output_dir, judgement_filename))
 
 
-def judge_baseline_and_tested(baseline_result_dir: str, tested_result_dir: str, output_dir: str):
-    action_tolerances = get_tolerances(tested_result_dir)
-    fields = ('label', 'elapsed', )
+def group_run_dataframe_by_action(result_dir: str):
     # gather all needed dataframes with specific fields
-    df_baseline = group_dataframe_by_action([os.path.join(baseline_result_dir, 'kpi*.jtl'),
-                                             os.path.join(baseline_result_dir, 'selenium*.jtl')], fields)
-    df_tested = group_dataframe_by_action([os.path.join(tested_result_dir, 'kpi*.jtl'),
-                                           os.path.join(tested_result_dir, 'selenium*.jtl')], fields)
-    results = judgement_test_measuring(df_baseline, df_tested,
-                                       measurement_by_column='elapsed',
-                                       tolerances=action_tolerances)
+    return group_dataframe_by_action([os.path.join(result_dir, 'kpi*.jtl'),
+                                      os.path.join(result_dir, 'selenium*.jtl')], JUDGEMENT_FIELDS)
+
+
+def judge_tested(df_baseline: typing.Dict[str, pandas.DataFrame], tested_result_dir: str):
+    action_tolerances = get_tolerances(tested_result_dir)
+    df_tested = group_run_dataframe_by_action(tested_result_dir)
+    return judgement_test_measuring(df_baseline, df_tested,
+                                    measurement_by_column='elapsed',
+                                    tolerances=action_tolerances)
+
+
+def judge_baseline_and_tested(baseline_result_dir: str, tested_result_dir: str, output_dir: str):
+    df_baseline = group_run_dataframe_by_action(baseline_result_dir)
+    results = judge_tested(df_baseline, tested_result_dir)
     success_status = all(result.passed for result in results)
 
     save_judgement_results(results, output_dir,
@@ -169,11 +230,55 @@ def judge_baseline_and_tested(baseline_result_dir: str, tested_result_dir: str,
     return success_status
 
 
-def judge(baseline_dir, tested_dirs, output_dir):
+def __init_judge_worker(df_baseline: typing.Dict[str, pandas.DataFrame]):
+    global __worker_baseline
+    __worker_baseline = df_baseline
+
+
+def __judge_tested_in_worker(tested_result_dir: str):
+    return judge_tested(__worker_baseline, tested_result_dir)
+
+
+def __available_memory() -> typing.Optional[int]:
+    # Linux only, on other systems workers are limited by cpu count and judge_workers
+    try:
+        with open(MEMINFO_FILE) as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def get_judge_workers(df_baseline: typing.Dict[str, pandas.DataFrame], tested_runs: int, workers=None) -> int:
+    """
+    Number of judge processes: judge_workers from config or cpu count, limited by available memory.
+    Every worker holds the baseline, copied unless the process is forked, and an experiment run of about its size.
+    """
+    workers = workers or cpu_count()
+    baseline_size = sum(int(df.memory_usage(deep=True).sum()) for df in df_baseline.values())
+    available_memory = __available_memory()
+    if baseline_size and available_memory is not None:
+        workers = min(workers, available_memory // (2 * baseline_size))
+    return max(1, min(workers, tested_runs))
+
+
+def judge(baseline_dir, tested_dirs, output_dir, workers=None):
+    # Baseline is read once and shared with worker processes, which judge experiments against it
+    df_baseline = group_run_dataframe_by_action(baseline_dir)
+    tested_results = []
+    if tested_dirs:
+        with Pool(processes=get_judge_workers(df_baseline, len(tested_dirs), workers),
+                  initializer=__init_judge_worker, initargs=(df_baseline,)) as pool:
+            tested_results = pool.map(__judge_tested_in_worker, tested_dirs)
+
     judgement_succeeded = True
-    for directory in tested_dirs:
-        success = judge_baseline_and_tested(baseline_dir, directory, output_dir=output_dir)
-        if not success:
+    for directory, results in zip(tested_dirs, tested_results):
+        save_judgement_results(results, output_dir,
+                               baseline_dirname=os.path.basename(baseline_dir),
+                               tested_dirname=os.path.basename(directory))
+        if not all(result.passed for result in results):
             judgement_succeeded = False
     if not judgement_succeeded:
         raise SystemExit("Judgement has failed. Check judgement table above.")
@@ -187,4 +292,5 @@ def __get_judgement_kwargs(config):
 
     return {
         'baseline_dir': baseline_result_dir,
-        'tested_dirs': tested_result_dirs}
+        'tested_dirs': tested_result_dirs,
+        'workers': config.get('judge_workers')}
@@ -1,5 +1,4 @@
 import atexit
-import csv
 import datetime
 import functools
 import json
@@ -19,6 +18,7 @@ from selenium.webdriver.chrome.options import Options
 from time import sleep
 
 from util.conf import CONFLUENCE_SETTINGS, JIRA_SETTINGS, BITBUCKET_SETTINGS, JSM_SETTINGS, BAMBOO_SETTINGS
+from util.dataset_store import MappedDataset
 from util.exceptions import WebDriverExceptionPostpone
 from util.project_paths import JIRA_DATASET_ISSUES, JIRA_DATASET_JQLS, JIRA_DATASET_KANBAN_BOARDS, \
     JIRA_DATASET_PROJECTS, JIRA_DATASET_SCRUM_BOARDS, JIRA_DATASET_USERS, JIRA_DATASET_CUSTOM_ISSUES, BITBUCKET_USERS, \
@@ -105,9 +105,7 @@ class Dataset:
 
     @staticmethod
     def __read_input_file(file_path):
-        with open(file_path, 'r') as fs:
-            reader = csv.reader(fs)
-            return list(reader)
+        return MappedDataset(file_path)
 
 
 globals = InitGlobals()
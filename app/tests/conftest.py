@@ -0,0 +1,13 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# locust modules are imported by tests, gevent patches the standard library before anything else imports it
+from gevent import monkey
+monkey.patch_all()
+
+# util.project_paths creates a local results dir on import unless the artifacts dir is set
+if 'TAURUS_ARTIFACTS_DIR' not in os.environ:
+    os.environ['TAURUS_ARTIFACTS_DIR'] = tempfile.mkdtemp(prefix='dcapt-tests-')
+    atexit.register(shutil.rmtree, os.environ['TAURUS_ARTIFACTS_DIR'], ignore_errors=True)
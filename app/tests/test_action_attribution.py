@@ -0,0 +1,75 @@
+import time
+
+from locust import events
+
+from locustio.common_utils import MyBaseTaskSet, global_measure
+
+
+class FailedResponse:
+    error = 'Connection refused'
+    content = b''
+
+    def raise_for_status(self):
+        return None
+
+
+class FailingClient:
+
+    def get(self, *args, **kwargs):
+        return FailedResponse()
+
+
+class FailingTaskSet(MyBaseTaskSet):
+    client = FailingClient()
+
+
+def failed_requests(func, *args):
+    names = []
+    listener = events.request.add_listener(
+        lambda name, exception, **kwargs: names.append(name) if exception is not None else None)
+    try:
+        func(*args)
+    finally:
+        events.request.remove_listener(listener)
+    return names
+
+
+def open_issue_page(locust):
+    locust.get('/browse/TEST-1', catch_response=True)
+
+
+def test_failure_attributed_to_measured_action():
+    locust = FailingTaskSet.__new__(FailingTaskSet)
+    assert failed_requests(global_measure, open_issue_page, time.time(), 'locust_view_issue',
+                           locust) == ['locust_view_issue']
+
+
+def test_failure_outside_action_attributed_to_caller():
+    locust = FailingTaskSet.__new__(FailingTaskSet)
+    assert failed_requests(open_issue_page, locust) == ['locust_open_issue_page']
+
+
+class RecordingClient:
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append((url, kwargs.get('name')))
+        return True
+
+
+class RecordingTaskSet(MyBaseTaskSet):
+    client = RecordingClient()
+
+
+def view_issue(locust):
+    locust.get('/browse/TEST-1?_=1690000000', catch_response=True)
+    locust.get('/secure/projectavatar?avatarId=10200', name='project avatar', catch_response=True)
+
+
+def test_sub_request_names_are_kept():
+    locust = RecordingTaskSet.__new__(RecordingTaskSet)
+    global_measure(view_issue, time.time(), 'locust_view_issue', locust)
+    assert locust.client.requests == [('/browse/TEST-1?_=1690000000', None),
+                                      ('/secure/projectavatar?avatarId=10200', 'project avatar')]
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+from locust import events
+
+from locustio.common_utils import ActionPacer, CLOSED_PACING, CONSTANT_PACING, POISSON_PACING
+
+
+def test_constant_pacing_keeps_schedule():
+    pacer = ActionPacer(0.05, CONSTANT_PACING)
+    start = time.time()
+    for _ in range(3):
+        pacer.before_action('jira_view_issue')
+        pacer.after_action('jira_view_issue', time.time())
+    # Actions start at 0, 50 and 100 ms regardless of their own duration
+    assert 0.09 <= time.time() - start < 0.15
+
+
+def test_poisson_pacing_starts_after_random_interval():
+    pacer = ActionPacer(0.01, POISSON_PACING)
+    start = time.time()
+    pacer.before_action('jira_view_issue')
+    assert time.time() > start
+
+
+def test_closed_pacing_sleeps_rest_of_action_time():
+    pacer = ActionPacer(0.05, CLOSED_PACING)
+    start = time.time()
+    pacer.before_action('jira_view_issue')
+    pacer.after_action('jira_view_issue', start)
+    assert time.time() - start >= 0.05
+
+
+def test_unknown_pacing():
+    with pytest.raises(Exception):
+        ActionPacer(0.05, 'burst')
+
+
+def test_queueing_delay_is_not_a_request():
+    requests = []
+    listener = events.request.add_listener(lambda **kwargs: requests.append(kwargs))
+    pacer = ActionPacer(0.01, CONSTANT_PACING)
+    try:
+        pacer.before_action('jira_view_issue')
+        time.sleep(0.05)
+        pacer.before_action('jira_view_issue')
+    finally:
+        events.request.remove_listener(listener)
+    assert requests == []
+    actions, late_actions, total_delay, max_delay = pacer.queueing_delays['jira_view_issue']
+    assert (actions, late_actions) == (2, 1)
+    assert max_delay >= 30
+    events.test_stop.fire(environment=None)
+    assert pacer.queueing_delays == {}
@@ -0,0 +1,29 @@
+import pytest
+
+bamboo_clients = pytest.importorskip('util.api.bamboo_clients')
+
+
+class Response:
+
+    def __init__(self, content):
+        self.content = content
+
+    def json(self):
+        return self.content
+
+
+def test_queued_builds_are_paged(monkeypatch):
+    monkeypatch.setattr(bamboo_clients, 'BATCH_SIZE_SEARCH', 2)
+    queue = [{'buildResultKey': f'PROJ-PLAN-{number}'} for number in range(5)]
+    urls = []
+
+    def get(url, error_msg):
+        urls.append(url)
+        start = int(url.split('start-index=')[1].split('&')[0])
+        return Response({'queuedBuilds': {'size': len(queue), 'queuedBuild': queue[start:start + 2]}})
+
+    client = bamboo_clients.BambooClient('http://bamboo', 'admin', 'admin')
+    monkeypatch.setattr(client, 'get', get)
+    assert client.get_queued_builds() == queue
+    assert len(urls) == 3
+    assert all('max-result=2' in url for url in urls)
@@ -0,0 +1,37 @@
+import os
+import sys
+from pathlib import Path
+
+import pandas
+import pytest
+
+# Report scripts import their modules relative to reports_generation dir
+sys.path.insert(0, str(Path(__file__).parents[1] / 'reports_generation'))
+from scripts.dataframe_converter import file_to_dataframe, file_to_dataframe_chunks  # noqa E402
+
+
+def read_elapsed(file_path, chunked):
+    if chunked:
+        return pandas.concat(file_to_dataframe_chunks(str(file_path), fields=['elapsed']))['elapsed'].tolist()
+    return file_to_dataframe(str(file_path), fields=['elapsed'])['elapsed'].tolist()
+
+
+@pytest.fixture
+def jtl_with_copy(tmp_path):
+    jtl = tmp_path / 'kpi.jtl'
+    jtl.write_text('timeStamp,elapsed,label\n1690000000000,120,jira_login\n')
+    pandas.DataFrame({'elapsed': [999]}).to_parquet(tmp_path / 'kpi.parquet')
+    return jtl
+
+
+@pytest.mark.parametrize('chunked', [False, True])
+def test_columnar_copy_is_read(jtl_with_copy, chunked):
+    os.utime(jtl_with_copy, (0, 0))
+    assert read_elapsed(jtl_with_copy, chunked) == [999]
+
+
+@pytest.mark.parametrize('chunked', [False, True])
+def test_stale_columnar_copy_is_not_read(jtl_with_copy, chunked):
+    parquet_mtime = os.path.getmtime(jtl_with_copy.with_suffix('.parquet'))
+    os.utime(jtl_with_copy, (parquet_mtime + 1, parquet_mtime + 1))
+    assert read_elapsed(jtl_with_copy, chunked) == [120]
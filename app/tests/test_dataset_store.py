@@ -0,0 +1,88 @@
+import csv
+
+import pytest
+
+import selenium_ui.conftest as selenium_conftest
+import util.pmc.constants as pmc_constants
+from util.dataset_store import MappedDataset
+
+ROWS = [['1', 'TEST-1', 'summary'], ['2', 'TEST-2', 'multi\nline, "quoted"'], ['3', '', ''], ['4', 'TEST-4', 'é']]
+
+
+def write_csv(file_path, rows):
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+    return file_path
+
+
+def read_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def test_rows_match_csv_reader(tmp_path):
+    file_path = write_csv(tmp_path / 'issues.csv', ROWS)
+    dataset = MappedDataset(file_path)
+    assert len(dataset) == len(read_csv(file_path))
+    assert list(dataset) == read_csv(file_path)
+    assert list(dataset[1:3]) == read_csv(file_path)[1:3]
+    assert dataset[-1] == ROWS[-1]
+    assert dataset.random_row() in ROWS
+
+
+def test_empty_dataset(tmp_path):
+    dataset = MappedDataset(write_csv(tmp_path / 'empty.csv', []))
+    assert not dataset
+    assert list(dataset) == []
+
+
+def test_index_rebuilt_on_change(tmp_path):
+    file_path = write_csv(tmp_path / 'users.csv', ROWS)
+    assert len(MappedDataset(file_path)) == len(ROWS)
+    write_csv(file_path, ROWS + [['5', 'TEST-5', 'new']])
+    assert list(MappedDataset(file_path)) == read_csv(file_path)
+
+
+def test_datasets_join_like_lists(tmp_path):
+    small = MappedDataset(write_csv(tmp_path / 'small.csv', ROWS[:2]))
+    large = MappedDataset(write_csv(tmp_path / 'large.csv', ROWS[2:]))
+    assert small + large == ROWS
+    assert small + large + [['5']] == ROWS + [['5']]
+    assert [['0']] + small == [['0']] + ROWS[:2]
+    assert small == ROWS[:2]
+    assert small != ROWS
+    assert isinstance(small + large, list)
+
+
+@pytest.mark.parametrize('product, paths', [
+    ('jira', ['JIRA_DATASET_ISSUES', 'JIRA_DATASET_USERS', 'JIRA_DATASET_JQLS', 'JIRA_DATASET_SCRUM_BOARDS',
+              'JIRA_DATASET_KANBAN_BOARDS', 'JIRA_DATASET_PROJECTS', 'JIRA_DATASET_CUSTOM_ISSUES']),
+    ('jsm', ['JSM_DATASET_REQUESTS', 'JSM_DATASET_CUSTOMERS', 'JSM_DATASET_AGENTS', 'JSM_DATASET_SERVICE_DESKS_L',
+             'JSM_DATASET_SERVICE_DESKS_S', 'JSM_DATASET_SERVICE_DESKS_M', 'JSM_DATASET_CUSTOM_ISSUES',
+             'JSM_DATASET_INSIGHT_SCHEMAS', 'JSM_DATASET_INSIGHT_ISSUES']),
+    ('confluence', ['CONFLUENCE_PAGES', 'CONFLUENCE_BLOGS', 'CONFLUENCE_USERS', 'CONFLUENCE_CUSTOM_PAGES']),
+    ('bitbucket', ['BITBUCKET_PROJECTS', 'BITBUCKET_USERS', 'BITBUCKET_REPOS', 'BITBUCKET_PRS']),
+    ('bamboo', ['BAMBOO_USERS', 'BAMBOO_BUILD_PLANS']),
+])
+def test_selenium_datasets(tmp_path, monkeypatch, product, paths):
+    for path in paths:
+        monkeypatch.setattr(selenium_conftest, path, write_csv(tmp_path / f'{path}.csv', ROWS))
+    monkeypatch.setattr(selenium_conftest.pmc_paths, 'get_macro_csv_file',
+                        lambda macro_name: write_csv(tmp_path / f'pmc_{macro_name}.csv', ROWS))
+    monkeypatch.setattr(selenium_conftest.pmc_paths, 'get_comment_aggregation_macro_data_csv_file',
+                        lambda: write_csv(tmp_path / 'pmc_comment_aggregation.csv', ROWS))
+    monkeypatch.setattr(selenium_conftest.pmc_paths, 'get_process_search_terms_file',
+                        lambda: write_csv(tmp_path / 'pmc_search_terms.csv', ROWS))
+
+    datasets = getattr(selenium_conftest.Dataset(), f'{product}_dataset')()
+    assert datasets
+    for dataset in datasets.values():
+        assert dataset == ROWS
+        assert list(dataset) == ROWS
+    if product == 'jsm':
+        # selenium_ui/jsm/modules_agents.py joins service desks of all sizes
+        service_desks = (datasets['service_desks_small'] + datasets['service_desks_medium']
+                         + datasets['service_desks_large'])
+        assert service_desks == ROWS * 3
+    if product == 'confluence':
+        assert datasets[pmc_constants.PROCESS_SEARCH_TERMS] == ROWS
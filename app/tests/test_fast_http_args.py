@@ -0,0 +1,68 @@
+import json
+
+import pytest
+from gevent.pywsgi import WSGIServer
+from locust.contrib.fasthttp import FastHttpSession
+from locust.env import Environment
+
+from locustio.common_utils import MyBaseTaskSet, ADMIN_HEADERS
+
+
+@pytest.fixture
+def server():
+    received = []
+
+    def app(environ, start_response):
+        body = environ['wsgi.input'].read()
+        received.append({'path': environ['PATH_INFO'], 'query': environ['QUERY_STRING'], 'body': body,
+                         'content_length': environ.get('CONTENT_LENGTH'),
+                         'content_type': environ.get('CONTENT_TYPE')})
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'ok']
+
+    wsgi_server = WSGIServer(('127.0.0.1', 0), app, log=None)
+    wsgi_server.start()
+    yield f'http://127.0.0.1:{wsgi_server.server_port}', received
+    wsgi_server.stop()
+
+
+def task_set(base_url):
+    class FastTaskSet(MyBaseTaskSet):
+        client = FastHttpSession(Environment(), base_url=base_url, user=None)
+    return FastTaskSet.__new__(FastTaskSet)
+
+
+def test_params_are_added_to_url(server):
+    base_url, received = server
+    locust = task_set(base_url)
+    locust.get('/rest/api/2/search', params={'jql': 'project = TEST', 'fields': ['key', 'summary']})
+    locust.get('/rest/api/2/search?startAt=0', params='maxResults=50')
+    assert [request['query'] for request in received] == ['jql=project+%3D+TEST&fields=key&fields=summary',
+                                                          'startAt=0&maxResults=50']
+
+
+def test_url_is_quoted(server):
+    base_url, received = server
+    task_set(base_url).get('/issues/?jql=order by created DESC&filter=-4')
+    assert received[0]['path'] == '/issues/'
+    assert received[0]['query'] == 'jql=order%20by%20created%20DESC&filter=-4'
+
+
+def test_content_length_is_set_from_body(server):
+    base_url, received = server
+    locust = task_set(base_url)
+    body = {'name': 'TEST', 'description': 'x' * 100}
+    # ADMIN_HEADERS carries Content-Length: 0 for bodyless admin requests
+    locust.post('/rest/api/2/issue', json=body, headers=ADMIN_HEADERS)
+    locust.post('/rest/api/2/issue', json=body, headers=ADMIN_HEADERS)
+    assert len(received) == 2
+    for request in received:
+        assert json.loads(request['body']) == body
+        assert int(request['content_length']) == len(request['body'])
+
+
+def test_form_is_encoded(server):
+    base_url, received = server
+    task_set(base_url).post('/login.jsp', {'os_username': 'admin', 'os_password': 'p@ss word'})
+    assert received[0]['body'] == b'os_username=admin&os_password=p%40ss+word'
+    assert received[0]['content_type'] == 'application/x-www-form-urlencoded'
@@ -0,0 +1,25 @@
+import pytest
+
+from locustio.common_utils import fetch_by_re, fetch_all_by_re, compile_pattern
+from locustio.jira.requests_params import CreateIssue, Login
+
+PAGE = ('<meta name="atlassian-token" content="a1b2-c3">'
+        '"id":"summary","label":"Summary","required":true,'
+        '"id":"customfield_10100","label":"Épic Name","required":false,'
+        '"id":"customfield_10200","label":"Sprint","required":false,')
+
+
+@pytest.mark.parametrize('content', [PAGE, PAGE.encode('utf-8')])
+def test_bytes_and_str_content_match(content):
+    assert fetch_by_re(Login.atl_token_pattern, content) == 'a1b2-c3'
+    assert fetch_by_re('"label":"(.+?)"', content, group_no=0) == '"label":"Summary"'
+    assert fetch_by_re('"missing":"(.+?)"', content, default_value='') == ''
+    assert fetch_all_by_re(CreateIssue.fields_to_retain_pattern, content) == [('summary', 'true')]
+    assert fetch_all_by_re('"id":"customfield_([0-9]*)"', content) == ['10100', '10200']
+
+
+def test_patterns_compiled_once():
+    compile_pattern.cache_clear()
+    for content in [PAGE, PAGE.encode('utf-8')] * 3:
+        fetch_by_re(Login.atl_token_pattern, content)
+    assert compile_pattern.cache_info().misses == 2
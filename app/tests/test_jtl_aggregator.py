@@ -0,0 +1,139 @@
+import csv
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy
+import pandas
+import pytest
+
+from util.jtl_convertor.jtl_aggregator import JtlAggregator, read_jtl_chunks
+from util.jtl_convertor.jtl_columnar_store import get_columnar_file_path
+
+DEFAULT_TEST_ACTIONS = ['jmeter_login_and_view_dashboard', 'jmeter_view_issue', 'selenium_login']
+LABELS = DEFAULT_TEST_ACTIONS + ['app_specific_action', 'jmeter_search_jql']
+APP_DIR = Path(__file__).parents[1]
+JTL_HEADER = ['timeStamp', 'elapsed', 'label', 'responseCode', 'success', 'bytes', 'allThreads']
+
+
+def load_jtls_to_csv():
+    spec = importlib.util.spec_from_file_location(
+        'jtls_to_csv', Path(__file__).parents[1] / 'util' / 'jtl_convertor' / 'jtls-to-csv.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_convert_to_csv(input_jtl: Path, output_csv: Path, default_test_actions: list):
+    """
+    Per-label aggregation of the original jtls-to-csv.py.
+    """
+    with input_jtl.open(mode='r') as f:
+        jtl_list = [row for row in csv.DictReader(f)]
+
+    csv_list = []
+    for jtl_sample in jtl_list:
+        sample = {}
+        if jtl_sample['label'] not in [processed_sample['Label'] for processed_sample in csv_list]:
+            sample['Label'] = jtl_sample['label']
+            sample['# Samples'] = 1
+            sample['elapsed_tmp'] = [int(jtl_sample['elapsed'])]
+            sample['success_tmp'] = [jtl_sample['success'].lower()]
+            csv_list.append(sample)
+        else:
+            processed_sample = [row for row in csv_list if row['Label'] == jtl_sample['label']][0]
+            processed_sample['# Samples'] = processed_sample['# Samples'] + 1
+            processed_sample['elapsed_tmp'].append(int(jtl_sample['elapsed']))
+            processed_sample['success_tmp'].append(jtl_sample['success'].lower())
+
+    for processed_sample in csv_list:
+        elapsed_df = pandas.Series(processed_sample['elapsed_tmp'])
+        processed_sample['Average'] = int(round(elapsed_df.mean()))
+        processed_sample['Median'] = int(round(elapsed_df.quantile(0.5)))
+        processed_sample['90% Line'] = int(round(elapsed_df.quantile(0.9)))
+        processed_sample['95% Line'] = int(round(elapsed_df.quantile(0.95)))
+        processed_sample['99% Line'] = int(round(elapsed_df.quantile(0.99)))
+        processed_sample['Min'] = min(processed_sample['elapsed_tmp'])
+        processed_sample['Max'] = max(processed_sample['elapsed_tmp'])
+        success_list = processed_sample['success_tmp']
+        processed_sample['Error %'] = round(success_list.count('false') / len(success_list), 2) * 100.00
+        processed_sample['App specific'] = processed_sample['Label'] not in default_test_actions
+        del processed_sample['success_tmp']
+        del processed_sample['elapsed_tmp']
+
+    with output_csv.open('w') as output_file:
+        dict_writer = csv.DictWriter(output_file, csv_list[0].keys())
+        dict_writer.writeheader()
+        for row in csv_list:
+            dict_writer.writerow(row)
+
+
+def write_jtl(file_path: Path, samples: int, seed: int) -> Path:
+    rng = numpy.random.default_rng(seed)
+    labels = rng.choice(LABELS, samples, p=[0.4, 0.3, 0.1, 0.15, 0.05])
+    elapsed = rng.lognormal(6, 1.2, samples).astype(int)
+    success = rng.choice(['true', 'false', 'TRUE', 'False'], samples, p=[0.9, 0.05, 0.03, 0.02])
+    with file_path.open('w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(JTL_HEADER)
+        for i in range(samples):
+            writer.writerow([1690000000000 + i * 37, elapsed[i], labels[i], 200, success[i], 1024, 10])
+    return file_path
+
+
+@pytest.mark.parametrize('samples, seed, chunk_size', [(1, 1, 10), (50, 2, 7), (3000, 3, 1000), (3000, 4, 500_000)])
+def test_aggregator_matches_legacy_conversion(tmp_path, samples, seed, chunk_size):
+    jtl = write_jtl(tmp_path / 'kpi.jtl', samples, seed)
+    legacy_convert_to_csv(jtl, tmp_path / 'legacy.csv', DEFAULT_TEST_ACTIONS)
+
+    aggregator = JtlAggregator()
+    aggregator.read_jtl(jtl, chunk_size=chunk_size)
+    aggregator.write_csv(tmp_path / 'results.csv', DEFAULT_TEST_ACTIONS)
+    assert (tmp_path / 'results.csv').read_text() == (tmp_path / 'legacy.csv').read_text()
+
+
+def test_merged_aggregators_match_single_pass(tmp_path):
+    jtl = write_jtl(tmp_path / 'kpi.jtl', 2000, 5)
+    single = JtlAggregator()
+    single.read_jtl(jtl)
+    merged = JtlAggregator()
+    for chunk in read_jtl_chunks(jtl, chunk_size=300):
+        part = JtlAggregator()
+        part.update(chunk)
+        merged.merge(part)
+    assert merged.rows(DEFAULT_TEST_ACTIONS) == single.rows(DEFAULT_TEST_ACTIONS)
+
+
+def test_jtls_to_csv_conversion_matches_legacy(tmp_path):
+    jtl = write_jtl(tmp_path / 'kpi.jtl', 2000, 6)
+    legacy_convert_to_csv(jtl, tmp_path / 'legacy.csv', DEFAULT_TEST_ACTIONS)
+    load_jtls_to_csv().convert_to_csv(jtl, tmp_path / 'kpi.csv', DEFAULT_TEST_ACTIONS)
+    assert (tmp_path / 'kpi.csv').read_text() == (tmp_path / 'legacy.csv').read_text()
+
+    columnar = pandas.read_parquet(get_columnar_file_path(jtl))
+    source = pandas.read_csv(jtl)
+    assert columnar['elapsed'].tolist() == source['elapsed'].tolist()
+    assert columnar['label'].astype(str).tolist() == source['label'].tolist()
+    assert columnar['success'].tolist() == (source['success'].astype(str).str.lower() != 'false').tolist()
+
+
+def run_jtls_to_csv(artifacts_dir: Path, *args: str) -> str:
+    # Pool workers are run outside of the gevent patched test process
+    env = dict(os.environ, TAURUS_ARTIFACTS_DIR=str(artifacts_dir), PYTHONPATH=str(APP_DIR))
+    subprocess.run([sys.executable, str(APP_DIR / 'util' / 'jtl_convertor' / 'jtls-to-csv.py'), *args],
+                   cwd=APP_DIR, env=env, check=True, capture_output=True)
+    return (artifacts_dir / 'results.csv').read_text()
+
+
+def test_parallel_conversion_matches_sequential(tmp_path):
+    for name, seed in [('kpi1.jtl', 7), ('kpi2.jtl', 8), ('selenium.jtl', 9)]:
+        write_jtl(tmp_path / name, 2000, seed)
+    sequential = run_jtls_to_csv(tmp_path, 'kpi*.jtl', 'selenium.jtl')
+    assert run_jtls_to_csv(tmp_path, '--parallel', 'kpi*.jtl', 'selenium.jtl') == sequential
+
+
+@pytest.mark.parametrize('yml', ['jira.yml', 'confluence.yml', 'bitbucket.yml', 'jsm.yml', 'bamboo.yml'])
+def test_yml_converts_jtls_in_parallel(yml):
+    assert 'jtls-to-csv.py --parallel ' in (APP_DIR / yml).read_text()
@@ -0,0 +1,58 @@
+from util.jtl_convertor import jtl_follower
+from util.jtl_convertor.jtl_follower import JtlFollower
+
+HEADER = 'timeStamp,elapsed,label,responseCode,success,bytes,allThreads\n'
+
+
+def append(file_path, text):
+    with file_path.open('a') as f:
+        f.write(text)
+
+
+def read_labels(follower):
+    samples = follower.read_new_samples()
+    return None if samples is None else samples['label'].tolist()
+
+
+def test_incomplete_line_is_read_next_time(tmp_path):
+    file_path = tmp_path / 'kpi.jtl'
+    append(file_path, HEADER + '1690000000000,120,jira_login,200,true,512,10\n1690000000100,80,jira_vi')
+    follower = JtlFollower(file_path)
+    assert read_labels(follower) == ['jira_login']
+    assert read_labels(follower) is None
+    append(file_path, 'ew_issue,200,true,256,10\n')
+    assert read_labels(follower) == ['jira_view_issue']
+
+
+def test_incomplete_quoted_record_is_read_next_time(tmp_path):
+    file_path = tmp_path / 'kpi.jtl'
+    append(file_path, HEADER + '1690000000000,120,jira_login,200,true,512,10\n1690000000100,80,"multi\nline')
+    follower = JtlFollower(file_path)
+    assert read_labels(follower) == ['jira_login']
+    append(file_path, ' label",200,true,256,10\n')
+    assert read_labels(follower) == ['multi\nline label']
+
+
+def test_bad_lines_are_skipped(tmp_path):
+    file_path = tmp_path / 'kpi.jtl'
+    append(file_path, HEADER + '1690000000000,120,jira_login,200,true,512,10\n'
+                               '1690000000100,abc,jira_view_issue,200,true,256,10\n'
+                               '1690000000200\n'
+                               '\n'
+                               '1690000000300,95,"jira_search,jql",200,true,100,10\n')
+    follower = JtlFollower(file_path)
+    assert read_labels(follower) == ['jira_login', 'jira_search,jql']
+    assert follower.bad_lines == 2
+    append(file_path, '1690000000400,60,jira_view_issue,200,true,256,10\n')
+    assert read_labels(follower) == ['jira_view_issue']
+
+
+def test_unclosed_quote_does_not_stop_reading(tmp_path, monkeypatch):
+    monkeypatch.setattr(jtl_follower, 'MAX_RECORD_LINES', 3)
+    file_path = tmp_path / 'kpi.jtl'
+    append(file_path, HEADER + '1690000000000,120,"jira_login,200,true,512,10\n')
+    follower = JtlFollower(file_path)
+    assert read_labels(follower) is None
+    append(file_path, '1690000000100,80,jira_view_issue,200,true,256,10\n' * 3)
+    assert read_labels(follower) == ['jira_view_issue'] * 3
+    assert follower.bad_lines == 1
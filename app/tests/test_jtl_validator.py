@@ -0,0 +1,64 @@
+from csv import DictReader
+
+import pytest
+
+from util.jtl_convertor import jtl_validator
+from util.jtl_convertor.validation_exception import ValidationException
+
+HEADER = 'timeStamp,elapsed,label,responseCode,success,bytes,allThreads\n'
+VALID_ROWS = ['1690000000000,120,jira_login,200,true,512,10\n', '1690000000100,80,jira_view_issue,200,true,256,10\n']
+
+
+def legacy_validate(file_path):
+    """
+    Row-wise validation of the original validator, returns the validation message of the first invalid value.
+    """
+    with file_path.open(mode='r') as f:
+        for file_row_num, jtl_row in enumerate(DictReader(f), 2):
+            for column, value in jtl_row.items():
+                for validation_func in jtl_validator.get_validation_func(column):
+                    try:
+                        validation_func(str(value))
+                    except ValidationException as e:
+                        return f"File row number: {file_row_num}. Column: [{column}]. Validation message: {str(e)}"
+    return None
+
+
+def validate(file_path, chunk_size):
+    try:
+        for _ in jtl_validator.read_validated_jtl(file_path, chunk_size=chunk_size):
+            pass
+    except SystemExit as e:
+        return str(e).split('Validation details: ', 1)[1]
+    return None
+
+
+@pytest.mark.parametrize('rows', [
+    [],
+    ['1690000000200,,jira_search_jql,200,true,100,10\n'],  # empty value
+    ['1690000000200,95\n'],  # missing values
+    ['1690000000200,95,jira_search_jql,200,true\n'],  # missing trailing values
+    ['1690000000200,95,,200,true,100,10\n'],  # blank label
+    ['1690000000200,95,jira_search_jql,200,true,100\n'] * 3 + ['1690000000200,9a,x,200,true,100,10\n'],
+    ['1690000000200,95,jira_search_jql,200,true,100,10\n', '1690000000200,95,jira_search_jql,200,true,1e3,10\n'],
+])
+@pytest.mark.parametrize('chunk_size', [1, 2, jtl_validator.CHUNK_SIZE])
+def test_messages_match_row_wise_validation(tmp_path, rows, chunk_size):
+    file_path = tmp_path / 'kpi.jtl'
+    file_path.write_text(HEADER + ''.join(VALID_ROWS + rows))
+    assert validate(file_path, chunk_size) == legacy_validate(file_path)
+
+
+def test_missing_value_message(tmp_path):
+    file_path = tmp_path / 'kpi.jtl'
+    file_path.write_text(HEADER + '1690000000200,95,jira_search_jql,200,true\n')
+    assert validate(file_path, 2) == ('File row number: 2. Column: [bytes]. '
+                                      'Validation message: Value [None] is not a digit')
+
+
+def test_valid_chunks(tmp_path):
+    file_path = tmp_path / 'kpi.jtl'
+    file_path.write_text(HEADER + ''.join(VALID_ROWS * 3))
+    chunks = list(jtl_validator.read_validated_jtl(file_path, chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+    assert chunks[0][jtl_validator.ELAPSED].tolist() == [120, 80, 120, 80]
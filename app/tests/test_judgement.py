@@ -0,0 +1,90 @@
+import subprocess
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import numpy
+import pandas
+import pytest
+from scipy.stats import mannwhitneyu
+
+# Report scripts import their modules relative to reports_generation dir
+REPORTS_GENERATION_DIR = Path(__file__).parents[1] / 'reports_generation'
+sys.path.insert(0, str(REPORTS_GENERATION_DIR))
+from scripts import judgement  # noqa E402
+from scripts.judgement import mannwhitney_less_p_values, mannwhitney_test, shift_tested_sample  # noqa E402
+
+JUDGE_SCRIPT = ('import sys; from scripts import judgement; '
+                'judgement.judge(sys.argv[1], sys.argv[2:-1], sys.argv[-1], workers=2)')
+
+
+def sample_pairs(seed):
+    rng = numpy.random.default_rng(seed)
+    pairs = []
+    for n1, n2 in [(1, 1), (3, 8), (8, 8), (9, 9), (5, 40), (40, 5), (30, 30), (200, 150), (1000, 1200)]:
+        # Continuous values without ties, rounded values with ties, tested sample slower or faster
+        for scale in [1.0, 0.9, 1.2]:
+            base = rng.lognormal(6, 0.5, n1)
+            tested = rng.lognormal(6, 0.5, n2) * scale
+            pairs.append((base, tested))
+            pairs.append((numpy.round(base, -1), numpy.round(tested, -1)))
+    pairs.append((numpy.full(10, 100.0), numpy.full(12, 100.0)))
+    pairs.append((numpy.array([100.0, 200.0]), numpy.array([100.0, 300.0, 300.0])))
+    return pairs
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_batch_p_values_match_scipy(seed):
+    pairs = sample_pairs(seed)
+    p_values = mannwhitney_less_p_values([base for base, _ in pairs], [tested for _, tested in pairs])
+    expected = [mannwhitneyu(base, tested, alternative='less', use_continuity=False)[1] for base, tested in pairs]
+    assert p_values == pytest.approx(expected, rel=1e-9, abs=1e-12, nan_ok=True)
+
+
+def test_single_pair_matches_scipy():
+    rng = numpy.random.default_rng(4)
+    base = rng.integers(100, 1000, 500)
+    tested = rng.integers(100, 1050, 400)
+    passed, p_value = mannwhitney_test(base, tested, tolerance=Decimal(0.03))
+    shifted = shift_tested_sample(base, tested, Decimal(0.03))
+    expected = mannwhitneyu(base.astype(numpy.float64), shifted, alternative='less', use_continuity=False)[1]
+    assert p_value == pytest.approx(expected, rel=1e-9)
+    assert passed == (expected >= 0.05)
+
+
+def test_empty_batch():
+    assert len(mannwhitney_less_p_values([], [])) == 0
+
+
+def write_run(run_dir: Path, elapsed_scale: float) -> str:
+    rng = numpy.random.default_rng(7)
+    run_dir.mkdir()
+    (run_dir / 'jira.yml').write_text('settings: {}\n')
+    for jtl, label in [('kpi.jtl', 'jmeter_view_issue'), ('selenium.jtl', 'selenium_view_issue')]:
+        rows = [f'{int(value * elapsed_scale)},{label},true\n' for value in rng.lognormal(6, 0.3, 200)]
+        (run_dir / jtl).write_text('elapsed,label,success\n' + ''.join(rows))
+    return str(run_dir)
+
+
+def test_experiments_judged_against_shared_baseline(tmp_path):
+    baseline = write_run(tmp_path / 'baseline', 1)
+    experiments = [write_run(tmp_path / 'same', 1), write_run(tmp_path / 'slower', 2)]
+    # Process pool does not work in the test process patched by gevent, judgement runs in its own process
+    judge = subprocess.run([sys.executable, '-c', JUDGE_SCRIPT, baseline, *experiments, str(tmp_path)],
+                           cwd=REPORTS_GENERATION_DIR, capture_output=True, text=True)
+    assert 'Judgement has failed' in judge.stderr
+    results = {path.name: path.read_text() for path in tmp_path.glob('judged_*.csv')}
+    assert results['judged_baseline_baseline_experiment_same.csv'].count('True') == 2
+    assert results['judged_baseline_baseline_experiment_slower.csv'].count('False') == 2
+
+
+def test_judge_workers_limited_by_memory(monkeypatch):
+    df_baseline = {'jmeter_view_issue': pandas.DataFrame({'elapsed': numpy.arange(1000)})}
+    baseline_size = int(df_baseline['jmeter_view_issue'].memory_usage(deep=True).sum())
+    monkeypatch.setattr(judgement, '__available_memory', lambda: None)
+    assert judgement.get_judge_workers(df_baseline, 3, workers=8) == 3
+    assert judgement.get_judge_workers(df_baseline, 10, workers=2) == 2
+    monkeypatch.setattr(judgement, '__available_memory', lambda: 5 * baseline_size)
+    assert judgement.get_judge_workers(df_baseline, 10, workers=8) == 2
+    monkeypatch.setattr(judgement, '__available_memory', lambda: 0)
+    assert judgement.get_judge_workers(df_baseline, 10, workers=8) == 1
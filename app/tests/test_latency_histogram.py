@@ -0,0 +1,114 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy
+import pandas
+import pytest
+
+from util.jtl_convertor.jtl_aggregator import JtlAggregator, PERCENTILES
+from util.jtl_convertor.latency_histogram import (LatencyHistograms, bucket_indexes, bucket_values, SUB_BUCKET_BITS,
+                                                  LABEL_JTL, TIME_BUCKET)
+
+EXACT_LIMIT = 1 << SUB_BUCKET_BITS
+DEFAULT_TEST_ACTIONS = ['jmeter_view_issue']
+
+
+def load_histograms_to_csv():
+    spec = importlib.util.spec_from_file_location(
+        'histograms_to_csv', Path(__file__).parents[1] / 'util' / 'jtl_convertor' / 'histograms-to-csv.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def samples(count, seed, high=EXACT_LIMIT):
+    rng = numpy.random.default_rng(seed)
+    return pandas.DataFrame({
+        'timeStamp': 1690000000000 + numpy.sort(rng.integers(0, 120_000, count)),
+        'elapsed': rng.integers(0, high, count),
+        'label': rng.choice(['jmeter_view_issue', 'jmeter_search_jql', 'app_specific_action'], count),
+        'success': rng.choice(['true', 'false'], count, p=[0.9, 0.1]),
+    })
+
+
+def test_exact_buckets():
+    values = numpy.arange(EXACT_LIMIT)
+    assert (bucket_indexes(values) == values).all()
+    assert (bucket_values(values) == values).all()
+
+
+def test_bucket_precision():
+    values = numpy.unique(numpy.concatenate([numpy.arange(EXACT_LIMIT - 10, 70_000),
+                                             numpy.geomspace(70_000, 2 ** 40, 5000).astype(numpy.int64)]))
+    indexes = bucket_indexes(values)
+    assert (numpy.diff(indexes) >= 0).all()
+    # Every value is in the range of its bucket and the bucket value is within half of the bucket width
+    shift = numpy.maximum((indexes >> (SUB_BUCKET_BITS - 1)) - 1, 0)
+    lowest = (indexes - (shift << (SUB_BUCKET_BITS - 1))) << shift
+    assert ((lowest <= values) & (values < lowest + (1 << shift))).all()
+    assert (numpy.abs(bucket_values(indexes) - values) <= values / EXACT_LIMIT).all()
+    assert (bucket_indexes(lowest) == indexes).all()
+
+
+@pytest.mark.parametrize('count, seed', [(1, 1), (17, 2), (5000, 3)])
+def test_rows_match_exact_aggregation(count, seed):
+    chunk = samples(count, seed)
+    histograms = LatencyHistograms()
+    histograms.update(chunk)
+    aggregator = JtlAggregator()
+    aggregator.update(chunk)
+    assert histograms.rows(DEFAULT_TEST_ACTIONS) == aggregator.rows(DEFAULT_TEST_ACTIONS)
+
+
+def test_percentiles_of_large_values_within_precision():
+    chunk = samples(5000, 4, high=600_000)
+    histograms = LatencyHistograms()
+    histograms.update(chunk)
+    percentiles = histograms.percentiles([LABEL_JTL], list(PERCENTILES.values())).set_index(LABEL_JTL)
+    for label, group in chunk.groupby('label'):
+        expected = numpy.quantile(group['elapsed'], list(PERCENTILES.values()))
+        actual = percentiles.loc[label].to_numpy(dtype=float)
+        assert numpy.allclose(actual, expected, rtol=2 / EXACT_LIMIT, atol=0.5)
+
+
+def test_merge_and_file_round_trip_are_lossless(tmp_path):
+    chunk = samples(4000, 5, high=100_000)
+    single = LatencyHistograms()
+    single.update(chunk)
+    merged = LatencyHistograms()
+    for part_num, part in enumerate(numpy.array_split(chunk, 4)):
+        histograms = LatencyHistograms()
+        histograms.update(part)
+        histograms.write(tmp_path / f'{part_num}_histogram.parquet')
+        merged.merge(LatencyHistograms.read(tmp_path / f'{part_num}_histogram.parquet'))
+    assert merged.rows(DEFAULT_TEST_ACTIONS) == single.rows(DEFAULT_TEST_ACTIONS)
+
+
+def test_timeseries_match_exact_percentiles():
+    chunk = samples(3000, 6)
+    histograms = LatencyHistograms()
+    histograms.update(chunk)
+    timeseries = histograms.timeseries(PERCENTILES).set_index([LABEL_JTL, TIME_BUCKET])
+    chunk[TIME_BUCKET] = chunk['timeStamp'] - chunk['timeStamp'] % histograms.time_bucket_ms
+    for (label, time_bucket), group in chunk.groupby(['label', TIME_BUCKET]):
+        row = timeseries.loc[(label, time_bucket)]
+        assert row['count'] == len(group)
+        assert row['errors'] == (group['success'] == 'false').sum()
+        for column, quantile in PERCENTILES.items():
+            assert row[column] == pytest.approx(numpy.quantile(group['elapsed'], quantile))
+
+
+def test_merged_results_do_not_replace_exact_results(tmp_path, monkeypatch):
+    histograms_to_csv = load_histograms_to_csv()
+    monkeypatch.setattr(histograms_to_csv, 'ENV_TAURUS_ARTIFACT_DIR', tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['histograms-to-csv.py', '*_histogram.parquet'])
+    (tmp_path / 'results.csv').write_text('exact')
+    chunk = samples(1000, 7)
+    for part_num, part in enumerate(numpy.array_split(chunk, 2)):
+        histograms = LatencyHistograms()
+        histograms.update(part)
+        histograms.write(tmp_path / f'{part_num}_histogram.parquet')
+    histograms_to_csv.main()
+    assert (tmp_path / 'results.csv').read_text() == 'exact'
+    assert len(pandas.read_csv(tmp_path / histograms_to_csv.RESULTS_CSV_NAME)) == chunk['label'].nunique()
@@ -0,0 +1,115 @@
+import csv
+import os
+import signal
+import subprocess
+import sys
+import time
+from argparse import Namespace
+from pathlib import Path
+
+import gevent
+import pytest
+from gevent.server import StreamServer
+from locust import events
+from locust.exception import StopUser
+
+from locustio import local_workers
+
+APP_DIR = Path(__file__).parents[1]
+WORKER_SCRIPT = ('import sys, gevent; from locust import events; from locustio import local_workers; '
+                 'local_workers.register_local_workers(2); '
+                 '[events.request.fire(request_type="GET", name=f"jira_view_issue_{i}", response_time=100 + i, '
+                 'response_length=512, exception=Exception("Not found") if i % 2 else None, response=None, '
+                 'context={}) for i in range(5)]; '
+                 'gevent.sleep(float(sys.argv[1])); events.quitting.fire(environment=None, reverse=True)')
+
+
+def start_worker(port, run_seconds):
+    env = dict(os.environ, PYTHONPATH=str(APP_DIR), **{local_workers.SAMPLES_PORT_ENV: str(port)})
+    return subprocess.Popen([sys.executable, '-c', WORKER_SCRIPT, str(run_seconds)], cwd=APP_DIR, env=env)
+
+
+def wait_for(condition, timeout=20):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        gevent.sleep(0.1)
+    return condition()
+
+
+class TaurusJtlListener:
+    """
+    Request listener with the signature and limits of the Taurus locust wrapper: the sample is written to kpi.jtl
+    and StopUser is raised once the duration is over.
+    """
+
+    def __init__(self, jtl_path, samples_before_stop):
+        self.file = jtl_path.open('w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(['label', 'elapsed', 'bytes', 'success', 'responseMessage'])
+        self.samples_before_stop = samples_before_stop
+
+    def __call__(self, request_type, name, response_time, exception, response_length=0, **args):
+        self.writer.writerow([name, int(round(response_time)), response_length,
+                              'true' if exception is None else 'false', 'OK' if exception is None else exception])
+        self.file.flush()
+        self.samples_before_stop -= 1
+        if self.samples_before_stop <= 0:
+            raise StopUser('Duration limit reached')
+
+
+@pytest.fixture
+def kpi_jtl(tmp_path):
+    listener = TaurusJtlListener(tmp_path / 'kpi.jtl', samples_before_stop=2)
+    events.request.add_listener(listener)
+    yield tmp_path / 'kpi.jtl'
+    events.request.remove_listener(listener)
+    listener.file.close()
+
+
+def read_jtl(jtl_path):
+    with jtl_path.open() as f:
+        return list(csv.DictReader(f))
+
+
+def test_forwarded_samples_reach_kpi_jtl(kpi_jtl):
+    server = StreamServer((local_workers.LOCALHOST, 0), local_workers.__receive_samples)
+    server.start()
+    try:
+        worker = start_worker(server.server_port, run_seconds=0)
+        assert wait_for(lambda: worker.poll() is not None)
+        assert worker.returncode == 0
+        assert wait_for(lambda: len(read_jtl(kpi_jtl)) == 5)
+    finally:
+        server.stop()
+
+    rows = read_jtl(kpi_jtl)
+    assert [row['label'] for row in rows] == [f'jira_view_issue_{i}' for i in range(5)]
+    assert [row['elapsed'] for row in rows] == ['100', '101', '102', '103', '104']
+    assert {row['bytes'] for row in rows} == {'512'}
+    assert [row['success'] for row in rows] == ['true', 'false', 'true', 'false', 'true']
+    assert rows[1]['responseMessage'] == 'Not found'
+
+
+def test_worker_stops_when_main_process_is_gone():
+    # Connection is closed right after it is accepted, as if the main process was killed
+    server = StreamServer((local_workers.LOCALHOST, 0), lambda sock, address: None)
+    server.start()
+    try:
+        worker = start_worker(server.server_port, run_seconds=60)
+        if not wait_for(lambda: worker.poll() is not None):
+            worker.kill()
+        assert worker.returncode == -signal.SIGTERM
+    finally:
+        server.stop()
+
+
+def test_worker_command_keeps_run_time():
+    options = Namespace(locustfile='locustio/jira/locustfile.py', run_time=2700, stop_timeout=10,
+                        host='http://jira.local')
+    command = local_workers.__worker_command(options, 25, 0.5)
+    assert command[1:] == ['-m', 'locust', '-f', 'locustio/jira/locustfile.py', '--headless', '--only-summary',
+                           '-u', '25', '-r', '0.5', '--run-time', '2700s', '--stop-timeout', '10s',
+                           '--host', 'http://jira.local']
+
+    options = Namespace(locustfile='locustio/jira/locustfile.py', run_time=None, stop_timeout=None, host=None)
+    assert '--run-time' not in local_workers.__worker_command(options, 25, 0.5)
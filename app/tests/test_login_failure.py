@@ -0,0 +1,56 @@
+import time
+
+from locustio.common_utils import MyBaseTaskSet, global_measure
+
+
+class FailedResponse:
+    error = 'Connection refused'
+    content = b''
+
+    def raise_for_status(self):
+        return None
+
+
+class FailingClient:
+
+    def get(self, *args, **kwargs):
+        return FailedResponse()
+
+
+class FailingTaskSet(MyBaseTaskSet):
+    client = FailingClient()
+
+
+def task_set():
+    return FailingTaskSet.__new__(FailingTaskSet)
+
+
+def do_login(locust):
+    locust.get('/', auth=('admin', 'admin'), catch_response=True)
+
+
+def login_and_view_dashboard(locust):
+    locust.get('/', catch_response=True)
+
+
+def view_issue(locust):
+    locust.get('/browse/TEST-1', catch_response=True)
+
+
+def test_login_failure_inside_action():
+    # run_as_specific_user logs in with do_login inside the measured app-specific action
+    locust = task_set()
+    global_measure(do_login, time.time(), 'locust_app_specific_action', locust)
+    assert locust.login_failed
+
+
+def test_login_failure_of_login_action():
+    locust = task_set()
+    global_measure(login_and_view_dashboard, time.time(), 'locust_login_and_view_dashboard', locust)
+    assert locust.login_failed
+
+
+def test_other_failure_is_not_login():
+    locust = task_set()
+    global_measure(view_issue, time.time(), 'locust_view_issue', locust)
+    assert not locust.login_failed
@@ -0,0 +1,48 @@
+import gevent
+import pytest
+
+from locustio.common_utils import MyBaseTaskSet, BROWSER_CONNECTIONS
+
+
+def task_set(concurrent_requests):
+    locust = MyBaseTaskSet.__new__(MyBaseTaskSet)
+    locust.concurrent_requests = concurrent_requests
+    return locust
+
+
+def request(log, value, delay=0.01):
+    def send():
+        log.append(('start', value))
+        gevent.sleep(delay)
+        log.append(('end', value))
+        return value
+    return send
+
+
+def test_sequential_by_default():
+    log = []
+    assert task_set(MyBaseTaskSet.concurrent_requests).run_requests(request(log, 1), request(log, 2)) == [1, 2]
+    assert log == [('start', 1), ('end', 1), ('start', 2), ('end', 2)]
+
+
+def test_concurrent_requests_share_user_pool():
+    locust = task_set(True)
+    log = []
+    values = list(range(BROWSER_CONNECTIONS * 2))
+    assert locust.run_requests(*[request(log, value) for value in values]) == values
+    in_flight = max(sum(1 if event == 'start' else -1 for event, _ in log[:i + 1]) for i in range(len(log)))
+    assert in_flight == BROWSER_CONNECTIONS
+    pool = locust._MyBaseTaskSet__request_pool
+    locust.run_requests(request(log, 0))
+    assert locust._MyBaseTaskSet__request_pool is pool
+    assert len(pool) == 0
+
+
+def test_concurrent_failure_fails_group():
+    def fail():
+        raise ValueError('failed')
+
+    log = []
+    with pytest.raises(ValueError):
+        task_set(True).run_requests(fail, request(log, 1, delay=1))
+    assert ('end', 1) not in log
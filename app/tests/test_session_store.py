@@ -0,0 +1,45 @@
+import gc
+import uuid
+
+from locust import TaskSet
+
+from locustio.common_utils import SessionStore
+
+
+class User(TaskSet):
+
+    def __init__(self):
+        pass
+
+
+def test_extension_keys_work_like_dict():
+    store = SessionStore()
+    session_id = str(uuid.uuid4())
+    store[session_id] = dict()
+    store[session_id]['token'] = 'abc'
+    assert store[session_id] == {'token': 'abc'}
+    assert session_id in store
+    assert list(store) == [session_id]
+    assert dict(store.items()) == {session_id: {'token': 'abc'}}
+    del store[session_id]
+    assert len(store) == 0
+
+
+def test_user_has_single_session():
+    store = SessionStore()
+    user = User()
+    store.start_session(user)['username'] = 'first'
+    session = store.start_session(user)
+    assert len(store) == 1
+    assert store[user] is session
+    store.end_session(user)
+    assert user not in store
+
+
+def test_session_dropped_with_user():
+    store = SessionStore()
+    store.start_session(User())
+    store['shared'] = dict()
+    gc.collect()
+    assert list(store) == ['shared']
+    assert store.memory_size() > 0
@@ -5,11 +5,12 @@ import requests
 from util.data_preparation.prepare_data_common import __warnings_filter
 
 from util.analytics.analytics_utils import get_os, convert_to_sec, get_timestamp, get_date, is_all_tests_successful, \
-    uniq_user_id, generate_report_summary, get_first_elem, generate_test_actions_by_type, get_crowd_sync_test_results
+    uniq_user_id, generate_report_summary, get_first_elem, generate_test_actions_by_type, get_crowd_sync_test_results, \
+    get_generator_saturation, GENERATOR_CPU_THRESHOLD, GENERATOR_LAG_THRESHOLD, GENERATOR_SATURATED_SAMPLES_RATE
 from util.analytics.application_info import ApplicationSelector, BaseApplication, JIRA, CONFLUENCE, BITBUCKET, JSM, \
     CROWD, BAMBOO, INSIGHT
 from util.analytics.bamboo_post_run_collector import BambooPostRunCollector
-from util.analytics.log_reader import BztFileReader, ResultsFileReader, LocustFileReader
+from util.analytics.log_reader import BztFileReader, ResultsFileReader, LocustFileReader, GeneratorStatsReader
 from util.conf import TOOLKIT_VERSION
 
 __warnings_filter()
@@ -44,6 +45,7 @@ class AnalyticsCollector:
         self.concurrency = self.conf.concurrency
         self.actual_duration = bzt_log.actual_run_time
         self.test_actions_success_rate, self.test_actions_timing = self.results_log.all_tests_actions
+        self.generator_saturation = get_generator_saturation(GeneratorStatsReader().samples)
 
         self.selenium_test_rates, self.jmeter_test_rates, self.locust_test_rates, self.app_specific_rates = \
             generate_test_actions_by_type(test_actions=self.test_actions_success_rate, application=application)
@@ -85,7 +87,7 @@ class AnalyticsCollector:
     def is_success(self):
         """
         Verify that tests are found and the success rate of the test actions of the run(minimum success rate 95% for
-        tests).
+        tests), and that the load generator was not the bottleneck of the run.
 
         :return: True with “OK” message if all tests >=95% success, otherwise False with an explanatory message.
         """
@@ -108,8 +110,26 @@ class AnalyticsCollector:
 
         if not success:
             message = f"One or more actions have success rate < {SUCCESS_TEST_RATE} %."
+        else:
+            success, message = self.is_generator_healthy()
         return success, message
 
+    def is_generator_healthy(self):
+        """
+        Verify that locust load generator was not saturated: CPU usage, event loop lag or greenlet scheduling delay
+        over the thresholds in at most 10% of samples. JMeter runs are not sampled.
+
+        :return: True with "OK" message if the generator was not saturated, otherwise False with an explanatory message.
+        """
+        message = 'OK'
+        healthy = (self.generator_saturation is None or
+                   self.generator_saturation <= GENERATOR_SATURATED_SAMPLES_RATE)
+        if not healthy:
+            message = (f"Load generator was saturated in {self.generator_saturation}% of samples "
+                       f"(CPU >= {GENERATOR_CPU_THRESHOLD}% or event loop lag >= {GENERATOR_LAG_THRESHOLD} ms), "
+                       f"response times are not reliable. Increase locust_workers or use a bigger load machine.")
+        return healthy, message
+
     def is_finished(self):
         """
         Verify that the required duration matches the default requirements for each product
@@ -13,6 +13,9 @@ latest_version = get_latest_version()
 current_version = get_current_version()
 SUCCESS_TEST_RATE = 95.00
 SUCCESS_RT_THRESHOLD = 20
+GENERATOR_CPU_THRESHOLD = 90  # percent of a core used by a locust process
+GENERATOR_LAG_THRESHOLD = 100  # ms of event loop lag or greenlet scheduling delay
+GENERATOR_SATURATED_SAMPLES_RATE = 10  # percent of samples over the thresholds when the generator is the bottleneck
 OS = {'macOS': ['Darwin'], 'Windows': ['Windows'], 'Linux': ['Linux']}
 APP_SPECIFIC_TAG = 'APP-SPECIFIC'
 
@@ -93,6 +96,8 @@ def generate_report_summary(collector):
     summary_report.append(f'Concurrency|{collector.concurrency}')
     summary_report.append(f'Expected test run duration from yml file|{collector.duration} sec')
     summary_report.append(f'Actual test run duration|{collector.actual_duration} sec')
+    if collector.generator_saturation is not None:
+        summary_report.append(f'Load generator saturated samples|{collector.generator_saturation}%')
 
     if collector.app_type == BITBUCKET:
         total_git_count = collector.results_log.actual_git_operations_count
@@ -198,6 +203,22 @@ def is_all_tests_successful(tests: dict):
     return True
 
 
+def get_generator_saturation(samples: list):
+    """
+    Share of load generator samples where the locust process was saturated: CPU usage, event loop lag or greenlet
+    scheduling delay over the thresholds.
+
+    :param samples: load generator samples of all locust processes.
+    :return: percent of saturated samples, None if there are no samples.
+    """
+    if not samples:
+        return None
+    saturated = [sample for sample in samples
+                 if sample['cpu_percent'] >= GENERATOR_CPU_THRESHOLD
+                 or max(sample['loop_lag_ms'], sample['scheduling_delay_ms']) >= GENERATOR_LAG_THRESHOLD]
+    return round(len(saturated) / len(samples) * 100, 2)
+
+
 def get_first_elem(elems: list):
     try:
         return elems[1]
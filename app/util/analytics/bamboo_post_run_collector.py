@@ -1,9 +1,12 @@
 import re
+import json
+import os
 from multiprocessing.pool import ThreadPool
 import datetime
 
 from util.api.bamboo_clients import BambooClient
 from util.conf import BAMBOO_SETTINGS
+from util.project_paths import BAMBOO_BUILD_RESULTS
 from multiprocessing import cpu_count
 
 pool = ThreadPool(processes=min(cpu_count() * 3, 12))
@@ -18,7 +21,25 @@ class BambooPostRunCollector:
         self.locust_build_job_results = self.parallel_get_all_builds_results()
         self.start_analytics_utc_time = datetime.datetime.now(datetime.timezone.utc)
 
-    def parallel_get_all_builds_results(self):
+    @staticmethod
+    def get_collected_builds_results():
+        """
+        Build job results collected by locust during the run: build job id to result of the finished build,
+        or None for the build that did not finish during the run.
+        """
+        builds_results = dict()
+        if not os.path.exists(BAMBOO_BUILD_RESULTS):
+            return builds_results
+        with open(BAMBOO_BUILD_RESULTS) as results_file:
+            for line in results_file:
+                try:
+                    build = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # line of the interrupted locust process
+                builds_results[build['build_job_id']] = build['result'] or builds_results.get(build['build_job_id'])
+        return builds_results
+
+    def get_build_job_ids_from_log(self):
         locust_log_lines = self.locust_log.get_locust_log()
         build_job_id_list = []
         for string in locust_log_lines:
@@ -26,9 +47,19 @@ class BambooPostRunCollector:
             if build_job_id:
                 build_job_id = build_job_id.group()
                 build_job_id_list.append(build_job_id.replace('|', ''))
+        return build_job_id_list
+
+    def parallel_get_all_builds_results(self):
+        builds_results = self.get_collected_builds_results()
+        if not builds_results:
+            # Results of the run without collected builds are requested for all builds found in locust log
+            builds_results = dict.fromkeys(self.get_build_job_ids_from_log())
 
-        all_builds_job_results_lists = pool.map(self.client.get_build_job_results, [i for i in build_job_id_list])
-        return all_builds_job_results_lists
+        # Only builds that were running at the end of the run are requested after the run
+        not_collected_ids = [build_job_id for build_job_id, result in builds_results.items() if result is None]
+        not_collected_results = pool.map(self.client.get_build_job_results, not_collected_ids)
+        builds_results.update(zip(not_collected_ids, not_collected_results))
+        return builds_results
 
     def is_build_starts_last_n_seconds(self, build_result, n_sec):
         build_start_time_regexp = r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}"
@@ -44,7 +75,7 @@ class BambooPostRunCollector:
     @property
     def unexpected_status_plan_count(self):
         unexpected_finished_plan_count = 0
-        for build_result in self.locust_build_job_results:
+        for build_result in self.locust_build_job_results.values():
             plan_name = build_result['plan']['name']
             plan_result = build_result['state']
             expected_status = re.search(r'Project \d+ - \d+ - Plan (.*) - Job \d+', plan_name)
@@ -59,7 +90,7 @@ class BambooPostRunCollector:
 
     def get_plan_count_with_n_queue(self, n_sec):
         plan_count_with_n_sec = 0
-        for build_result in self.locust_build_job_results:
+        for build_result in self.locust_build_job_results.values():
             if build_result['queueTimeInSeconds'] >= n_sec:
                 plan_count_with_n_sec = plan_count_with_n_sec + 1
         return plan_count_with_n_sec
@@ -71,7 +102,7 @@ class BambooPostRunCollector:
         expected_min_duration = expected_yml_build_duration - expected_yml_build_duration*possible_diff_perc/100
         expected_max_duration = expected_yml_build_duration + expected_yml_build_duration*possible_diff_perc/100
         unexpected_duration_plans_count = 0
-        for build_result in self.locust_build_job_results:
+        for build_result in self.locust_build_job_results.values():
             if not expected_min_duration <= build_result['buildDuration']/1000 <= expected_max_duration:
                 if not self.is_build_starts_last_n_seconds(build_result,
                                                            BAMBOO_SETTINGS.default_dataset_plan_duration * 2):
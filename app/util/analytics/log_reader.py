@@ -174,3 +174,23 @@ class LocustFileReader(BaseFileReader):
             log_file = log_file.readlines()
             self.validate_file_not_empty(log_file)
             return log_file
+
+
+class GeneratorStatsReader(BaseFileReader):
+    """
+    Time series of locust load generator CPU usage, event loop lag and greenlet scheduling delay, written by every
+    locust process. There are no files for JMeter runs.
+    """
+
+    stats_file_pattern = 'locust_generator_*.csv'
+
+    def __init__(self):
+        self.samples = self.get_samples()
+
+    def get_samples(self):
+        samples = []
+        for stats_file in sorted(self.log_dir.glob(self.stats_file_pattern)):
+            with open(stats_file) as f:
+                for line in csv.DictReader(f):
+                    samples.append({key: float(value) for key, value in line.items()})
+        return samples
@@ -135,6 +135,22 @@ class BambooClient(RestClient):
         r = self.post(api_url, error_msg=f"Could not start the plan {plan_key}")
         return r.json()
 
+    def get_queued_builds(self):
+        # Queue is paged like search results, only the first 25 builds are returned by default
+        content = list()
+        start = 0
+        while True:
+            api_url = (
+                    self.host + f'/rest/api/latest/queue?expand=queuedBuilds&start-index={start}'
+                                f'&max-result={BATCH_SIZE_SEARCH}'
+            )
+            queued_builds = self.get(api_url, error_msg="Could not get build queue").json()['queuedBuilds']
+            page = queued_builds.get('queuedBuild', [])
+            content.extend(page)
+            start += len(page)
+            if not page or start >= queued_builds.get('size', 0):
+                return content
+
     def get_build_plan_status(self, plan_key):
         api_url = f'{self.host}/rest/api/latest/plan/{plan_key}'
         r = self.get(api_url, error_msg=f"Could not get plan {plan_key} status")
@@ -1,5 +1,8 @@
+import os
+
 from util.api.abstract_clients import JSM_EXPERIMENTAL_HEADERS
 from util.api.abstract_clients import RestClient
+from util.attachment_pool import attachment_pool
 from selenium_ui.conftest import retry
 
 BATCH_SIZE_USERS = 1000
@@ -214,7 +217,7 @@ class JsmRestClient(RestClient):
         """
         api_url = self.host + f"/rest/servicedeskapi/servicedesk/{service_desk_id}/attachTemporaryFile"
         headers = {'X-Atlassian-Token': 'no-check', 'X-ExperimentalApi': 'opt-in'}
-        files = [('file', open(file, 'rb')) for file in file_paths]
+        files = [('file', (os.path.basename(file), attachment_pool.get(file))) for file in file_paths]
         response = self.post(api_url, "Could not create temporary attachment", headers=headers, files=files, auth=auth)
         return response.json()['temporaryAttachments']
 
@@ -0,0 +1,34 @@
+import mmap
+import os
+from pathlib import Path
+
+
+class AttachmentPool:
+    """
+    Files uploaded as attachments, memory-mapped once per process and shared by all users through the OS page
+    cache. Content is returned as read-only memoryview: no file is opened per upload, and multipart encoders
+    read it without an intermediate copy and without a shared file position.
+    """
+
+    def __init__(self):
+        self.__files = dict()
+
+    def get(self, file_path) -> memoryview:
+        file_path = Path(file_path).resolve()
+        content = self.__files.get(file_path)
+        if content is None:
+            content = self.__files[file_path] = memoryview(self.__map_file(file_path))
+        return content
+
+    @staticmethod
+    def __map_file(file_path: Path):
+        with file_path.open('rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self.__files)
+
+
+attachment_pool = AttachmentPool()
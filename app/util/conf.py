@@ -27,6 +27,10 @@ class BaseAppSettings:
         self.analytics_collector = self.get_property('allow_analytics')
         self.load_executor = self.get_property('load_executor')
         self.secure = self.get_property('secure')
+        self.load_pacing = self.env_settings.get('load_pacing') or 'closed'
+        self.locust_http_client = self.env_settings.get('locust_http_client') or 'requests'
+        self.locust_workers = self.env_settings.get('locust_workers') or 1
+        self.locust_concurrent_requests = bool(self.env_settings.get('locust_concurrent_requests'))
 
     @property
     def server_url(self):
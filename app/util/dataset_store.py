@@ -0,0 +1,125 @@
+import csv
+import mmap
+import os
+import random
+import struct
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+
+INDEX_SUFFIX = '.idx'
+INDEX_MAGIC = b'DCAPTIX1'
+# Magic, size and modification time of the indexed csv file
+INDEX_HEADER = struct.Struct('<8sQQ')
+OFFSET_TYPE = 'Q'
+ENCODING = 'utf-8'
+
+
+def get_index_file_path(csv_file_path: Path) -> Path:
+    return csv_file_path.with_name(csv_file_path.name + INDEX_SUFFIX)
+
+
+def __index_header(csv_stat: os.stat_result) -> bytes:
+    return INDEX_HEADER.pack(INDEX_MAGIC, csv_stat.st_size, csv_stat.st_mtime_ns)
+
+
+def is_index_fresh(index_file_path: Path, csv_stat: os.stat_result) -> bool:
+    if not index_file_path.exists():
+        return False
+    with index_file_path.open('rb') as index_file:
+        return index_file.read(INDEX_HEADER.size) == __index_header(csv_stat)
+
+
+def build_index(csv_file_path: Path) -> Path:
+    """
+    Writes offsets of csv rows next to the csv file. Quoted values with line breaks are kept in a single row.
+    Index is replaced atomically, so concurrent processes never read a partially written one.
+    """
+    index_file_path = get_index_file_path(csv_file_path)
+    csv_stat = csv_file_path.stat()
+    offsets = array(OFFSET_TYPE, [0])
+    position = 0
+    in_quotes = False
+    with csv_file_path.open('rb') as csv_file:
+        for line in csv_file:
+            position += len(line)
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if not in_quotes:
+                offsets.append(position)
+    if offsets[-1] != position:
+        offsets.append(position)
+
+    tmp_file_path = index_file_path.with_name(f'{index_file_path.name}.{os.getpid()}.tmp')
+    with tmp_file_path.open('wb') as index_file:
+        index_file.write(__index_header(csv_stat))
+        offsets.tofile(index_file)
+    os.replace(tmp_file_path, index_file_path)
+    return index_file_path
+
+
+class MappedDataset(Sequence):
+    """
+    Read-only csv dataset. The csv file and the index of its row offsets are memory-mapped, so all locust and pytest
+    processes share a single copy in the OS page cache. Rows are parsed on access, random row is picked in O(1).
+    """
+
+    def __init__(self, csv_file_path):
+        csv_file_path = Path(csv_file_path)
+        if not is_index_fresh(get_index_file_path(csv_file_path), csv_file_path.stat()):
+            build_index(csv_file_path)
+        self.file_path = csv_file_path
+        self.__data = self.__map_file(csv_file_path)
+        self.__offsets = memoryview(self.__map_file(get_index_file_path(csv_file_path)))[INDEX_HEADER.size:].cast(
+            OFFSET_TYPE)
+        self.__rows = range(len(self.__offsets) - 1)
+
+    @staticmethod
+    def __map_file(file_path: Path):
+        with file_path.open('rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __view(self, rows: range) -> 'MappedDataset':
+        view = MappedDataset.__new__(MappedDataset)
+        view.file_path = self.file_path
+        view.__data = self.__data
+        view.__offsets = self.__offsets
+        view.__rows = rows
+        return view
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.__view(self.__rows[index])
+        row = self.__rows[index]
+        line = bytes(self.__data[self.__offsets[row]:self.__offsets[row + 1]]).decode(ENCODING)
+        return next(csv.reader(line.splitlines(keepends=True)), [])
+
+    def random_row(self) -> list:
+        return self[random.randrange(len(self))]
+
+    # Datasets used to be lists of rows: joining or comparing them still works and gives lists,
+    # list(dataset) gives a mutable copy
+    def __add__(self, other) -> list:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> list:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(other) + list(self)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.file_path}, rows={len(self)})'
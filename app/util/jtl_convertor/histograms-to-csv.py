@@ -0,0 +1,49 @@
+import sys
+import time
+from glob import glob
+from pathlib import Path
+from typing import List
+
+from util.jtl_convertor.jtl_aggregator import get_all_default_actions, write_results_csv
+from util.jtl_convertor.latency_histogram import merge_histogram_files
+from util.project_paths import ENV_TAURUS_ARTIFACT_DIR, DEFAULT_TEST_ACTIONS
+
+# Written next to the exact results.csv of jtls-to-csv.py, never over it. Samples, average, min, max and error rate
+# are exact. Percentiles are exact below 2^SUB_BUCKET_BITS (2048) ms and within 1/1024 of the value above it.
+RESULTS_CSV_NAME = 'results_histogram.csv'
+MERGED_HISTOGRAM_NAME = 'merged_histogram.parquet'
+
+
+def __pathname_pattern_expansion(args: List[str]) -> List[Path]:
+    # Relative patterns are resolved against artifacts dir, absolute ones (e.g. other nodes or runs) are used as is
+    file_paths: List[Path] = []
+    for arg in args:
+        file_paths.extend([Path(x) for x in sorted(glob(str(ENV_TAURUS_ARTIFACT_DIR / arg)))])
+    return file_paths
+
+
+def main():
+    args = sys.argv[1:]
+    file_paths = __pathname_pattern_expansion(args)
+    if not file_paths:
+        raise SystemExit(f'ERROR: Histogram files {args} are not found')
+
+    for file_path in file_paths:
+        print(f'Merging histogram file {file_path}')
+    histograms = merge_histogram_files(file_paths)
+
+    merged_histogram_path = ENV_TAURUS_ARTIFACT_DIR / MERGED_HISTOGRAM_NAME
+    histograms.write(merged_histogram_path)
+    print(f'Created file {merged_histogram_path}')
+
+    results_file_path = ENV_TAURUS_ARTIFACT_DIR / RESULTS_CSV_NAME
+    write_results_csv(results_file_path, histograms.rows(get_all_default_actions(DEFAULT_TEST_ACTIONS)))
+    if not results_file_path.exists():
+        raise SystemExit(f'ERROR: Something went wrong. Output file {results_file_path} does not exist')
+    print(f'Created file {results_file_path}')
+
+
+if __name__ == "__main__":
+    start_time = time.time()
+    main()
+    print(f'Done in {time.time() - start_time} seconds')
@@ -0,0 +1,78 @@
+import sys
+import time
+from glob import glob
+from pathlib import Path
+from typing import List
+
+import matplotlib.pyplot as plt
+import pandas
+
+from util.jtl_convertor.latency_histogram import (LatencyHistograms, HISTOGRAM_SUFFIX, LABEL_JTL, TIME_BUCKET,
+                                                  RPS, ERROR_RATE_PERCENT)
+from util.project_paths import ENV_TAURUS_ARTIFACT_DIR
+
+TIMESERIES_PERCENTILES = {'p50': 0.5, 'p90': 0.9, 'p99': 0.99}
+MINUTES = 'minutes'
+CHARTS = [(RPS, 'Throughput, requests/s'), (ERROR_RATE_PERCENT, 'Error rate, %'),
+          ('p50', 'p50, ms'), ('p90', 'p90, ms'), ('p99', 'p99, ms')]
+IMAGE_WIDTH = 16
+IMAGE_HEIGHT_PER_CHART = 4
+
+
+def __pathname_pattern_expansion(args: List[str]) -> List[Path]:
+    file_paths: List[Path] = []
+    for arg in args:
+        file_paths.extend([Path(x) for x in sorted(glob(str(ENV_TAURUS_ARTIFACT_DIR / arg)))])
+    return file_paths
+
+
+def __get_output_name(histogram_file_path: Path) -> str:
+    return histogram_file_path.name[:-len(HISTOGRAM_SUFFIX)] + '_timeseries'
+
+
+def __make_chart(timeseries: pandas.DataFrame, title: str, image_path: Path) -> None:
+    fig, axes = plt.subplots(len(CHARTS), 1, sharex=True, figsize=(IMAGE_WIDTH, IMAGE_HEIGHT_PER_CHART * len(CHARTS)))
+    for ax, (column, y_label) in zip(axes, CHARTS):
+        timeseries.pivot(index=MINUTES, columns=LABEL_JTL, values=column).plot(ax=ax, legend=False, linewidth=1)
+        ax.set_ylabel(y_label)
+        ax.grid(True)
+    axes[-1].set_xlabel('Time since start of run, minutes')
+    handles, labels = axes[0].get_legend_handles_labels()
+    fig.legend(handles, labels, loc='center right', fontsize='small')
+    fig.suptitle(title)
+    fig.tight_layout(rect=(0, 0, 0.8, 1))
+    fig.savefig(image_path)
+    plt.close(fig)
+
+
+def create_timeseries_report(histogram_file_path: Path) -> None:
+    histograms = LatencyHistograms.read(histogram_file_path)
+    timeseries = histograms.timeseries(TIMESERIES_PERCENTILES)
+    timeseries.insert(2, MINUTES, (timeseries[TIME_BUCKET] - timeseries[TIME_BUCKET].min()) / 60_000)
+
+    output_name = __get_output_name(histogram_file_path)
+    csv_path = ENV_TAURUS_ARTIFACT_DIR / f'{output_name}.csv'
+    timeseries.to_csv(csv_path, index=False)
+    print(f'Created file {csv_path}')
+
+    image_path = ENV_TAURUS_ARTIFACT_DIR / f'{output_name}.png'
+    __make_chart(timeseries, f'{output_name} | {histograms.time_bucket_ms // 1000} s buckets', image_path)
+    if not image_path.exists():
+        raise SystemExit(f'ERROR: Something went wrong. Output file {image_path} does not exist')
+    print(f'Created file {image_path}')
+
+
+def main():
+    args = sys.argv[1:]
+    file_paths = __pathname_pattern_expansion(args)
+    if not file_paths:
+        raise SystemExit(f'ERROR: Histogram files {args} are not found')
+
+    for file_path in file_paths:
+        create_timeseries_report(file_path)
+
+
+if __name__ == "__main__":
+    start_time = time.time()
+    main()
+    print(f'Done in {time.time() - start_time} seconds')
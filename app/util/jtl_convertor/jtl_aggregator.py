@@ -0,0 +1,139 @@
+import csv
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import numpy
+import pandas
+
+LABEL = 'Label'
+SAMPLES = '# Samples'
+AVERAGE = 'Average'
+MEDIAN = 'Median'
+PERC_90 = '90% Line'
+PERC_95 = '95% Line'
+PERC_99 = '99% Line'
+MIN = 'Min'
+MAX = 'Max'
+ERROR_RATE = 'Error %'
+APP_SPECIFIC = 'App specific'
+LABEL_JTL = 'label'
+ELAPSED_JTL = 'elapsed'
+SUCCESS_JTL = 'success'
+FALSE_JTL = 'false'
+
+CSV_COLUMNS: List[str] = [LABEL, SAMPLES, AVERAGE, MEDIAN, PERC_90, PERC_95, PERC_99, MIN, MAX, ERROR_RATE,
+                          APP_SPECIFIC]
+PERCENTILES: Dict[str, float] = {MEDIAN: 0.5, PERC_90: 0.9, PERC_95: 0.95, PERC_99: 0.99}
+JTL_COLUMNS: List[str] = [LABEL_JTL, ELAPSED_JTL, SUCCESS_JTL]
+JTL_DTYPES: Dict[str, type] = {LABEL_JTL: str, ELAPSED_JTL: numpy.int64, SUCCESS_JTL: str}
+CHUNK_SIZE = 500_000
+APPS = ['jira', 'confluence', 'bitbucket', 'jsm', 'crowd', 'bamboo']
+TEST_TYPES = ['selenium', 'jmeter', 'locust']
+
+
+class LabelAggregate:
+    """
+    Samples count, errors count and elapsed values of a single label.
+    Elapsed values are kept as numpy int32 chunks and concatenated lazily.
+    """
+
+    def __init__(self):
+        self.samples = 0
+        self.errors = 0
+        self.__elapsed_chunks: List[numpy.ndarray] = []
+
+    def update(self, elapsed: numpy.ndarray, errors: int) -> None:
+        self.samples += len(elapsed)
+        self.errors += errors
+        self.__elapsed_chunks.append(elapsed.astype(numpy.int32, copy=False))
+
+    def merge(self, other: 'LabelAggregate') -> None:
+        self.samples += other.samples
+        self.errors += other.errors
+        self.__elapsed_chunks.extend(other.__elapsed_chunks)
+
+    @property
+    def elapsed(self) -> numpy.ndarray:
+        if len(self.__elapsed_chunks) != 1:
+            self.__elapsed_chunks = [numpy.concatenate(self.__elapsed_chunks or [numpy.empty(0, numpy.int32)])]
+        return self.__elapsed_chunks[0]
+
+    def to_row(self, label: str, default_test_actions: list) -> dict:
+        elapsed = self.elapsed
+        quantiles = numpy.quantile(elapsed, list(PERCENTILES.values()))
+        row = {LABEL: label,
+               SAMPLES: self.samples,
+               AVERAGE: int(round(elapsed.mean()))}
+        for column, quantile in zip(PERCENTILES, quantiles):
+            row[column] = int(round(quantile))
+        row[MIN] = int(elapsed.min())
+        row[MAX] = int(elapsed.max())
+        row[ERROR_RATE] = round(self.errors / self.samples, 2) * 100.00
+        row[APP_SPECIFIC] = label not in default_test_actions
+        return row
+
+
+class JtlAggregator:
+    """
+    Single-pass per-label aggregation of jtl samples. Labels keep the order of their first occurrence.
+    """
+
+    def __init__(self):
+        self.labels: Dict[str, LabelAggregate] = dict()
+
+    def update(self, chunk: pandas.DataFrame) -> None:
+        chunk = chunk.assign(**{SUCCESS_JTL: chunk[SUCCESS_JTL].str.lower() == FALSE_JTL})
+        for label, group in chunk.groupby(LABEL_JTL, sort=False):
+            aggregate = self.labels.get(label)
+            if aggregate is None:
+                aggregate = self.labels[label] = LabelAggregate()
+            aggregate.update(group[ELAPSED_JTL].to_numpy(), int(group[SUCCESS_JTL].sum()))
+
+    def merge(self, other: 'JtlAggregator') -> None:
+        for label, other_aggregate in other.labels.items():
+            aggregate = self.labels.get(label)
+            if aggregate is None:
+                aggregate = self.labels[label] = LabelAggregate()
+            aggregate.merge(other_aggregate)
+
+    def read_jtl(self, input_jtl: Path, chunk_size: int = CHUNK_SIZE) -> None:
+        for chunk in read_jtl_chunks(input_jtl, chunk_size):
+            self.update(chunk)
+
+    def rows(self, default_test_actions: list) -> List[dict]:
+        return [aggregate.to_row(label, default_test_actions) for label, aggregate in self.labels.items()]
+
+    def write_csv(self, output_csv: Path, default_test_actions: list) -> None:
+        write_results_csv(output_csv, self.rows(default_test_actions))
+
+
+def read_json_file(file_path):
+    with open(file_path) as json_file:
+        data = json.load(json_file)
+        return data
+
+
+def get_all_default_actions(default_test_actions_file: Path) -> list:
+    full_actions_list = []
+    actions_data = read_json_file(default_test_actions_file)
+    for app in APPS:
+        for test_type in TEST_TYPES:
+            for action in actions_data[app][test_type]:
+                full_actions_list.append(action)
+    return full_actions_list
+
+
+def write_results_csv(output_csv: Path, rows: List[dict]) -> None:
+    with output_csv.open('w') as output_file:
+        dict_writer = csv.DictWriter(output_file, CSV_COLUMNS)
+        dict_writer.writeheader()
+        dict_writer.writerows(rows)
+
+
+def read_jtl_chunks(input_jtl: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[pandas.DataFrame]:
+    # keep_default_na=False leaves empty cells as '' the same way csv.DictReader does
+    with pandas.read_csv(input_jtl, usecols=JTL_COLUMNS, dtype=JTL_DTYPES, keep_default_na=False,
+                         chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield chunk
@@ -0,0 +1,121 @@
+import argparse
+import csv
+import filecmp
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import pandas
+
+from util.jtl_convertor.jtl_aggregator import (JtlAggregator, LABEL, SAMPLES, AVERAGE, MEDIAN, PERC_90, PERC_95,
+                                               PERC_99, MIN, MAX, ERROR_RATE, APP_SPECIFIC, LABEL_JTL, ELAPSED_JTL,
+                                               SUCCESS_JTL, FALSE_JTL)
+
+JTL_HEADER = ['timeStamp', 'elapsed', 'label', 'responseCode', 'responseMessage', 'threadName', 'success', 'bytes',
+              'grpThreads', 'allThreads', 'Latency', 'Hostname', 'Connect']
+START_TIMESTAMP = 1680000000000
+
+
+def generate_jtl(file_path: Path, rows: int, labels: int, seed: int = 42) -> None:
+    rnd = random.Random(seed)
+    label_names = [f'jmeter_action_{i}' for i in range(labels)]
+    with file_path.open('w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(JTL_HEADER)
+        for row_num in range(rows):
+            success = rnd.random() > 0.01
+            writer.writerow([START_TIMESTAMP + row_num, int(rnd.lognormvariate(6, 0.8)), rnd.choice(label_names),
+                             200 if success else 500, 'OK' if success else 'Internal Server Error',
+                             f'Thread Group 1-{row_num % 200 + 1}', 'true' if success else 'false',
+                             rnd.randint(1000, 100000), 200, 200, rnd.randint(10, 500), 'localhost', 0])
+
+
+def legacy_convert_to_csv(input_jtl: Path, output_csv: Path, default_test_actions: list):
+    """
+    Reference implementation of convert_to_csv before the streaming aggregator was introduced.
+    """
+    with input_jtl.open(mode='r') as f:
+        reader = csv.DictReader(f)
+        jtl_list = [row for row in reader]
+
+    csv_list = []
+
+    for jtl_sample in jtl_list:
+        sample = {}
+        if jtl_sample[LABEL_JTL] not in [processed_sample[LABEL] for processed_sample in csv_list]:
+            sample[LABEL] = jtl_sample[LABEL_JTL]
+            sample[SAMPLES] = 1
+            sample['elapsed_tmp'] = [int(jtl_sample[ELAPSED_JTL])]
+            sample['success_tmp'] = [jtl_sample[SUCCESS_JTL].lower()]
+            csv_list.append(sample)
+        else:
+            processed_sample = [row for row in csv_list if row[LABEL] == jtl_sample['label']][0]
+            processed_sample[SAMPLES] = processed_sample[SAMPLES] + 1
+            processed_sample['elapsed_tmp'].append(int(jtl_sample[ELAPSED_JTL]))
+            processed_sample['success_tmp'].append(jtl_sample[SUCCESS_JTL].lower())
+
+    for processed_sample in csv_list:
+        elapsed_df = pandas.Series(processed_sample['elapsed_tmp'])
+        processed_sample[AVERAGE] = int(round(elapsed_df.mean()))
+        processed_sample[MEDIAN] = int(round(elapsed_df.quantile(0.5)))
+        processed_sample[PERC_90] = int(round(elapsed_df.quantile(0.9)))
+        processed_sample[PERC_95] = int(round(elapsed_df.quantile(0.95)))
+        processed_sample[PERC_99] = int(round(elapsed_df.quantile(0.99)))
+        processed_sample[MIN] = min(processed_sample['elapsed_tmp'])
+        processed_sample[MAX] = max(processed_sample['elapsed_tmp'])
+        success_list = processed_sample['success_tmp']
+        processed_sample[ERROR_RATE] = round(success_list.count(FALSE_JTL) / len(success_list), 2) * 100.00
+        processed_sample[APP_SPECIFIC] = processed_sample['Label'] not in default_test_actions
+        del processed_sample['success_tmp']
+        del processed_sample['elapsed_tmp']
+
+    headers = csv_list[0].keys()
+    with output_csv.open('w') as output_file:
+        dict_writer = csv.DictWriter(output_file, headers)
+        dict_writer.writeheader()
+        for row in csv_list:
+            dict_writer.writerow(row)
+
+
+def streaming_convert_to_csv(input_jtl: Path, output_csv: Path, default_test_actions: list):
+    aggregator = JtlAggregator()
+    aggregator.read_jtl(input_jtl)
+    aggregator.write_csv(output_csv, default_test_actions)
+
+
+def __measure(func, *args) -> float:
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark jtl to csv conversion on a synthetic jtl file')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='number of samples in the synthetic jtl')
+    parser.add_argument('--labels', type=int, default=30, help='number of distinct labels')
+    parser.add_argument('--skip-legacy', action='store_true', help='do not run the legacy implementation')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        jtl_path = Path(tmp_dir) / 'kpi.jtl'
+        print(f'Generating {args.rows} samples with {args.labels} labels into {jtl_path}')
+        generate_jtl(jtl_path, args.rows, args.labels)
+        print(f'Jtl file size: {jtl_path.stat().st_size / 1024 / 1024:.1f} MB')
+
+        streaming_csv = Path(tmp_dir) / 'streaming.csv'
+        streaming_time = __measure(streaming_convert_to_csv, jtl_path, streaming_csv, [])
+        print(f'Streaming aggregator: {streaming_time:.2f} seconds')
+
+        if not args.skip_legacy:
+            legacy_csv = Path(tmp_dir) / 'legacy.csv'
+            legacy_time = __measure(legacy_convert_to_csv, jtl_path, legacy_csv, [])
+            print(f'Legacy converter: {legacy_time:.2f} seconds')
+            print(f'Speedup: {legacy_time / streaming_time:.1f}x')
+            if not filecmp.cmp(streaming_csv, legacy_csv, shallow=False):
+                raise SystemExit('ERROR: Streaming and legacy results differ')
+            print('Streaming and legacy results are identical')
+
+
+if __name__ == "__main__":
+    main()
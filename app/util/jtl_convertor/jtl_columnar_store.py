@@ -0,0 +1,54 @@
+from pathlib import Path
+from typing import Optional
+
+import pandas
+import pyarrow
+import pyarrow.parquet
+
+TIME_STAMP = 'timeStamp'
+ELAPSED = 'elapsed'
+LABEL = 'label'
+SUCCESS = 'success'
+FALSE_JTL = 'false'
+
+PARQUET_EXTENSION = '.parquet'
+COMPRESSION = 'zstd'
+SCHEMA = pyarrow.schema([
+    (TIME_STAMP, pyarrow.int64()),
+    (ELAPSED, pyarrow.int32()),
+    (LABEL, pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+    (SUCCESS, pyarrow.bool_()),
+])
+
+
+class ColumnarResultsWriter:
+    """
+    Writes jtl samples to a compressed parquet file with typed columns, one row group per jtl chunk.
+    The file is an extra read cache for reports: jtl files are kept, post run checks and other tools read them.
+    """
+
+    def __init__(self, output_path: Path):
+        self.output_path = output_path
+        self.__writer: Optional[pyarrow.parquet.ParquetWriter] = None
+
+    def __enter__(self) -> 'ColumnarResultsWriter':
+        self.__writer = pyarrow.parquet.ParquetWriter(self.output_path, SCHEMA, compression=COMPRESSION)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.__writer.close()
+        if exc_type is not None and self.output_path.exists():
+            self.output_path.unlink()
+
+    def write(self, chunk: pandas.DataFrame) -> None:
+        table = pyarrow.Table.from_arrays([
+            pyarrow.array(chunk[TIME_STAMP].astype('int64')),
+            pyarrow.array(chunk[ELAPSED].astype('int32')),
+            pyarrow.array(chunk[LABEL]).dictionary_encode(),
+            pyarrow.array(chunk[SUCCESS].str.lower() != FALSE_JTL),
+        ], schema=SCHEMA)
+        self.__writer.write_table(table)
+
+
+def get_columnar_file_path(jtl_file_path: Path) -> Path:
+    return jtl_file_path.with_suffix(PARQUET_EXTENSION)
@@ -0,0 +1,107 @@
+import csv
+import io
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pandas
+
+from util.jtl_convertor.jtl_aggregator import JTL_COLUMNS, JTL_DTYPES
+
+# Quote left open for more lines is a broken value, not a value with line breaks
+MAX_RECORD_LINES = 100
+BAD_LINE_PREVIEW_LENGTH = 200
+
+
+class JtlFollower:
+    """
+    Reads samples appended to jtl file since the previous read, starting from the last consumed byte offset.
+    Only complete records are consumed, the last one may be still being written by load executor.
+    Records which cannot be parsed are skipped and counted in bad_lines.
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self.offset = 0
+        self.header: Optional[List[str]] = None
+        self.bad_lines = 0
+
+    @staticmethod
+    def __record_ends(data: bytes) -> Iterator[int]:
+        """
+        End offsets of complete csv records, quoted values may contain line breaks.
+        """
+        record_start = position = 0
+        record_lines = 0
+        in_quotes = False
+        while True:
+            line_end = data.find(b'\n', position) + 1
+            if not line_end:
+                return
+            if data.count(b'"', position, line_end) % 2:
+                in_quotes = not in_quotes
+            position = line_end
+            record_lines += 1
+            if in_quotes and record_lines > MAX_RECORD_LINES:
+                # Broken record ends with its first line, lines after it are read as usual
+                position = data.find(b'\n', record_start) + 1
+                in_quotes = False
+            if not in_quotes:
+                yield position
+                record_start = position
+                record_lines = 0
+
+    def __read_complete_records(self) -> bytes:
+        if not self.file_path.exists():
+            return b''
+        with self.file_path.open('rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        if b'"' not in data:
+            return data[:data.rfind(b'\n') + 1]
+        end = 0
+        for end in self.__record_ends(data):
+            pass
+        return data[:end]
+
+    def __parse(self, data: bytes) -> pandas.DataFrame:
+        return pandas.read_csv(io.BytesIO(data), names=self.header, usecols=JTL_COLUMNS, dtype=JTL_DTYPES,
+                               keep_default_na=False)
+
+    def __parse_records(self, data: bytes) -> pandas.DataFrame:
+        # Records are parsed one by one, so a bad one does not stop reading of the samples after it
+        rows = []
+        record_start = 0
+        for record_end in self.__record_ends(data):
+            record = data[record_start:record_end]
+            record_start = record_end
+            if not record.strip():
+                continue
+            try:
+                values = next(csv.reader(io.StringIO(record.decode('utf-8'))))
+                if len(values) != len(self.header):
+                    raise ValueError(f'{len(values)} values instead of {len(self.header)}')
+                row = dict(zip(self.header, values))
+                rows.append([JTL_DTYPES[column](row[column]) for column in JTL_COLUMNS])
+            except (csv.Error, UnicodeDecodeError, ValueError) as e:
+                self.bad_lines += 1
+                print(f'Warning: skipped bad line of {self.file_path} ({self.bad_lines} in total): '
+                      f'{record[:BAD_LINE_PREVIEW_LENGTH]!r}: {e}')
+        return pandas.DataFrame(rows, columns=JTL_COLUMNS).astype(JTL_DTYPES)
+
+    def read_new_samples(self) -> Optional[pandas.DataFrame]:
+        data = self.__read_complete_records()
+        if self.header is None and data:
+            header_length = data.find(b'\n') + 1
+            self.header = next(csv.reader([data[:header_length].decode('utf-8')]))
+            self.offset += header_length
+            data = data[header_length:]
+        if not data:
+            return None
+
+        try:
+            samples = self.__parse(data)
+        except (pandas.errors.ParserError, ValueError):
+            samples = self.__parse_records(data)
+
+        self.offset += len(data)
+        return samples
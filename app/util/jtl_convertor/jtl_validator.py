@@ -1,8 +1,12 @@
+import csv
+import itertools
 import time
-from csv import DictReader
 from pathlib import Path
 from types import FunctionType
-from typing import List, Dict
+from typing import Callable, Dict, Iterator, List
+
+import numpy
+import pandas
 
 from util.jtl_convertor.validation_exception import ValidationException
 from util.jtl_convertor.validation_funcs import is_not_none, is_number, is_not_blank
@@ -41,6 +45,14 @@ VALIDATION_FUNCS_BY_COLUMN: Dict[str, List[FunctionType]] = {
     METHOD: [],
 }
 
+# Column-wise equivalents of validation functions, return mask of invalid values
+VECTORIZED_VALIDATION_FUNCS: Dict[FunctionType, Callable[[pandas.Series], pandas.Series]] = {
+    is_not_none: lambda values: values.isna(),
+    is_number: lambda values: ~values.str.isdigit(),
+    is_not_blank: lambda values: values.str.strip() == '',
+}
+CHUNK_SIZE = 500_000
+
 
 def get_validation_func(column: str) -> List[FunctionType]:
     validation_funcs = VALIDATION_FUNCS_BY_COLUMN.get(column)
@@ -75,24 +87,57 @@ def __raise_validation_error(error_msg: str) -> None:
     raise ValidationException(error_msg)
 
 
-def __validate_rows(reader) -> None:
-    for file_row_num, jtl_row in enumerate(reader, 2):
-        try:
-            __validate_row(jtl_row)
-        except ValidationException as e:
-            __raise_validation_error(f"File row number: {file_row_num}. {str(e)}")
+def __read_header(file_path: Path) -> List[str]:
+    with file_path.open(mode='r') as f:
+        return next(csv.reader(f), [])
+
+
+def __validate_chunk(file_path: Path, chunk: pandas.DataFrame, first_row_num: int) -> None:
+    invalid = numpy.zeros(len(chunk), dtype=bool)
+    for column in chunk.columns:
+        for validation_func in get_validation_func(column):
+            invalid |= VECTORIZED_VALIDATION_FUNCS[validation_func](chunk[column]).to_numpy()
+
+    if invalid.any():
+        # pandas reads missing and empty values as '', invalid rows are re-checked value by value as read by
+        # csv.DictReader: missing values are None there, so the result and messages are the same as for row-wise
+        # validation
+        with file_path.open(mode='r') as f:
+            rows = itertools.islice(csv.DictReader(f), first_row_num - 2, first_row_num - 2 + len(chunk))
+            for position, jtl_row in enumerate(rows):
+                if invalid[position]:
+                    try:
+                        __validate_row(jtl_row)
+                    except ValidationException as e:
+                        __raise_validation_error(f"File row number: {first_row_num + position}. {str(e)}")
+
+
+def read_validated_jtl(file_path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[pandas.DataFrame]:
+    """
+    Read jtl file by chunks and validate every chunk column-wise before it is returned.
+    Only columns with validation functions and required columns are read, 'elapsed' column is cast to int64.
+    """
+    try:
+        headers = __read_header(file_path)
+        __validate_header(headers)
+        columns = [header for header in headers if get_validation_func(header) or header in SUPPORTED_JTL_HEADER]
+        # keep_default_na=False reads empty and missing cells as '' instead of NaN
+        with pandas.read_csv(file_path, usecols=columns, dtype=str, keep_default_na=False,
+                             chunksize=chunk_size) as reader:
+            first_row_num = 2
+            for chunk in reader:
+                __validate_chunk(file_path, chunk, first_row_num)
+                first_row_num += len(chunk)
+                yield chunk.astype({ELAPSED: numpy.int64})
+
+    except (ValidationException, FileNotFoundError, pandas.errors.ParserError) as e:
+        raise SystemExit(f"ERROR: Validation failed. File path: [{file_path}]. Validation details: {str(e)}")
 
 
 def validate(file_path: Path) -> None:
     print(f'Started validating jtl file: {file_path}')
     start_time = time.time()
-    try:
-        with file_path.open(mode='r') as f:
-            reader: DictReader = DictReader(f)
-            __validate_header(reader.fieldnames)
-            __validate_rows(reader)
-
-    except (ValidationException, FileNotFoundError) as e:
-        raise SystemExit(f"ERROR: Validation failed. File path: [{file_path}]. Validation details: {str(e)}")
+    for _ in read_validated_jtl(file_path):
+        pass
 
     print(f'File: {file_path} validated in {time.time() - start_time} seconds')
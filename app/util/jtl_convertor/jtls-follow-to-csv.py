@@ -0,0 +1,93 @@
+import os
+import signal
+import sys
+import time
+from glob import glob
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from util.jtl_convertor.jtl_aggregator import JtlAggregator, get_all_default_actions, write_results_csv
+from util.jtl_convertor.jtl_follower import JtlFollower
+from util.project_paths import ENV_TAURUS_ARTIFACT_DIR, DEFAULT_TEST_ACTIONS
+
+LIVE_RESULTS_CSV_NAME = 'results_live.csv'
+INTERVAL_ARG = '--interval='
+DEFAULT_INTERVAL_SECONDS = 30
+
+
+def __pathname_pattern_expansion(args: List[str]) -> List[Path]:
+    file_names: List[Path] = []
+    for arg in args:
+        file_names.extend([Path(x) for x in sorted(glob(str(ENV_TAURUS_ARTIFACT_DIR / arg)))])
+    return file_names
+
+
+def __parse_args(args: List[str]) -> Tuple[List[str], int]:
+    interval = DEFAULT_INTERVAL_SECONDS
+    patterns = []
+    for arg in args:
+        if arg.startswith(INTERVAL_ARG):
+            value = arg[len(INTERVAL_ARG):]
+            if not value.isdigit() or int(value) == 0:
+                raise SystemExit(f'ERROR: Interval should be a positive number of seconds, got [{value}]')
+            interval = int(value)
+        else:
+            patterns.append(arg)
+    if not patterns:
+        raise SystemExit('ERROR: Jtl file patterns are not provided')
+    return patterns, interval
+
+
+def __write_snapshot(aggregators: List[JtlAggregator], output_csv: Path, default_test_actions: list) -> None:
+    rows = [row for aggregator in aggregators for row in aggregator.rows(default_test_actions)]
+    # Readers never see half-written snapshot: the new one replaces the old one in a single rename
+    tmp_csv = output_csv.with_name(output_csv.name + '.tmp')
+    write_results_csv(tmp_csv, rows)
+    os.replace(tmp_csv, output_csv)
+
+
+def __stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+def follow(patterns: List[str], interval: int) -> None:
+    """
+    Follows growing jtl files and rewrites live results snapshot every interval until interrupted.
+    Jtl files may be created after the start, so patterns are expanded on every iteration.
+    :param patterns: jtl file patterns relative to artifacts dir
+    :param interval: seconds between snapshots
+    """
+    default_test_actions = get_all_default_actions(DEFAULT_TEST_ACTIONS)
+    output_csv = ENV_TAURUS_ARTIFACT_DIR / LIVE_RESULTS_CSV_NAME
+    followed: Dict[Path, Tuple[JtlFollower, JtlAggregator]] = dict()
+    print(f'Following {patterns}, live results are written to {output_csv} every {interval} seconds')
+
+    while True:
+        for file_name in __pathname_pattern_expansion(patterns):
+            if file_name not in followed:
+                followed[file_name] = (JtlFollower(file_name), JtlAggregator())
+
+        updated = False
+        for follower, aggregator in followed.values():
+            samples = follower.read_new_samples()
+            if samples is not None and not samples.empty:
+                aggregator.update(samples)
+                updated = True
+        if updated:
+            __write_snapshot([aggregator for _, aggregator in followed.values()], output_csv,
+                             default_test_actions)
+        time.sleep(interval)
+
+
+def main():
+    patterns, interval = __parse_args(sys.argv[1:])
+    # Taurus stops background commands with SIGTERM at the end of the test
+    signal.signal(signal.SIGTERM, __stop)
+    try:
+        follow(patterns, interval)
+    except KeyboardInterrupt:
+        print('Stopped following jtl files')
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,22 @@
-import csv
-import json
 import os
 import sys
 import tempfile
 import time
 from glob import glob
+from itertools import islice
+from multiprocessing import Pool, cpu_count
 from pathlib import Path
-from typing import IO, List, Set
-
-import pandas
+from typing import IO, List, Optional, Set, Tuple
 
 from util.jtl_convertor import jtl_validator
+from util.jtl_convertor.jtl_aggregator import CSV_COLUMNS, JtlAggregator, get_all_default_actions
+from util.jtl_convertor.jtl_columnar_store import ColumnarResultsWriter, get_columnar_file_path
+from util.jtl_convertor.latency_histogram import LatencyHistograms, get_histogram_file_path
 from util.project_paths import ENV_TAURUS_ARTIFACT_DIR, DEFAULT_TEST_ACTIONS
 
-LABEL = 'Label'
-SAMPLES = '# Samples'
-AVERAGE = 'Average'
-MEDIAN = 'Median'
-PERC_90 = '90% Line'
-PERC_95 = '95% Line'
-PERC_99 = '99% Line'
-MIN = 'Min'
-MAX = 'Max'
-ERROR_RATE = 'Error %'
-LABEL_JTL = 'label'
-ELAPSED_JTL_TMP = 'elapsed_tmp'
-ELAPSED_JTL = 'elapsed'
-SUCCESS_JTL = 'success'
-SUCCESS_JTL_TMP = 'success_tmp'
-FALSE_JTL = 'false'
-APP_SPECIFIC = 'App specific'
-
-CSV_HEADER = f'{LABEL},{SAMPLES},{AVERAGE},{MEDIAN},{PERC_90},{PERC_95},{PERC_99},{MIN},{MAX},{ERROR_RATE},' \
-             f'{APP_SPECIFIC}\n'
+CSV_HEADER = ','.join(CSV_COLUMNS) + '\n'
 RESULTS_CSV_NAME = 'results.csv'
-APPS = ['jira', 'confluence', 'bitbucket', 'jsm', 'crowd', 'bamboo']
-TEST_TYPES = ['selenium', 'jmeter', 'locust']
-
-
-def __get_all_default_actions():
-    full_actions_list = []
-    actions_data = read_json_file(DEFAULT_TEST_ACTIONS)
-    for app in APPS:
-        for test_type in TEST_TYPES:
-            for action in actions_data[app][test_type]:
-                full_actions_list.append(action)
-    return full_actions_list
-
-
-def read_json_file(file_path):
-    with open(file_path) as json_file:
-        data = json.load(json_file)
-        return data
+PARALLEL_ARG = '--parallel'
 
 
 def __count_file_lines(stream: IO) -> int:
@@ -65,12 +30,15 @@ def __reset_file_stream(stream: IO) -> None:
 def __convert_jtl_to_csv(input_file_path: Path, output_file_path: Path, default_test_actions: list) -> None:
     if not input_file_path.exists():
         raise SystemExit(f'ERROR: Input file {output_file_path} does not exist')
+    print(f'Started validating and converting jtl file: {input_file_path}')
     start = time.time()
     convert_to_csv(output_csv=output_file_path, input_jtl=input_file_path, default_test_actions=default_test_actions)
     if not output_file_path.exists():
         raise SystemExit(f'ERROR: Something went wrong. Output file {output_file_path} does not exist')
 
-    print(f'Created file {output_file_path}. Converted from jtl to csv in {time.time() - start} ')
+    print(f'Created file {output_file_path}. Validated and converted from jtl to csv in {time.time() - start} ')
+    print(f'Created columnar copy {get_columnar_file_path(input_file_path)} of {input_file_path} for reports')
+    print(f'Created latency histograms file {get_histogram_file_path(input_file_path)}')
 
 
 def __change_file_extension(file_name: str, new_extension) -> str:
@@ -119,7 +87,9 @@ def __validate_file_names(file_names: List[str]):
 
 def __validate_file_length(file_names: List[str]):
     for file_name in file_names:
-        lines_count = sum(1 for _ in open(ENV_TAURUS_ARTIFACT_DIR / file_name))
+        # Only header and the first sample are needed to check that file has content
+        with open(ENV_TAURUS_ARTIFACT_DIR / file_name) as f:
+            lines_count = sum(1 for _ in islice(f, 2))
         if lines_count <= 1:
             raise SystemExit(f'ERROR: File {ENV_TAURUS_ARTIFACT_DIR / file_name} does not have content.\n'
                              f'See logs for detailed error: {ENV_TAURUS_ARTIFACT_DIR}')
@@ -133,69 +103,60 @@ def __pathname_pattern_expansion(args: List[str]) -> List[str]:
 
 
 def convert_to_csv(input_jtl: Path, output_csv: Path, default_test_actions: list):
-    # TODO: If list is too big, read iteratively from CSV if possible
-    with input_jtl.open(mode='r') as f:
-        reader = csv.DictReader(f)
-        jtl_list = [row for row in reader]
-
-    csv_list = []
-
-    for jtl_sample in jtl_list:
-        sample = {}
-        if jtl_sample[LABEL_JTL] not in [processed_sample[LABEL] for processed_sample in csv_list]:
-            sample[LABEL] = jtl_sample[LABEL_JTL]
-            sample[SAMPLES] = 1
-            sample[ELAPSED_JTL_TMP] = [int(jtl_sample[ELAPSED_JTL])]  # Temp list with 'elapsed' value for current label
-            # Temp list with 'success' value for current label
-            sample[SUCCESS_JTL_TMP] = [jtl_sample[SUCCESS_JTL].lower()]
-            csv_list.append(sample)
-
-        else:
-            # Get and update processed row with current label
-            processed_sample = [row for row in csv_list if row[LABEL] == jtl_sample['label']][0]
-            processed_sample[SAMPLES] = processed_sample[SAMPLES] + 1  # Count samples
-            processed_sample[ELAPSED_JTL_TMP].append(int(jtl_sample[ELAPSED_JTL]))  # list of elapsed values
-            processed_sample[SUCCESS_JTL_TMP].append(jtl_sample[SUCCESS_JTL].lower())  # list of success values
-
-    # Calculation after the last row in kpi.jtl is processed
-    for processed_sample in csv_list:
-        elapsed_df = pandas.Series(processed_sample[ELAPSED_JTL_TMP])
-        processed_sample[AVERAGE] = int(round(elapsed_df.mean()))
-        processed_sample[MEDIAN] = int(round(elapsed_df.quantile(0.5)))
-        processed_sample[PERC_90] = int(round(elapsed_df.quantile(0.9)))
-        processed_sample[PERC_95] = int(round(elapsed_df.quantile(0.95)))
-        processed_sample[PERC_99] = int(round(elapsed_df.quantile(0.99)))
-        processed_sample[MIN] = min(processed_sample[ELAPSED_JTL_TMP])
-        processed_sample[MAX] = max(processed_sample[ELAPSED_JTL_TMP])
-        success_list = processed_sample[SUCCESS_JTL_TMP]
-        processed_sample[ERROR_RATE] = round(success_list.count(FALSE_JTL) / len(success_list), 2) * 100.00
-        processed_sample[APP_SPECIFIC] = processed_sample['Label'] not in default_test_actions
-        del processed_sample[SUCCESS_JTL_TMP]
-        del processed_sample[ELAPSED_JTL_TMP]
-
-    headers = csv_list[0].keys()
-    with output_csv.open('w') as output_file:
-        dict_writer = csv.DictWriter(output_file, headers)
-        dict_writer.writeheader()
-        for row in csv_list:
-            dict_writer.writerow(row)
+    # Validation, aggregation, histograms and columnar copy are done on the same chunks, so jtl file is read only once
+    aggregator = JtlAggregator()
+    histograms = LatencyHistograms()
+    with ColumnarResultsWriter(get_columnar_file_path(input_jtl)) as columnar_writer:
+        for chunk in jtl_validator.read_validated_jtl(input_jtl):
+            aggregator.update(chunk)
+            histograms.update(chunk)
+            columnar_writer.write(chunk)
+    aggregator.write_csv(output_csv, default_test_actions)
+    histograms.write(get_histogram_file_path(input_jtl))
+
+
+def __process_jtl_file(file_name: str, tmp_dir: str, default_test_actions: list) -> Path:
+    jtl_file_path = ENV_TAURUS_ARTIFACT_DIR / file_name
+    csv_file_path = Path(tmp_dir) / __change_file_extension(file_name, '.csv')
+    __convert_jtl_to_csv(jtl_file_path, csv_file_path, default_test_actions)
+    return csv_file_path
+
+
+def __process_jtl_file_in_worker(args: Tuple[str, str, list]) -> Tuple[Optional[Path], Optional[str]]:
+    # SystemExit is not propagated from pool workers, so the error message is returned to the main process instead
+    try:
+        return __process_jtl_file(*args), None
+    except SystemExit as e:
+        return None, str(e)
+
+
+def __process_jtl_files_in_parallel(file_names: List[str], tmp_dir: str, default_test_actions: list) -> List[Path]:
+    processes = min(cpu_count(), len(file_names))
+    print(f'Processing {len(file_names)} jtl files in {processes} worker processes')
+    with Pool(processes=processes) as pool:
+        results = pool.map(__process_jtl_file_in_worker,
+                           [(file_name, tmp_dir, default_test_actions) for file_name in file_names])
+
+    errors = [error for _, error in results if error]
+    if errors:
+        raise SystemExit('\n'.join(errors))
+    return [csv_file_path for csv_file_path, _ in results]
 
 
 def main():
     args = sys.argv[1:]
-    file_names = __pathname_pattern_expansion(args)
+    parallel = PARALLEL_ARG in args
+    file_names = __pathname_pattern_expansion([arg for arg in args if arg != PARALLEL_ARG])
     __validate_file_names(file_names)
     __validate_file_length(file_names)
 
     with tempfile.TemporaryDirectory() as tmp_dir:
-        temp_csv_list: List[Path] = []
-        for file_name in file_names:
-            jtl_file_path = ENV_TAURUS_ARTIFACT_DIR / file_name
-            jtl_validator.validate(jtl_file_path)
-            csv_file_path = Path(tmp_dir) / __change_file_extension(file_name, '.csv')
-            default_test_actions = __get_all_default_actions()
-            __convert_jtl_to_csv(jtl_file_path, csv_file_path, default_test_actions)
-            temp_csv_list.append(csv_file_path)
+        default_test_actions = get_all_default_actions(DEFAULT_TEST_ACTIONS)
+        if parallel and len(file_names) > 1:
+            temp_csv_list = __process_jtl_files_in_parallel(file_names, tmp_dir, default_test_actions)
+        else:
+            temp_csv_list = [__process_jtl_file(file_name, tmp_dir, default_test_actions)
+                             for file_name in file_names]
 
         results_file_path = ENV_TAURUS_ARTIFACT_DIR / RESULTS_CSV_NAME
         __create_results_csv(temp_csv_list, results_file_path)
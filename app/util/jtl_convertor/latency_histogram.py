@@ -0,0 +1,194 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy
+import pandas
+import pyarrow
+import pyarrow.parquet
+
+from util.jtl_convertor.jtl_aggregator import (LABEL, SAMPLES, AVERAGE, PERCENTILES, MIN, MAX, ERROR_RATE,
+                                               APP_SPECIFIC, FALSE_JTL)
+
+TIME_STAMP = 'timeStamp'
+ELAPSED = 'elapsed'
+LABEL_JTL = 'label'
+SUCCESS = 'success'
+TIME_BUCKET = 'timeBucket'
+BUCKET = 'bucket'
+COUNT = 'count'
+ERRORS = 'errors'
+ELAPSED_SUM = 'elapsedSum'
+ELAPSED_MIN = 'elapsedMin'
+ELAPSED_MAX = 'elapsedMax'
+RPS = 'rps'
+ERROR_RATE_PERCENT = 'errorRate'
+
+KEY_COLUMNS: List[str] = [LABEL_JTL, TIME_BUCKET, BUCKET]
+# How every value column is combined when histograms with the same key are merged
+MERGE_FUNCS = {COUNT: 'sum', ERRORS: 'sum', ELAPSED_SUM: 'sum', ELAPSED_MIN: 'min', ELAPSED_MAX: 'max'}
+
+# Elapsed values below 2^SUB_BUCKET_BITS ms are counted exactly, larger ones with 2^-(SUB_BUCKET_BITS-1) precision
+SUB_BUCKET_BITS = 11
+TIME_BUCKET_MS = 10_000
+HISTOGRAM_SUFFIX = '_histogram.parquet'
+TIME_BUCKET_MS_METADATA = b'time_bucket_ms'
+SUB_BUCKET_BITS_METADATA = b'sub_bucket_bits'
+# Number of pending rows after which per-chunk histograms are merged together
+COMPACT_THRESHOLD = 1_000_000
+
+
+def bucket_indexes(elapsed: numpy.ndarray) -> numpy.ndarray:
+    """
+    Log-linear (HDR-style) bucket index of every elapsed value.
+    """
+    elapsed = elapsed.astype(numpy.int64)
+    _, bit_length = numpy.frexp(elapsed)
+    shift = numpy.maximum(bit_length - SUB_BUCKET_BITS, 0)
+    return (shift << (SUB_BUCKET_BITS - 1)) + (elapsed >> shift)
+
+
+def bucket_values(indexes: numpy.ndarray) -> numpy.ndarray:
+    """
+    Value represented by bucket: the value itself for exact buckets, the middle of the range for others.
+    """
+    indexes = indexes.astype(numpy.int64)
+    shift = numpy.maximum((indexes >> (SUB_BUCKET_BITS - 1)) - 1, 0)
+    lowest = (indexes - (shift << (SUB_BUCKET_BITS - 1))) << shift
+    return lowest + ((1 << shift) - 1) / 2
+
+
+def get_histogram_file_path(jtl_file_path: Path) -> Path:
+    return jtl_file_path.with_name(jtl_file_path.stem + HISTOGRAM_SUFFIX)
+
+
+class LatencyHistograms:
+    """
+    Latency histograms per label and per time bucket. Histograms are stored as a long table with one row for every
+    label, time bucket and latency bucket, so they can be merged losslessly across files, nodes and runs.
+    """
+
+    def __init__(self, time_bucket_ms: int = TIME_BUCKET_MS):
+        self.time_bucket_ms = time_bucket_ms
+        self.__tables: List[pandas.DataFrame] = []
+        self.__pending_rows = 0
+
+    def update(self, chunk: pandas.DataFrame) -> None:
+        elapsed = chunk[ELAPSED].to_numpy(dtype=numpy.int64)
+        time_stamp = chunk[TIME_STAMP].to_numpy(dtype=numpy.int64)
+        samples = pandas.DataFrame({
+            LABEL_JTL: chunk[LABEL_JTL].to_numpy(),
+            TIME_BUCKET: time_stamp - time_stamp % self.time_bucket_ms,
+            BUCKET: bucket_indexes(elapsed),
+            COUNT: 1,
+            ERRORS: (chunk[SUCCESS].astype(str).str.lower() == FALSE_JTL).to_numpy(dtype=numpy.int64),
+            ELAPSED_SUM: elapsed,
+            ELAPSED_MIN: elapsed,
+            ELAPSED_MAX: elapsed,
+        })
+        self.__add_table(samples)
+
+    def merge(self, other: 'LatencyHistograms') -> None:
+        if other.time_bucket_ms != self.time_bucket_ms:
+            raise ValueError(f'Histograms with different time buckets can not be merged: '
+                             f'{self.time_bucket_ms} ms and {other.time_bucket_ms} ms')
+        self.__add_table(other.table)
+
+    def __add_table(self, table: pandas.DataFrame) -> None:
+        self.__tables.append(table)
+        self.__pending_rows += len(table)
+        if self.__pending_rows > COMPACT_THRESHOLD:
+            self.__compact()
+
+    def __compact(self) -> None:
+        if len(self.__tables) > 1 or (self.__tables and self.__pending_rows > len(self.__tables[0])):
+            table = pandas.concat(self.__tables, ignore_index=True)
+            self.__tables = [table.groupby(KEY_COLUMNS, sort=False, as_index=False).agg(MERGE_FUNCS)]
+        self.__pending_rows = len(self.__tables[0]) if self.__tables else 0
+
+    @property
+    def table(self) -> pandas.DataFrame:
+        self.__compact()
+        if not self.__tables:
+            return pandas.DataFrame(columns=KEY_COLUMNS + list(MERGE_FUNCS))
+        return self.__tables[0]
+
+    def write(self, output_path: Path) -> None:
+        table = pyarrow.Table.from_pandas(self.table, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[TIME_BUCKET_MS_METADATA] = str(self.time_bucket_ms).encode()
+        metadata[SUB_BUCKET_BITS_METADATA] = str(SUB_BUCKET_BITS).encode()
+        pyarrow.parquet.write_table(table.replace_schema_metadata(metadata), output_path, compression='zstd')
+
+    @classmethod
+    def read(cls, input_path: Path) -> 'LatencyHistograms':
+        table = pyarrow.parquet.read_table(input_path)
+        metadata = table.schema.metadata or {}
+        sub_bucket_bits = int(metadata.get(SUB_BUCKET_BITS_METADATA, SUB_BUCKET_BITS))
+        if sub_bucket_bits != SUB_BUCKET_BITS:
+            raise ValueError(f'Histogram file {input_path} has unsupported precision: {sub_bucket_bits} bits')
+        histograms = cls(time_bucket_ms=int(metadata.get(TIME_BUCKET_MS_METADATA, TIME_BUCKET_MS)))
+        histograms.__add_table(table.to_pandas())
+        return histograms
+
+    def percentiles(self, by: List[str], quantiles: List[float]) -> pandas.DataFrame:
+        """
+        Percentiles of every group with linear interpolation between ranks, the same way as numpy.quantile does.
+        The result is exact when all values of group are in exact buckets.
+        """
+        table = self.table
+        counts = table.groupby(by + [BUCKET], sort=False)[COUNT].sum().reset_index()
+        counts = counts.sort_values(by + [BUCKET], kind='stable')
+        rows = []
+        for key, group in counts.groupby(by[0] if len(by) == 1 else by, sort=False):
+            cumulative_counts = group[COUNT].to_numpy().cumsum()
+            values = bucket_values(group[BUCKET].to_numpy())
+            positions = (cumulative_counts[-1] - 1) * numpy.array(quantiles)
+            lower = values[numpy.searchsorted(cumulative_counts, numpy.floor(positions), side='right')]
+            upper = values[numpy.searchsorted(cumulative_counts, numpy.ceil(positions), side='right')]
+            rows.append(list(key if isinstance(key, tuple) else (key,)) +
+                        list(lower + (upper - lower) * (positions - numpy.floor(positions))))
+        return pandas.DataFrame(rows, columns=by + list(quantiles))
+
+    def timeseries(self, percentiles: Dict[str, float]) -> pandas.DataFrame:
+        """
+        Throughput, error rate and percentiles of every label in every time bucket.
+        """
+        by = [LABEL_JTL, TIME_BUCKET]
+        stats = self.table.groupby(by, sort=False)[[COUNT, ERRORS]].sum()
+        values = self.percentiles(by, list(percentiles.values())).set_index(by)
+        values.columns = list(percentiles)
+        timeseries = stats.join(values).reset_index().sort_values(by, kind='stable', ignore_index=True)
+        timeseries[RPS] = timeseries[COUNT] / (self.time_bucket_ms / 1000)
+        timeseries[ERROR_RATE_PERCENT] = timeseries[ERRORS] / timeseries[COUNT] * 100
+        return timeseries
+
+    def rows(self, default_test_actions: list) -> List[dict]:
+        """
+        Rows with the same columns as results.csv.
+        """
+        stats = self.table.groupby(LABEL_JTL, sort=False).agg(MERGE_FUNCS)
+        percentiles = self.percentiles([LABEL_JTL], list(PERCENTILES.values())).set_index(LABEL_JTL)
+        rows = []
+        for label, label_stats in stats.iterrows():
+            row = {LABEL: label,
+                   SAMPLES: int(label_stats[COUNT]),
+                   AVERAGE: int(round(label_stats[ELAPSED_SUM] / label_stats[COUNT]))}
+            for column, quantile in PERCENTILES.items():
+                row[column] = int(round(percentiles.at[label, quantile]))
+            row[MIN] = int(label_stats[ELAPSED_MIN])
+            row[MAX] = int(label_stats[ELAPSED_MAX])
+            row[ERROR_RATE] = round(int(label_stats[ERRORS]) / int(label_stats[COUNT]), 2) * 100.00
+            row[APP_SPECIFIC] = label not in default_test_actions
+            rows.append(row)
+        return rows
+
+
+def merge_histogram_files(input_paths: List[Path]) -> Optional[LatencyHistograms]:
+    merged = None
+    for input_path in input_paths:
+        histograms = LatencyHistograms.read(input_path)
+        if merged is None:
+            merged = histograms
+        else:
+            merged.merge(histograms)
+    return merged
@@ -143,3 +143,4 @@ BAMBOO_USERS = __get_bamboo_dataset('users.csv')
 
 DEFAULT_TEST_ACTIONS = __get_default_test_actions()
 ENV_TAURUS_ARTIFACT_DIR = __get_taurus_artifacts_dir()
+BAMBOO_BUILD_RESULTS = ENV_TAURUS_ARTIFACT_DIR / 'bamboo_build_results.jsonl'